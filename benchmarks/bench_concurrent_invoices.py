@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Concurrent invoice call benchmark.
+
+Fires N concurrent get_invoices tool calls against a slow local stub and
+compares the wall-clock time with a single call. With a non-blocking
+request path the batch should finish in roughly the time of one call.
+
+Usage:
+    python benchmarks/bench_concurrent_invoices.py [--calls 10] [--delay 0.5]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("HOUSECALL_PRO_API_KEY", "benchmark")
+# Measure the client itself, not the client-side rate limiter
+os.environ.setdefault("HOUSECALL_PRO_RATE_LIMIT", "0")
+
+import housecallpro_client  # noqa: E402
+import housecallpro_invoices  # noqa: E402
+from stub_api import StubAPI  # noqa: E402
+
+
+async def run(calls: int) -> tuple:
+    start = time.perf_counter()
+    await housecallpro_invoices.get_invoices()
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await asyncio.gather(*(housecallpro_invoices.get_invoices(page=i + 1) for i in range(calls)))
+    batch = time.perf_counter() - start
+
+    await housecallpro_client.close_client()
+    return single, batch
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    with StubAPI(delay=args.delay) as stub:
+        housecallpro_client.API_BASE_URL = stub.url
+        single, batch = asyncio.run(run(args.calls))
+
+    ratio = batch / single
+    print(f"{'single call:':<24}{single:.3f}s")
+    print(f"{f'{args.calls} concurrent calls:':<24}{batch:.3f}s")
+    print(f"{'batch / single:':<24}{ratio:.2f}x")
+
+    # Serialized calls would take ~N times as long as one
+    return 0 if ratio < 2.0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Streaming export memory benchmark.
+
+Exports every invoice of the local mock API (benchmarks/mock_api.py, run in
+a separate process) with export_invoices, and for comparison reads them
+with get_invoices(all_pages=true), at several row counts. For each it
+reports the wall time and the peak Python memory allocated during the call
+(tracemalloc). The export's peak should stay flat as the row count grows,
+while the in-memory read grows with it.
+
+Usage:
+    python benchmarks/bench_export.py [--rows 1000,10000,50000] [--format ndjson|csv|parquet|arrow]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_tools import start_mock  # noqa: E402
+
+
+async def measure(call: Callable[[], Awaitable[Any]]) -> Tuple[float, float]:
+    """Return the wall time and the peak allocation in MB of one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    await call()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+async def run(rows: int, fmt: str, directory: str) -> None:
+    import housecallpro_client
+    import housecallpro_invoices
+
+    path = os.path.join(directory, f"invoices_{rows}.{fmt}")
+    # Warm-up call: client setup and first-call imports
+    await housecallpro_invoices.get_invoices(page_size=1)
+    export_seconds, export_mb = await measure(lambda: housecallpro_invoices.export_invoices(format=fmt, path=path))
+    read_seconds, read_mb = await measure(lambda: housecallpro_invoices.get_invoices(page_size=100, all_pages=True))
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    print(f"{rows:>8}{size_mb:>10.1f}{export_seconds:>10.2f}s{export_mb:>10.1f}"
+          f"{read_seconds:>10.2f}s{read_mb:>10.1f}", flush=True)
+    await housecallpro_client.close_client()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", default="1000,10000,50000", help="Comma-separated invoice counts")
+    parser.add_argument("--format", default="ndjson", choices=("ndjson", "csv", "parquet", "arrow"))
+    args = parser.parse_args()
+
+    os.environ.setdefault("HOUSECALL_PRO_API_KEY", "benchmark")
+    os.environ.setdefault("HOUSECALL_PRO_RATE_LIMIT", "0")
+    directory = tempfile.mkdtemp()
+
+    print(f"{'rows':>8}{'file MB':>10}{'export':>11}{'peak MB':>10}{'all_pages':>11}{'peak MB':>10}")
+    for rows in (int(r) for r in args.rows.split(",")):
+        mock = start_mock(0.0, 0.0, "--invoices", str(rows), "--customers", "50", "--jobs", "50")
+        try:
+            import housecallpro_invoices  # noqa: F401  (imported once the mock URL is set)
+            logging.getLogger().setLevel(logging.WARNING)
+            import housecallpro_client
+            housecallpro_client.API_BASE_URL = os.environ["HOUSECALL_PRO_API_BASE_URL"]
+            asyncio.run(run(rows, args.format, directory))
+        finally:
+            mock.terminate()
+            mock.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Invoice PDF download benchmark.
+
+Downloads --invoices PDFs from the local mock API (benchmarks/mock_api.py,
+run in a separate process with --latency per request) one save_invoice_pdf
+call at a time, then with save_invoice_pdfs at each --concurrency level,
+and reports the wall time and the peak Python memory allocated
+(tracemalloc). PDFs are streamed to disk, so the peak should not grow with
+--pdf-size.
+
+Usage:
+    python benchmarks/bench_invoice_pdfs.py [--invoices 100] [--latency 0.1]
+        [--pdf-size 1048576] [--concurrency 4,8,16]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_tools import start_mock  # noqa: E402
+
+
+async def measure(call: Callable[[], Awaitable[Any]]) -> Tuple[float, float, Any]:
+    """Return the wall time, the peak allocation in MB and the result of one call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = await call()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), result
+
+
+async def run(count: int, levels: list, directory: str) -> None:
+    import housecallpro_client
+    import housecallpro_invoices
+
+    ids = [f"inv_{i:07d}" for i in range(count)]
+    # Warm-up call: client setup and first-call imports
+    await housecallpro_invoices.save_invoice_pdf(ids[0], path=os.path.join(directory, "warmup.pdf"))
+
+    async def one_at_a_time() -> None:
+        for invoice_id in ids:
+            await housecallpro_invoices.save_invoice_pdf(invoice_id, path=os.path.join(directory, "single", f"{invoice_id}.pdf"))
+
+    seconds, peak_mb, _ = await measure(one_at_a_time)
+    print(f"{'save_invoice_pdf x ' + str(count):<34}{seconds:>9.2f}s{count / seconds:>10.1f}{peak_mb:>10.1f}", flush=True)
+
+    for level in levels:
+        target = os.path.join(directory, f"batch_{level}")
+        seconds, peak_mb, result = await measure(
+            lambda: housecallpro_invoices.save_invoice_pdfs(invoice_ids=ids, directory=target, concurrency=level)
+        )
+        failed = json.loads(result)["failed"]
+        print(f"{'save_invoice_pdfs concurrency=' + str(level):<34}{seconds:>9.2f}s{count / seconds:>10.1f}"
+              f"{peak_mb:>10.1f}{'' if not failed else f'  ({failed} failed)'}", flush=True)
+    await housecallpro_client.close_client()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invoices", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.1, help="Mock API latency per request in seconds")
+    parser.add_argument("--pdf-size", type=int, default=1024 * 1024, help="PDF size in bytes")
+    parser.add_argument("--concurrency", default="4,8,16", help="Comma-separated batch concurrency levels")
+    args = parser.parse_args()
+
+    os.environ.setdefault("HOUSECALL_PRO_API_KEY", "benchmark")
+    os.environ.setdefault("HOUSECALL_PRO_RATE_LIMIT", "0")
+    directory = tempfile.mkdtemp()
+    mock = start_mock(args.latency, 0.0, "--invoices", str(args.invoices), "--customers", "10", "--jobs", "10",
+                      "--pdf-size", str(args.pdf_size))
+    try:
+        import housecallpro_invoices  # noqa: F401  (imported once the mock URL is set)
+        logging.getLogger().setLevel(logging.WARNING)
+        print(f"{args.invoices} PDFs of {args.pdf_size / (1024 * 1024):.1f} MB, {args.latency * 1000:.0f} ms API latency")
+        print(f"{'':<34}{'wall':>10}{'PDFs/s':>10}{'peak MB':>10}")
+        asyncio.run(run(args.invoices, [int(c) for c in args.concurrency.split(",")], directory))
+    finally:
+        mock.terminate()
+        mock.wait()
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
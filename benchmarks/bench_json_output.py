@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tool output encoding benchmark.
+
+Encodes a realistic 200-job get_jobs response (generated by the mock API)
+with the previous json.dumps(indent=2) output and with each encoder
+housecallpro_output.to_json can use, and reports the payload size and the
+median encode time of each. With --fields, the response is first projected
+the way the tools' `fields` argument does, and the projection time is
+included in each encode.
+
+Usage:
+    python benchmarks/bench_json_output.py [--jobs 200] [--runs 200]
+        [--fields id,customer.first_name,customer.last_name,total_amount,scheduled_start]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import housecallpro_output  # noqa: E402
+from mock_api import MockAPI  # noqa: E402
+
+
+def encoders() -> dict:
+    """Return the encodings to compare, keyed by label."""
+    candidates = {
+        "json indent=2 (previous)": lambda obj: json.dumps(obj, indent=2),
+        "json compact": lambda obj: json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str),
+    }
+    if housecallpro_output.orjson_available():
+        orjson = housecallpro_output.orjson
+        candidates["orjson indent=2"] = lambda obj: orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2).decode()
+        candidates["orjson compact"] = lambda obj: orjson.dumps(obj, default=str).decode()
+    return candidates
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--fields", help="Project each job down to these fields before encoding")
+    args = parser.parse_args()
+
+    api = MockAPI(counts={"jobs": args.jobs})
+    response = api.list_records("jobs", {"page_size": str(args.jobs)})
+
+    results = {}
+    for label, encode in encoders().items():
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            text = encode(housecallpro_output.select_fields(response, args.fields, "jobs"))
+            timings.append(time.perf_counter() - start)
+        results[label] = (len(text.encode()), statistics.median(timings))
+
+    base_size, base_time = results["json indent=2 (previous)"]
+    print(f"{args.jobs}-job get_jobs response, median of {args.runs} encodes")
+    if args.fields:
+        full_size = len(json.dumps(response, indent=2).encode())
+        print(f"fields={args.fields} (indent=2 without fields: {full_size} bytes, "
+              f"{base_size / full_size:.0%} after projection)")
+    print(f"{'encoder':<28}{'bytes':>10}{'size':>8}{'encode':>11}{'speedup':>9}")
+    for label, (size, seconds) in results.items():
+        print(f"{label:<28}{size:>10}{size / base_size:>8.0%}{seconds * 1000:>9.3f}ms{base_time / seconds:>8.1f}x")
+    print(f"\nto_json backend in use: {housecallpro_output.get_backend()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Full-scan pagination benchmark.
+
+Reads every page of a paginated /jobs listing from a local stub, once with
+the sequential prefetching iterator and once with the adaptive parallel
+page fetcher used by the scorecard tools.
+
+Usage:
+    python benchmarks/bench_pagination.py [--items 5000] [--page-size 100] [--delay 0.1]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("HOUSECALL_PRO_API_KEY", "benchmark")
+# Measure the client itself, not the client-side rate limiter
+os.environ.setdefault("HOUSECALL_PRO_RATE_LIMIT", "0")
+
+import housecallpro_client  # noqa: E402
+import housecallpro_scorecard as scorecard  # noqa: E402
+from housecallpro_pagination import fetch_all_pages, fetch_all_pages_parallel  # noqa: E402
+from stub_api import StubAPI  # noqa: E402
+
+
+async def measure(page_size: int) -> dict:
+    def fetch_page(page: int):
+        return scorecard.make_api_request("/jobs", {"page_size": page_size, "page": page})
+
+    timings = {}
+    for name, scan in (("sequential", fetch_all_pages), ("parallel", fetch_all_pages_parallel)):
+        start = time.perf_counter()
+        result = await scan(fetch_page, "jobs")
+        timings[name] = (time.perf_counter() - start, result["total_items"], result["pages_fetched"])
+
+    await housecallpro_client.close_client()
+    return timings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.1)
+    args = parser.parse_args()
+
+    with StubAPI(delay=args.delay, total_items=args.items) as stub:
+        housecallpro_client.API_BASE_URL = stub.url
+        timings = asyncio.run(measure(args.page_size))
+
+    for name, (elapsed, items, pages) in timings.items():
+        print(f"{name + ':':<24}{elapsed:.3f}s ({items} items, {pages} pages)")
+    print(f"{'speedup:':<24}{timings['sequential'][0] / timings['parallel'][0]:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
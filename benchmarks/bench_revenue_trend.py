@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Weekly revenue trend benchmark.
+
+Answers "revenue for the last --weeks weeks" against the local mock API
+(benchmarks/mock_api.py, run in a separate process with --latency per
+request) three ways: one get_weekly_revenue call per week, get_revenue_trend
+on an empty rollup store (every week swept once), and get_revenue_trend
+again with the store filled, both as stored and with the open week
+refreshed from recently updated jobs. The warm reads should not grow with
+--weeks.
+
+Usage:
+    python benchmarks/bench_revenue_trend.py [--jobs 20000] [--weeks 12,52] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_tools import start_mock  # noqa: E402
+
+
+async def timed(call: Callable[[], Awaitable[Any]]) -> Tuple[float, Any]:
+    """Return the wall time in ms and the result of one call."""
+    start = time.perf_counter()
+    result = await call()
+    return (time.perf_counter() - start) * 1000, result
+
+
+async def run(levels: list, directory: str) -> None:
+    import housecallpro_client
+    import housecallpro_rollup
+    import housecallpro_scorecard
+
+    # Warm-up call: client setup and first-call imports
+    await housecallpro_scorecard.get_weekly_revenue(weeks_back=0, fields="id")
+
+    for weeks in levels:
+        housecallpro_rollup.ROLLUP_PATH = os.path.join(directory, f"rollups_{weeks}.db")
+        housecallpro_rollup.ROLLUP_MAX_AGE = 300
+
+        async def per_week() -> None:
+            for weeks_back in range(weeks):
+                await housecallpro_scorecard.get_weekly_revenue(weeks_back=weeks_back, fields="id")
+
+        per_week_ms, _ = await timed(per_week)
+        cold_ms, _ = await timed(lambda: housecallpro_scorecard.get_revenue_trend(weeks))
+        warm_ms, _ = await timed(lambda: housecallpro_scorecard.get_revenue_trend(weeks))
+        housecallpro_rollup.ROLLUP_MAX_AGE = 0
+        refresh_ms, _ = await timed(lambda: housecallpro_scorecard.get_revenue_trend(weeks))
+        print(f"{weeks:>6}{per_week_ms:>16.0f}{cold_ms:>12.0f}{warm_ms:>12.1f}{refresh_ms:>14.1f}", flush=True)
+    await housecallpro_client.close_client()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--weeks", default="12,52", help="Comma-separated trend lengths in weeks")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock API latency per request in seconds")
+    args = parser.parse_args()
+
+    os.environ.setdefault("HOUSECALL_PRO_API_KEY", "benchmark")
+    os.environ.setdefault("HOUSECALL_PRO_RATE_LIMIT", "0")
+    directory = tempfile.mkdtemp()
+    mock = start_mock(args.latency, 0.0, "--jobs", str(args.jobs), "--customers", "200", "--employees", "10")
+    try:
+        import housecallpro_scorecard  # noqa: F401  (imported once the mock URL is set)
+        logging.getLogger().setLevel(logging.WARNING)
+        print(f"{args.jobs} jobs, {args.latency * 1000:.0f} ms API latency; times in ms")
+        print(f"{'weeks':>6}{'per-week calls':>16}{'trend cold':>12}{'trend warm':>12}{'open refresh':>14}")
+        asyncio.run(run([int(w) for w in args.weeks.split(",")], directory))
+    finally:
+        mock.terminate()
+        mock.wait()
+        shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
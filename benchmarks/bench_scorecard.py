@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Scorecard fan-out benchmark.
+
+Measures end-to-end latency of get_scorecard_metrics against a local stub
+with an injected per-request delay, next to the same sub-metrics awaited
+one after another.
+
+Usage:
+    python benchmarks/bench_scorecard.py [--delay 0.3] [--runs 3]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("HOUSECALL_PRO_API_KEY", "benchmark")
+# Measure the client itself, not the client-side rate limiter
+os.environ.setdefault("HOUSECALL_PRO_RATE_LIMIT", "0")
+
+import housecallpro_client  # noqa: E402
+import housecallpro_scorecard as scorecard  # noqa: E402
+from stub_api import StubAPI  # noqa: E402
+
+
+async def sequential() -> None:
+    await scorecard.get_weekly_revenue(weeks_back=0)
+    await scorecard.get_weekly_revenue(weeks_back=1)
+    await scorecard.get_pipeline_value()
+    await scorecard.get_close_rate(days_back=30)
+    await scorecard.get_scheduled_jobs(days_forward=14)
+
+
+async def concurrent() -> None:
+    await scorecard.get_scorecard_metrics()
+
+
+async def measure(runs: int) -> dict:
+    timings = {"sequential": [], "concurrent": []}
+    # Warm the connection pool so both modes start from the same state
+    await concurrent()
+
+    for _ in range(runs):
+        for name, fn in (("sequential", sequential), ("concurrent", concurrent)):
+            start = time.perf_counter()
+            await fn()
+            timings[name].append(time.perf_counter() - start)
+
+    await housecallpro_client.close_client()
+    return {name: statistics.median(values) for name, values in timings.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--delay", type=float, default=0.3)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with StubAPI(delay=args.delay) as stub:
+        housecallpro_client.API_BASE_URL = stub.url
+        results = asyncio.run(measure(args.runs))
+
+    print(f"per-request delay:      {args.delay:.3f}s")
+    for name, value in results.items():
+        print(f"{name + ':':<24}{value:.3f}s (median of {args.runs})")
+    print(f"{'speedup:':<24}{results['sequential'] / results['concurrent']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Server startup benchmark.
+
+Starts every server module (and the housecallpro.py gateway) in a fresh
+interpreter and measures:
+    cold_start_seconds: process spawn until the module is imported
+    import_seconds: time spent importing the module itself
+    first_tool_seconds: process spawn until the first tool response
+        (get_api_diagnostics, called through the MCP protocol layer)
+    peak_rss_mb: peak resident set size of the process
+
+Each figure is the median over --runs fresh processes. Results can be saved
+with --output and compared against an earlier report with --baseline; the
+exit status is 1 when any module regressed by more than --threshold.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--modules jobs,scorecard,gateway]
+        [--output startup.json] [--baseline startup_baseline.json] [--threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from glob import glob
+from typing import Dict, Any, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GATEWAY = "housecallpro"
+METRICS = ("cold_start_seconds", "import_seconds", "first_tool_seconds", "peak_rss_mb")
+
+
+def server_modules() -> List[str]:
+    """Return every server module name, followed by the gateway."""
+    modules = []
+    for path in sorted(glob(os.path.join(ROOT, "housecallpro_*.py"))):
+        with open(path, encoding="utf-8") as fh:
+            if "\nmcp = FastMCP(" in fh.read():
+                modules.append(os.path.basename(path)[:-3])
+    return modules + [GATEWAY]
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def child(module_name: str, spawned_at: float) -> None:
+    """Import one server module, call a tool through MCP and print the timings."""
+    import asyncio
+    import importlib
+
+    sys.path.insert(0, ROOT)
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_seconds = time.perf_counter() - start
+    cold_start_seconds = time.time() - spawned_at
+
+    from mcp.shared.memory import create_connected_server_and_client_session
+
+    async def first_tool() -> None:
+        async with create_connected_server_and_client_session(module.mcp._mcp_server) as session:
+            result = await session.call_tool("get_api_diagnostics", {})
+            if result.isError:
+                raise RuntimeError(result.content[0].text)
+
+    asyncio.run(first_tool())
+    first_tool_seconds = time.time() - spawned_at
+
+    print(json.dumps({
+        "cold_start_seconds": cold_start_seconds,
+        "import_seconds": import_seconds,
+        "first_tool_seconds": first_tool_seconds,
+        "peak_rss_mb": _peak_rss_mb(),
+    }))
+
+
+def run_once(module_name: str, env: Dict[str, str]) -> Dict[str, Any]:
+    """Measure one fresh process."""
+    spawned_at = time.time()
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", module_name, str(spawned_at)],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module_name} failed to start:\n{proc.stderr.strip()}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(modules: List[str], runs: int) -> Dict[str, Dict[str, Any]]:
+    """Return the median of each metric per module."""
+    env = dict(os.environ)
+    env.setdefault("HOUSECALL_PRO_API_KEY", "benchmark")
+    # Keep the gateway's manifest cache out of the user's home directory
+    env["HOUSECALL_PRO_GATEWAY_MANIFEST"] = os.path.join(tempfile.mkdtemp(), "tool_manifest.json")
+
+    results = {}
+    for module_name in modules:
+        # One discarded run warms the OS file cache, .pyc files and the gateway manifest
+        run_once(module_name, env)
+        samples = [run_once(module_name, env) for _ in range(runs)]
+        results[module_name] = {
+            metric: (
+                round(statistics.median(s[metric] for s in samples), 4)
+                if samples[0][metric] is not None else None
+            )
+            for metric in METRICS
+        }
+    return results
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> List[str]:
+    """Print each metric next to its baseline and return the regressions."""
+    regressions = []
+    print(f"\n{'module':<36}{'metric':<22}{'baseline':>10}{'current':>10}{'change':>9}")
+    for module_name, metrics in results.items():
+        before = baseline.get(module_name)
+        if not before:
+            continue
+        for metric in METRICS:
+            old, new = before.get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            flag = ""
+            if change > threshold:
+                flag = "  REGRESSED"
+                regressions.append(f"{module_name} {metric}")
+            print(f"{module_name:<36}{metric:<22}{old:>10.3f}{new:>10.3f}{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main() -> int:
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        child(sys.argv[2], float(sys.argv[3]))
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modules", help="Comma-separated domains, e.g. jobs,scorecard,gateway (default all)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a report written by --output")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Relative increase that counts as a regression (default 0.2)")
+    args = parser.parse_args()
+
+    modules = server_modules()
+    if args.modules:
+        wanted = [GATEWAY if d.strip() == "gateway" else f"housecallpro_{d.strip()}" for d in args.modules.split(",")]
+        unknown = [m for m in wanted if m not in modules]
+        if unknown:
+            parser.error(f"unknown modules: {', '.join(unknown)}")
+        modules = wanted
+
+    results = measure(modules, args.runs)
+
+    print(f"{'module':<36}{'cold start':>12}{'import':>10}{'first tool':>12}{'peak RSS':>11}")
+    for module_name, m in results.items():
+        rss = f"{m['peak_rss_mb']:.1f} MB" if m["peak_rss_mb"] is not None else "n/a"
+        print(f"{module_name:<36}{m['cold_start_seconds']:>11.3f}s{m['import_seconds']:>9.3f}s"
+              f"{m['first_tool_seconds']:>11.3f}s{rss:>11}")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": args.runs,
+        "modules": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nreport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)["modules"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+End-to-end tool latency benchmark.
+
+Calls every @mcp.tool() of every server module through the MCP protocol
+layer (an in-memory client session, so arguments and results are validated
+and serialized exactly as for Claude Desktop) against the local mock API in
+benchmarks/mock_api.py, which runs in a separate process. For each tool it
+records:
+    p50_ms / p95_ms / p99_ms: latency of --calls sequential calls
+    throughput_rps: calls per second with --concurrency calls in flight
+    alloc_peak_kb: peak memory allocated during one call (tracemalloc)
+    alloc_retained_kb: memory still allocated after one call (tracemalloc)
+    errors: calls that returned an error instead of a result
+
+Tool arguments are built from each tool's input schema, using ids that
+exist in the mock data. Results can be saved with --output and compared
+with --baseline.
+
+Usage:
+    python benchmarks/bench_tools.py [--modules jobs,scorecard] [--tools get_jobs,summarize_employees]
+        [--calls 20] [--concurrency 10] [--latency 0] [--scale 1]
+        [--output tools.json] [--baseline tools_baseline.json]
+"""
+
+import argparse
+import asyncio
+import base64
+import importlib
+import json
+import logging
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Dict, Any, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_startup import server_modules, GATEWAY  # noqa: E402
+
+# Tools that bind ports or read local files rather than call the API
+SKIP_TOOLS = {"start_webhook_receiver", "replay_webhook_events"}
+
+# Ids of records the mock API generates at any scale; delete tools use the
+# next record on every call so the other tools keep finding theirs
+RECORD_IDS = {
+    "job_id": "job_{:07d}",
+    "customer_id": "cus_{:07d}",
+    "invoice_id": "inv_{:07d}",
+    "estimate_id": "est_{:07d}",
+    "employee_id": "pro_{:06d}",
+    "lead_id": "lead_{:07d}",
+    "material_id": "pbmat_{:07d}",
+    "material_category_uuid": "pbmcat_{:05d}",
+    "category_id": "pbmcat_{:05d}",
+}
+
+_TODAY = date.today()
+
+# Sample values for required arguments that are not record ids
+SAMPLE_ARGUMENTS = {
+    "start_date": _TODAY.isoformat(),
+    "end_date": (_TODAY + timedelta(days=7)).isoformat(),
+    "scheduled_start": f"{_TODAY.isoformat()}T09:00:00",
+    "scheduled_end": f"{_TODAY.isoformat()}T11:00:00",
+    "start_time": "09:00",
+    "end_time": "17:00",
+    "category_name": "hvac",
+    "search_term": "smith",
+    "customer_name": "Smith",
+    "first_name": "Sam",
+    "last_name": "Smith",
+    "name": "Benchmark",
+    "tag": "vip",
+    "tag_type": "job",
+    "role": "field tech",
+    "note": "Benchmark note",
+    "url": "https://example.com/benchmark",
+    "street": "1 Main St",
+    "city": "Springfield",
+    "state": "IL",
+    "zip": "62701",
+    "address": "1 Main St, Springfield, IL 62701",
+    "sku": "SKU-BENCH",
+    "file_data": base64.b64encode(b"benchmark attachment").decode(),
+    "employee_ids": ["pro_000000"],
+    "service_ids": [],
+    "line_items": [{"name": "Benchmark item", "quantity": 1, "unit_price": 1000}],
+    "input_materials": [],
+    "events": [],
+    "windows": [],
+}
+
+_SCHEMA_DEFAULTS = {"string": "benchmark", "integer": 1, "number": 1.0, "boolean": False,
+                    "array": [], "object": {}}
+
+
+def build_arguments(tool: Any, call: int) -> Dict[str, Any]:
+    """Return arguments for a tool's required parameters."""
+    schema = tool.inputSchema
+    index = call + 1 if tool.name.startswith("delete_") else 0
+    arguments = {}
+    for name in schema.get("required", []):
+        if name in RECORD_IDS:
+            arguments[name] = RECORD_IDS[name].format(index)
+        elif name.endswith("_id"):
+            arguments[name] = f"{name[:-3]}_{index}"
+        elif name in SAMPLE_ARGUMENTS:
+            arguments[name] = SAMPLE_ARGUMENTS[name]
+        else:
+            arguments[name] = _SCHEMA_DEFAULTS.get(schema["properties"][name].get("type"), "benchmark")
+    return arguments
+
+
+def is_error(result: Any) -> bool:
+    """Whether a tool result reports an error rather than data."""
+    if result.isError:
+        return True
+    text = "".join(getattr(block, "text", "") for block in result.content).lstrip()
+    if text.startswith("Error"):
+        return True
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return False
+    return isinstance(data, dict) and ("error" in data or data.get("success") is False)
+
+
+def _percentile(values: List[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+async def measure_tool(session: Any, tool: Any, calls: int, concurrency: int) -> Dict[str, Any]:
+    """Measure one tool's latency, throughput and allocations."""
+    counter = iter(range(10 ** 9))
+    errors = 0
+
+    async def call_once() -> float:
+        nonlocal errors
+        start = time.perf_counter()
+        result = await session.call_tool(tool.name, build_arguments(tool, next(counter)))
+        elapsed = time.perf_counter() - start
+        errors += is_error(result)
+        return elapsed
+
+    # Warm-up call: connection setup, first-call imports and cache fills
+    await call_once()
+    errors = 0
+
+    latencies = [await call_once() for _ in range(calls)]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded() -> None:
+        async with semaphore:
+            await call_once()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded() for _ in range(calls)))
+    throughput = calls / (time.perf_counter() - start)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    await call_once()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "throughput_rps": round(throughput, 1),
+        "alloc_peak_kb": round((peak - before) / 1024, 1),
+        "alloc_retained_kb": round((after - before) / 1024, 1),
+        "errors": errors,
+    }
+
+
+async def measure(modules: List[str], tools: Optional[List[str]], calls: int, concurrency: int) -> Dict[str, Any]:
+    """Measure every selected tool of every selected module."""
+    from mcp.shared.memory import create_connected_server_and_client_session
+    import housecallpro_client
+
+    results: Dict[str, Any] = {}
+    for module_name in modules:
+        module = importlib.import_module(module_name)
+        # FastMCP configures INFO logging on import; keep per-request log lines out of the timings
+        logging.getLogger().setLevel(logging.WARNING)
+        async with create_connected_server_and_client_session(module.mcp._mcp_server) as session:
+            for tool in (await session.list_tools()).tools:
+                if tool.name in SKIP_TOOLS or (tools and tool.name not in tools):
+                    continue
+                # Diagnostics is identical in every module; measure it once
+                if tool.name == "get_api_diagnostics" and any(k.endswith(".get_api_diagnostics") for k in results):
+                    continue
+                key = f"{module_name}.{tool.name}"
+                results[key] = await measure_tool(session, tool, calls, concurrency)
+                r = results[key]
+                print(f"{key:<64}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+                      f"{r['throughput_rps']:>9.1f}{r['alloc_peak_kb']:>10.1f}{r['errors']:>7}", flush=True)
+    await housecallpro_client.close_client()
+    return results
+
+
+def start_mock(latency: float, scale: float, *mock_args: str) -> subprocess.Popen:
+    """Start benchmarks/mock_api.py on a free port and point the client at it."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_api.py"),
+         "--port", str(port), "--latency", str(latency), "--scale", str(scale), *mock_args],
+        stdout=subprocess.PIPE, text=True,
+    )
+    for line in proc.stdout:
+        if line.startswith("serving on"):
+            break
+    else:
+        raise RuntimeError("mock API failed to start")
+    os.environ["HOUSECALL_PRO_API_BASE_URL"] = f"http://127.0.0.1:{port}"
+    return proc
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print p50/p95 and throughput changes against a baseline report."""
+    print(f"\n{'tool':<64}{'p50':>9}{'p95':>9}{'rps':>9}")
+    for key, r in results.items():
+        before = baseline.get(key)
+        if not before:
+            continue
+        changes = [
+            (r[m] - before[m]) / before[m] if before[m] else 0.0
+            for m in ("p50_ms", "p95_ms", "throughput_rps")
+        ]
+        print(f"{key:<64}" + "".join(f"{c:>+9.0%}" for c in changes))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", help="Comma-separated domains, e.g. jobs,scorecard (default all)")
+    parser.add_argument("--tools", help="Comma-separated tool names (default all)")
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock API latency per request in seconds")
+    parser.add_argument("--scale", type=float, default=1.0, help="Mock API data scale")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Compare against a report written by --output")
+    args = parser.parse_args()
+
+    modules = [m for m in server_modules() if m != GATEWAY]
+    if args.modules:
+        wanted = [f"housecallpro_{d.strip()}" for d in args.modules.split(",")]
+        unknown = [m for m in wanted if m not in modules]
+        if unknown:
+            parser.error(f"unknown modules: {', '.join(unknown)}")
+        modules = wanted
+    tools = [t.strip() for t in args.tools.split(",")] if args.tools else None
+
+    os.environ.setdefault("HOUSECALL_PRO_API_KEY", "benchmark")
+    # Measure the request path itself, not the client-side rate limiter
+    os.environ.setdefault("HOUSECALL_PRO_RATE_LIMIT", "0")
+    os.environ["HOUSECALL_PRO_REPLICA_PATH"] = os.path.join(tempfile.mkdtemp(), "replica.db")
+    os.environ["HOUSECALL_PRO_EXPORT_DIR"] = tempfile.mkdtemp()
+    os.environ["HOUSECALL_PRO_ROLLUP_PATH"] = os.path.join(tempfile.mkdtemp(), "rollups.db")
+    mock = start_mock(args.latency, args.scale)
+    try:
+        print(f"{'tool':<64}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'rps':>9}{'alloc KB':>10}{'errors':>7}")
+        results = asyncio.run(measure(modules, tools, args.calls, args.concurrency))
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "calls": args.calls,
+        "concurrency": args.concurrency,
+        "mock_latency": args.latency,
+        "mock_scale": args.scale,
+        "tools": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nreport written to {args.output}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            compare(results, json.load(fh)["tools"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Attachment upload memory benchmark.
+
+Uploads files of increasing size with add_job_attachment to the local mock
+API (benchmarks/mock_api.py), once as base64 file_data and once as a
+file_path streamed from disk. Each upload runs in a fresh interpreter, and
+the benchmark reports how far the process's peak RSS rose above its level
+after import. For base64 this includes holding the encoded tool argument,
+as the server does after parsing the JSON-RPC message. The file_path figure
+should stay flat as the file grows.
+
+Usage:
+    python benchmarks/bench_upload.py [--sizes 1,20,100]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from bench_startup import _peak_rss_mb  # noqa: E402
+from bench_tools import start_mock  # noqa: E402
+
+MODES = ("file_data", "file_path")
+
+
+def child(mode: str, path: str) -> None:
+    """Upload one file in this process and print the RSS growth and timing."""
+    import base64
+    import logging
+
+    import housecallpro_jobs
+
+    logging.getLogger().setLevel(logging.WARNING)
+    baseline = _peak_rss_mb()
+
+    async def upload() -> dict:
+        if mode == "file_path":
+            result = await housecallpro_jobs.add_job_attachment("job_0000000", file_path=path)
+        else:
+            with open(path, "rb") as fh:
+                file_data = base64.b64encode(fh.read()).decode()
+            result = await housecallpro_jobs.add_job_attachment(
+                "job_0000000", name=os.path.basename(path), file_data=file_data
+            )
+        return json.loads(result)
+
+    start = time.perf_counter()
+    result = asyncio.run(upload())
+    seconds = time.perf_counter() - start
+    print(json.dumps({
+        "rss_growth_mb": _peak_rss_mb() - baseline,
+        "seconds": seconds,
+        "received_bytes": result.get("received_bytes"),
+        "error": result.get("error"),
+    }))
+
+
+def write_file(path: str, size_mb: int) -> None:
+    """Write size_mb of random bytes in 1 MiB chunks."""
+    with open(path, "wb") as fh:
+        for _ in range(size_mb):
+            fh.write(os.urandom(1024 * 1024))
+
+
+def main() -> int:
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+        return 0
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1,20,100", help="Comma-separated file sizes in MB")
+    args = parser.parse_args()
+
+    os.environ.setdefault("HOUSECALL_PRO_API_KEY", "benchmark")
+    os.environ.setdefault("HOUSECALL_PRO_RATE_LIMIT", "0")
+    directory = tempfile.mkdtemp()
+    mock = start_mock(0.0, 0.0, "--jobs", "10", "--customers", "10")
+    try:
+        print(f"{'size MB':>8}{'mode':>12}{'RSS growth MB':>15}{'seconds':>9}{'received':>12}")
+        for size_mb in (int(s) for s in args.sizes.split(",")):
+            path = os.path.join(directory, f"attachment_{size_mb}mb.jpg")
+            write_file(path, size_mb)
+            for mode in MODES:
+                proc = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), "--child", mode, path],
+                    capture_output=True, text=True,
+                )
+                if proc.returncode != 0:
+                    raise RuntimeError(f"{mode} upload failed:\n{proc.stderr.strip()}")
+                r = json.loads(proc.stdout.strip().splitlines()[-1])
+                if r["error"]:
+                    raise RuntimeError(f"{mode} upload failed: {r['error']}")
+                print(f"{size_mb:>8}{mode:>12}{r['rss_growth_mb']:>15.1f}{r['seconds']:>9.2f}"
+                      f"{r['received_bytes']:>12}", flush=True)
+            os.remove(path)
+    finally:
+        mock.terminate()
+        mock.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
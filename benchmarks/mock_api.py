@@ -0,0 +1,706 @@
+#!/usr/bin/env python3
+"""
+Local mock of the Housecall Pro API for offline load testing.
+
+Serves the endpoints the server modules use (/jobs, /customers, /estimates,
+/invoices, /employees, /leads, /api/price_book/materials, ...) from
+synthetic records generated at a configurable scale. List endpoints support
+page/page_size pagination, sort_by/sort_direction, search and the filters
+the tools send:
+    field=value             equality (list fields such as tags match any element)
+    field_min / field_max   range on field (e.g. scheduled_start_min)
+    x_after / x_before      range on x_at (e.g. updated_after -> updated_at)
+    x_start / x_end         range on x, or x_at (e.g. due_date_start, created_start)
+Unknown filters are ignored, as the real API does. POST, PUT, PATCH and
+DELETE create, update and delete records, bumping updated_at so
+incremental replica syncs see the change. Multipart uploads are read in
+chunks and discarded, and the response reports their received_bytes.
+Job line items (/jobs/{id}/line_items) are stored per job: POST appends one,
+and PUT replaces the list, giving new items an id. Other sub-resource actions
+(tags, dispatch, schedule, ...) echo their input, or 404 for an unknown record.
+GET /invoices/{id}/download answers with a link to a synthetic PDF of
+pdf_size bytes under /_mock/files/, which, like a pre-signed URL, needs no
+API token.
+
+Latency, 429 responses and server errors can be injected to exercise the
+retry, rate limiting and circuit breaker paths.
+
+Point the server modules at it with HOUSECALL_PRO_API_BASE_URL, or use it
+in-process as a context manager like StubAPI:
+
+    with MockAPI(counts={"jobs": 100_000}, latency=0.05) as api:
+        housecallpro_client.API_BASE_URL = api.url
+
+Usage:
+    python benchmarks/mock_api.py [--port 8080] [--scale 1] [--jobs 100000]
+        [--latency 0.05] [--jitter 0.02] [--rate-limit 10] [--throttle-rate 0.01]
+        [--error-rate 0.01] [--pdf-size 262144] [--seed 1]
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Records generated per collection at scale 1
+DEFAULT_COUNTS = {
+    "jobs": 1000,
+    "customers": 500,
+    "estimates": 300,
+    "invoices": 800,
+    "employees": 25,
+    "leads": 200,
+    "materials": 500,
+    "material_categories": 20,
+}
+
+# Path prefixes that name the same collection
+PATH_PREFIXES = ("/v1/", "/api/price_book/", "/")
+
+# Collections answered as {"data": [...]} like the price book API
+DATA_KEY_COLLECTIONS = {"materials", "material_categories"}
+
+# Query parameters that control the listing rather than filter it
+CONTROL_PARAMS = {"page", "page_size", "per_page", "sort_by", "sort_direction",
+                  "include_line_items", "include_attachments", "search", "q"}
+
+# Filter names that do not match their record field by suffix rules
+FILTER_ALIASES = {
+    "customer_id": "customer.id",
+    "employee_id": "assigned_employees.id",
+    "date": "scheduled_start",
+    "company_name": "company",
+    "phone": "mobile_number",
+}
+
+WORK_STATUSES = ["unscheduled", "scheduled", "in_progress", "complete", "canceled"]
+ESTIMATE_STATUSES = ["pending", "won", "lost"]
+INVOICE_STATUSES = ["open", "paid", "void"]
+LEAD_STATUSES = ["open", "won", "lost"]
+ROLES = ["admin", "field tech", "office staff", "dispatcher"]
+TAGS = ["residential", "commercial", "vip", "warranty", "maintenance", "follow-up"]
+FIRST_NAMES = ["Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Drew", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Nguyen", "Patel", "Johnson", "Kim", "Brown", "Lopez", "Chen", "Davis"]
+TRADES = ["Plumbing", "Electrical", "HVAC", "Roofing", "Landscaping", "Cleaning", "Painting"]
+
+
+def _timestamp(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class Dataset:
+    """Synthetic Housecall Pro records, generated deterministically from a seed."""
+
+    def __init__(self, counts: Dict[str, int], seed: int = 1):
+        self.rng = random.Random(seed)
+        self.now = datetime.now(timezone.utc).replace(microsecond=0)
+        self.lock = threading.Lock()
+        self.collections: Dict[str, List[Dict[str, Any]]] = {}
+        self.index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+        for name in ("employees", "customers", "material_categories", "materials",
+                     "jobs", "estimates", "invoices", "leads"):
+            make = getattr(self, f"_make_{name}")
+            self._set(name, [make(i) for i in range(counts.get(name, 0))])
+
+    def _set(self, name: str, records: List[Dict[str, Any]]) -> None:
+        self.collections[name] = records
+        key = "uuid" if name in DATA_KEY_COLLECTIONS else "id"
+        self.index[name] = {r[key]: r for r in records}
+
+    def _past(self, days: int) -> datetime:
+        return self.now - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def _person(self) -> Tuple[str, str]:
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    def _pick(self, name: str) -> Optional[Dict[str, Any]]:
+        records = self.collections.get(name)
+        return self.rng.choice(records) if records else None
+
+    def _stamps(self, created: datetime) -> Dict[str, str]:
+        updated = created + timedelta(seconds=self.rng.randrange(max(1, int((self.now - created).total_seconds()))))
+        return {"created_at": _timestamp(created), "updated_at": _timestamp(updated)}
+
+    def _customer_ref(self) -> Optional[Dict[str, Any]]:
+        customer = self._pick("customers")
+        if customer is None:
+            return None
+        return {key: customer[key] for key in ("id", "first_name", "last_name", "email", "company")}
+
+    def _make_employees(self, i: int) -> Dict[str, Any]:
+        first, last = self._person()
+        return {
+            "id": f"pro_{i:06d}",
+            "first_name": first,
+            "last_name": last,
+            "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+            "mobile_number": f"555{i:07d}",
+            "role": self.rng.choice(ROLES),
+            "is_active": self.rng.random() < 0.9,
+            "mobile_user": self.rng.random() < 0.7,
+            **self._stamps(self._past(1000)),
+        }
+
+    def _make_customers(self, i: int) -> Dict[str, Any]:
+        first, last = self._person()
+        return {
+            "id": f"cus_{i:07d}",
+            "first_name": first,
+            "last_name": last,
+            "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+            "mobile_number": f"555{i:07d}",
+            "company": f"{last} {self.rng.choice(TRADES)}" if self.rng.random() < 0.3 else None,
+            "tags": self.rng.sample(TAGS, self.rng.randrange(3)),
+            "lead_source": self.rng.choice(["google", "referral", "yelp", None]),
+            **self._stamps(self._past(730)),
+        }
+
+    def _make_material_categories(self, i: int) -> Dict[str, Any]:
+        return {
+            "uuid": f"pbmcat_{i:05d}",
+            "name": f"{TRADES[i % len(TRADES)]} {i // len(TRADES) + 1}",
+            "parent_uuid": None,
+            **self._stamps(self._past(730)),
+        }
+
+    def _make_materials(self, i: int) -> Dict[str, Any]:
+        category = self._pick("material_categories")
+        cost = self.rng.randrange(100, 50000)
+        return {
+            "uuid": f"pbmat_{i:07d}",
+            "name": f"{self.rng.choice(TRADES)} part {i}",
+            "sku": f"SKU-{i:07d}",
+            "cost": cost,
+            "price": int(cost * 1.4),
+            "unit_of_measure": "each",
+            "material_category_uuid": category["uuid"] if category else None,
+            "is_active": self.rng.random() < 0.95,
+            **self._stamps(self._past(730)),
+        }
+
+    def _make_jobs(self, i: int) -> Dict[str, Any]:
+        created = self._past(365)
+        scheduled = created + timedelta(days=self.rng.randrange(-10, 60), hours=self.rng.randrange(8, 17))
+        status = self.rng.choice(WORK_STATUSES)
+        employee = self._pick("employees")
+        trade = self.rng.choice(TRADES)
+        return {
+            "id": f"job_{i:07d}",
+            "invoice_number": str(10000 + i),
+            "description": f"{trade} service call",
+            "customer": self._customer_ref(),
+            "work_status": status,
+            "total_amount": self.rng.randrange(5000, 500000),
+            "outstanding_balance": 0 if status == "complete" else self.rng.randrange(0, 50000),
+            "tags": self.rng.sample(TAGS, self.rng.randrange(3)),
+            "scheduled_start": _timestamp(scheduled),
+            "scheduled_end": _timestamp(scheduled + timedelta(hours=2)),
+            "completed_at": _timestamp(scheduled + timedelta(hours=2)) if status == "complete" else None,
+            "assigned_employees": [
+                {"id": employee["id"], "first_name": employee["first_name"], "last_name": employee["last_name"]}
+            ] if employee else [],
+            "job_fields": {"job_type": {"id": f"jt_{TRADES.index(trade)}", "name": trade}},
+            **self._stamps(created),
+        }
+
+    def _make_estimates(self, i: int) -> Dict[str, Any]:
+        return {
+            "id": f"est_{i:07d}",
+            "estimate_number": str(20000 + i),
+            "customer": self._customer_ref(),
+            "status": self.rng.choice(ESTIMATE_STATUSES),
+            "work_status": self.rng.choice(WORK_STATUSES),
+            "total_amount": self.rng.randrange(10000, 2000000),
+            **self._stamps(self._past(180)),
+        }
+
+    def _make_invoices(self, i: int) -> Dict[str, Any]:
+        created = self._past(365)
+        due = created + timedelta(days=30)
+        status = self.rng.choice(INVOICE_STATUSES)
+        job = self._pick("jobs")
+        return {
+            "id": f"inv_{i:07d}",
+            "invoice_number": str(30000 + i),
+            "job_id": job["id"] if job else None,
+            "customer": self._customer_ref(),
+            "status": status,
+            "amount": self.rng.randrange(5000, 500000),
+            "due_amount": 0 if status == "paid" else self.rng.randrange(0, 500000),
+            "due_date": due.strftime("%Y-%m-%d"),
+            "sent": self.rng.random() < 0.8,
+            "past_due": status == "open" and due < self.now,
+            **self._stamps(created),
+        }
+
+    def _make_leads(self, i: int) -> Dict[str, Any]:
+        return {
+            "id": f"lead_{i:07d}",
+            "customer": self._customer_ref(),
+            "status": self.rng.choice(LEAD_STATUSES),
+            "lead_source": self.rng.choice(["google", "referral", "yelp", "website"]),
+            "tags": self.rng.sample(TAGS, self.rng.randrange(2)),
+            **self._stamps(self._past(365)),
+        }
+
+    def new_id(self, name: str) -> Tuple[str, str]:
+        """Return the id field and a fresh id for a record in a collection."""
+        if name in DATA_KEY_COLLECTIONS:
+            return "uuid", f"{name[:6]}_{uuid.uuid4().hex[:12]}"
+        return "id", f"{name[:4]}_{uuid.uuid4().hex[:12]}"
+
+
+def _resolve(record: Dict[str, Any], path: str) -> List[Any]:
+    """Return every value at a dotted path, descending into lists."""
+    values = [record]
+    for part in path.split("."):
+        found = []
+        for value in values:
+            if isinstance(value, list):
+                found.extend(v.get(part) for v in value if isinstance(v, dict))
+            elif isinstance(value, dict):
+                found.append(value.get(part))
+        values = found
+    flat = []
+    for value in values:
+        flat.extend(value if isinstance(value, list) else [value])
+    return flat
+
+
+def _field_for(sample: Dict[str, Any], name: str) -> Optional[str]:
+    """Map a filter name onto a record field, or None if the records lack it."""
+    if name in FILTER_ALIASES:
+        return FILTER_ALIASES[name]
+    if name in sample:
+        return name
+    if f"{name}_at" in sample:
+        return f"{name}_at"
+    return None
+
+
+def _normalize(value: Any) -> str:
+    # str(True).lower() == "true", matching how the tools send booleans
+    return str(value).lower()
+
+
+def _compile_filters(records: List[Dict[str, Any]], query: Dict[str, str]) -> List[Any]:
+    """Turn query parameters into (kind, field, value) filters the records support."""
+    if not records:
+        return []
+    sample = records[0]
+    filters = []
+    for name, value in query.items():
+        if name in CONTROL_PARAMS or value == "":
+            continue
+        for suffix, kind in (("_min", "min"), ("_max", "max"), ("_after", "min"), ("_before", "max"),
+                             ("_start", "min"), ("_end", "max")):
+            if name.endswith(suffix):
+                base = name[: -len(suffix)]
+                field = _field_for(sample, base)
+                # scheduled_start / scheduled_end are fields themselves, not range filters
+                if field is not None and name not in sample:
+                    if kind == "max" and len(value) == 10:
+                        value += "T23:59:59"
+                    filters.append((kind, field, value[:19]))
+                    break
+        else:
+            field = _field_for(sample, name)
+            if field is not None:
+                wanted = {_normalize(v) for v in value.split(",")}
+                filters.append(("eq", field, wanted))
+    return filters
+
+
+def _matches(record: Dict[str, Any], filters: List[Any], search: Optional[str]) -> bool:
+    for kind, field, value in filters:
+        values = [v for v in _resolve(record, field) if v is not None]
+        if kind == "eq":
+            if not any(_normalize(v) in value for v in values):
+                return False
+        elif not values:
+            return False
+        elif kind == "min" and str(values[0])[:19] < value:
+            return False
+        elif kind == "max" and str(values[0])[:19] > value:
+            return False
+    if search:
+        needle = search.lower()
+        return any(needle in v.lower() for v in _strings(record))
+    return True
+
+
+def _strings(value: Any):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _strings(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _strings(v)
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY the
+    # second one waits on the client's delayed ACK (~40 ms per response)
+    disable_nagle_algorithm = True
+    api: "MockAPI"
+
+    def _send(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.api.count(status)
+
+    def _line_items(self, job_id: str, payload: Any) -> None:
+        """Serve a job's stored line items."""
+        api = self.api
+        if api.get_record("jobs", job_id) is None:
+            self._send(404, {"message": f"jobs {job_id} not found"})
+            return
+        status = 200
+        with api._lock:
+            items = api.line_items.setdefault(job_id, [])
+            if self.command == "POST" and isinstance(payload, dict):
+                status, response = 201, {**payload, "id": f"li_{uuid.uuid4().hex[:12]}"}
+                items.append(response)
+            else:
+                if self.command == "PUT" and isinstance(payload, dict):
+                    items[:] = [
+                        {**item, "id": item.get("id") or f"li_{uuid.uuid4().hex[:12]}"}
+                        for item in payload.get("line_items") or [] if isinstance(item, dict)
+                    ]
+                response = {"data": list(items)}
+        self._send(status, response)
+
+    def _send_file(self) -> None:
+        """Stream a synthetic PDF of api.pdf_size bytes in 64 KiB writes."""
+        size = self.api.pdf_size
+        header = b"%PDF-1.4\n"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        self.wfile.write(header[:size])
+        remaining = size - min(size, len(header))
+        filler = b"0" * 65536
+        while remaining > 0:
+            self.wfile.write(filler[:remaining])
+            remaining -= len(filler)
+        self.api.count(200)
+
+    def _discard(self, length: int) -> int:
+        remaining = length
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 65536))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+        return length - remaining
+
+    def _route(self, path: str) -> Tuple[Optional[str], List[str]]:
+        """Split a path into its collection and the segments after it."""
+        for prefix in PATH_PREFIXES:
+            if path.startswith(prefix):
+                parts = [p for p in path[len(prefix):].split("/") if p]
+                if parts and parts[0] in self.api.data.collections:
+                    return parts[0], parts[1:]
+        parts = [p for p in path.split("/") if p]
+        return (parts[0], parts[1:]) if parts else (None, [])
+
+    def _respond(self) -> None:
+        api = self.api
+        length = int(self.headers.get("Content-Length") or 0)
+        is_json = "json" in (self.headers.get("Content-Type") or "")
+        body = self.rfile.read(length) if length and is_json else b""
+        # Uploads are read in chunks and discarded, so large files do not load the mock
+        received = length if is_json else self._discard(length)
+
+        url = urlparse(self.path)
+        if url.path == "/_mock/stats":
+            self._send(200, api.get_stats())
+            return
+
+        if api.latency or api.jitter:
+            time.sleep(api.latency + api.rng.uniform(0, api.jitter))
+
+        if url.path.startswith("/_mock/files/") and self.command == "GET":
+            self._send_file()
+            return
+
+        if not (self.headers.get("Authorization") or "").startswith("Token "):
+            self._send(401, {"message": "Missing or invalid API token"})
+            return
+        throttled, retry_after = api.throttle()
+        if throttled:
+            self._send(429, {"message": "Too Many Requests"}, {"Retry-After": str(retry_after)})
+            return
+        if api.error_rate and api.rng.random() < api.error_rate:
+            self._send(api.rng.choice(api.error_statuses), {"message": "Injected server error"})
+            return
+
+        collection, rest = self._route(url.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            self._send(400, {"message": "Invalid JSON body"})
+            return
+
+        if collection == "jobs" and len(rest) == 2 and rest[1] == "line_items":
+            self._line_items(rest[0], payload)
+            return
+
+        if self.command == "GET":
+            if collection == "invoices" and len(rest) == 2 and rest[1] == "download":
+                if api.get_record(collection, rest[0]) is None:
+                    self._send(404, {"message": f"{collection} {rest[0]} not found"})
+                    return
+                host = self.headers.get("Host") or "{}:{}".format(*self.server.server_address[:2])
+                self._send(200, {"url": f"http://{host}/_mock/files/{rest[0]}.pdf"})
+            elif not rest:
+                self._send(200, api.list_records(collection, query))
+            elif len(rest) == 1:
+                record = api.get_record(collection, rest[0])
+                if record is None:
+                    self._send(404, {"message": f"{collection} {rest[0]} not found"})
+                else:
+                    self._send(200, record)
+            else:
+                self._send(200, {rest[-1]: [], "page": 1, "page_size": 10, "total_pages": 1, "total_items": 0})
+        elif self.command == "POST" and not rest:
+            self._send(201, api.create_record(collection, payload if isinstance(payload, dict) else {}))
+        elif self.command in ("PUT", "PATCH") and len(rest) == 1:
+            record = api.update_record(collection, rest[0], payload if isinstance(payload, dict) else {})
+            if record is None:
+                self._send(404, {"message": f"{collection} {rest[0]} not found"})
+            else:
+                self._send(200, record)
+        elif self.command == "DELETE" and len(rest) == 1:
+            if api.delete_record(collection, rest[0]):
+                self._send(200, {"deleted": True, "id": rest[0]})
+            else:
+                self._send(404, {"message": f"{collection} {rest[0]} not found"})
+        elif rest and collection in api.data.collections and api.get_record(collection, rest[0]) is None:
+            self._send(404, {"message": f"{collection} {rest[0]} not found"})
+        else:
+            # Sub-resource actions (line items, notes, dispatch, ...) echo their input;
+            # uploads report how many bytes arrived
+            echo = {"path": url.path, "method": self.command, **(payload if isinstance(payload, dict) else {})}
+            if not is_json and received:
+                echo["received_bytes"] = received
+            self._send(200, echo)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class MockAPI:
+    """Threaded mock Housecall Pro API serving synthetic records."""
+
+    def __init__(
+        self,
+        counts: Optional[Dict[str, int]] = None,
+        scale: float = 1.0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit: float = 0.0,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Tuple[int, ...] = (500, 502, 503),
+        pdf_size: int = 256 * 1024,
+        seed: int = 1,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Args:
+            counts: Records per collection, overriding DEFAULT_COUNTS * scale
+            scale: Multiplier applied to DEFAULT_COUNTS
+            latency: Seconds added to every request
+            jitter: Extra random latency, uniform in [0, jitter] seconds
+            rate_limit: Requests per second before answering 429 (0 disables)
+            throttle_rate: Probability of answering any request with 429
+            error_rate: Probability of answering any request with an error status
+            error_statuses: Statuses used for injected errors
+            pdf_size: Size in bytes of the PDFs served for invoice downloads
+            seed: Seed for the synthetic data and injected faults
+        """
+        sizes = {name: int(count * scale) for name, count in DEFAULT_COUNTS.items()}
+        sizes.update(counts or {})
+        self.data = Dataset(sizes, seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.pdf_size = pdf_size
+        self.rng = random.Random(seed)
+
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._statuses: Dict[int, int] = {}
+        self.line_items: Dict[str, List[Dict[str, Any]]] = {}
+
+        handler = type("MockHandler", (_MockHandler,), {"api": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "MockAPI":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def count(self, status: int) -> None:
+        with self._lock:
+            self._statuses[status] = self._statuses.get(status, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return response counts by status and the record count per collection."""
+        with self._lock:
+            statuses = {str(k): v for k, v in sorted(self._statuses.items())}
+        return {
+            "requests": sum(statuses.values()),
+            "statuses": statuses,
+            "records": {name: len(records) for name, records in self.data.collections.items()},
+        }
+
+    def throttle(self) -> Tuple[bool, int]:
+        """Decide whether to answer 429, and the Retry-After seconds to send."""
+        if self.throttle_rate and self.rng.random() < self.throttle_rate:
+            return True, 1
+        if not self.rate_limit:
+            return False, 0
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start, self._window_count = now, 0
+            self._window_count += 1
+            if self._window_count > self.rate_limit:
+                return True, 1
+        return False, 0
+
+    def _records(self, collection: Optional[str]) -> List[Dict[str, Any]]:
+        return self.data.collections.get(collection or "", [])
+
+    def list_records(self, collection: Optional[str], query: Dict[str, str]) -> Dict[str, Any]:
+        """Return one filtered, sorted page of a collection."""
+        records = self._records(collection)
+        filters = _compile_filters(records, query)
+        search = query.get("search") or query.get("q")
+        matched = [r for r in records if _matches(r, filters, search)] if filters or search else list(records)
+
+        sort_by = query.get("sort_by")
+        if sort_by and records and sort_by in records[0]:
+            matched.sort(key=lambda r: (r.get(sort_by) is None, str(r.get(sort_by))),
+                         reverse=query.get("sort_direction", "asc").lower() == "desc")
+
+        page = max(1, int(query.get("page") or 1))
+        page_size = max(1, int(query.get("page_size") or query.get("per_page") or 10))
+        first = (page - 1) * page_size
+        key = "data" if collection in DATA_KEY_COLLECTIONS else (collection or "data")
+        return {
+            key: matched[first:first + page_size],
+            "page": page,
+            "page_size": page_size,
+            "total_pages": max(1, -(-len(matched) // page_size)),
+            "total_items": len(matched),
+        }
+
+    def get_record(self, collection: Optional[str], record_id: str) -> Optional[Dict[str, Any]]:
+        return self.data.index.get(collection or "", {}).get(record_id)
+
+    def create_record(self, collection: Optional[str], fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Add a record to a collection, creating the collection if needed."""
+        id_field, record_id = self.data.new_id(collection or "record")
+        now = _timestamp(datetime.now(timezone.utc))
+        record = {id_field: record_id, **fields, "created_at": now, "updated_at": now}
+        with self.data.lock:
+            self.data.collections.setdefault(collection or "", []).append(record)
+            self.data.index.setdefault(collection or "", {})[record_id] = record
+        return record
+
+    def update_record(self, collection: Optional[str], record_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        record = self.get_record(collection, record_id)
+        if record is not None:
+            with self.data.lock:
+                record.update(fields)
+                record["updated_at"] = _timestamp(datetime.now(timezone.utc))
+        return record
+
+    def delete_record(self, collection: Optional[str], record_id: str) -> bool:
+        with self.data.lock:
+            record = self.data.index.get(collection or "", {}).pop(record_id, None)
+            if record is not None:
+                self.data.collections[collection].remove(record)
+        return record is not None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the default record counts")
+    for name, count in DEFAULT_COUNTS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name,
+                            help=f"Number of {name} (default {count} x scale)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency in seconds")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second before 429s")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Probability of a random 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a random 5xx")
+    parser.add_argument("--pdf-size", type=int, default=256 * 1024, help="Invoice PDF size in bytes")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    counts = {name: getattr(args, name) for name in DEFAULT_COUNTS if getattr(args, name) is not None}
+    start = time.perf_counter()
+    api = MockAPI(
+        counts=counts, scale=args.scale, latency=args.latency, jitter=args.jitter,
+        rate_limit=args.rate_limit, throttle_rate=args.throttle_rate, error_rate=args.error_rate,
+        pdf_size=args.pdf_size, seed=args.seed, host=args.host, port=args.port,
+    )
+    sizes = ", ".join(f"{len(r)} {name}" for name, r in api.data.collections.items())
+    print(f"generated {sizes} in {time.perf_counter() - start:.1f}s")
+    print(f"serving on {api.url} (stats at {api.url}/_mock/stats)")
+    print(f"export HOUSECALL_PRO_API_BASE_URL={api.url}")
+    try:
+        api.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
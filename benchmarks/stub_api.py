@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Slow local stub of the Housecall Pro API for benchmarks.
+
+Serves every path with a small JSON body after a fixed delay, so request
+concurrency can be measured without touching api.housecallpro.com. When
+`total_items` is set, GET requests return a paginated list named after the
+last path segment (e.g. "jobs" for /jobs).
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0.0
+    total_items = 0
+
+    def _page(self) -> dict:
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        key = url.path.rstrip("/").rsplit("/", 1)[-1]
+        page = int(query.get("page", ["1"])[0])
+        page_size = int(query.get("page_size", ["25"])[0])
+        total_pages = max(1, -(-self.total_items // page_size))
+        first = (page - 1) * page_size
+        count = max(0, min(page_size, self.total_items - first))
+        return {
+            key: [
+                {"id": f"{key}_{first + i}", "total_amount": 100}
+                for i in range(count)
+            ],
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "total_items": self.total_items,
+        }
+
+    def _respond(self) -> None:
+        time.sleep(self.delay)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        if self.total_items and self.command == "GET":
+            payload = self._page()
+        else:
+            payload = {"path": self.path, "method": self.command}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class StubAPI:
+    """Threaded stub server that answers every request after `delay` seconds."""
+
+    def __init__(self, delay: float = 0.0, total_items: int = 0):
+        handler = type(
+            "StubHandler", (_StubHandler,), {"delay": delay, "total_items": total_items}
+        )
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubAPI":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Gateway MCP Server
+
+This server exposes the tools of every housecallpro_*.py server module from
+a single process. The tools share one HTTP connection pool, rate limiter,
+response cache and circuit breaker, instead of each domain running as its
+own server process.
+
+Domain modules are imported lazily. Tool definitions come from a manifest
+cached on disk, and a module is imported the first time one of its tools
+is called. A module's manifest entry is rebuilt whenever its file changes.
+
+A tool name defined by more than one module keeps its plain name in the
+module whose domain appears in the name (get_invoices stays in
+housecallpro_invoices). The other copies are prefixed with their module's
+domain, e.g. invoices_query_get_invoices.
+
+The gateway is configured through environment variables:
+    HOUSECALL_PRO_GATEWAY_MODULES: Comma-separated domains to mount, e.g.
+        jobs,customers,scorecard (default all)
+    HOUSECALL_PRO_GATEWAY_MANIFEST: Tool manifest cache file
+        (default ~/.housecallpro-mcp/tool_manifest.json)
+"""
+
+import asyncio
+import importlib
+import importlib.metadata
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from glob import glob
+from types import ModuleType
+from typing import Dict, Any, List, Sequence, Tuple
+
+from dotenv import load_dotenv
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from mcp.types import Tool as MCPTool, ContentBlock
+
+from housecallpro_diagnostics import register_diagnostics_tools
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
+
+if not API_KEY:
+    raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODULE_PREFIX = "housecallpro_"
+MANIFEST_PATH = os.path.expanduser(
+    os.getenv("HOUSECALL_PRO_GATEWAY_MANIFEST") or "~/.housecallpro-mcp/tool_manifest.json"
+)
+MANIFEST_VERSION = 1
+
+# Server modules define a module-level FastMCP instance; helper modules do not
+_SERVER_MODULE = re.compile(r"^mcp = FastMCP\(", re.M)
+
+
+def domain(module_name: str) -> str:
+    """Return a module's domain, e.g. "housecallpro_jobs" -> "jobs"."""
+    return module_name[len(MODULE_PREFIX):]
+
+
+def discover_modules() -> List[str]:
+    """
+    Return the server modules to mount, honoring HOUSECALL_PRO_GATEWAY_MODULES.
+
+    Raises:
+        ValueError: If a requested domain has no server module
+    """
+    modules = []
+    for path in sorted(glob(os.path.join(MODULE_DIR, f"{MODULE_PREFIX}*.py"))):
+        with open(path, encoding="utf-8") as fh:
+            if _SERVER_MODULE.search(fh.read()):
+                modules.append(os.path.basename(path)[:-3])
+
+    selected = os.getenv("HOUSECALL_PRO_GATEWAY_MODULES")
+    if not selected:
+        return modules
+
+    wanted = [MODULE_PREFIX + d.strip() for d in selected.split(",") if d.strip()]
+    unknown = [domain(m) for m in wanted if m not in modules]
+    if unknown:
+        raise ValueError(f"Unknown gateway modules: {', '.join(unknown)}")
+    return wanted
+
+
+def _fingerprint(module_name: str) -> str:
+    """Identify the current version of a module's source file."""
+    stat = os.stat(os.path.join(MODULE_DIR, f"{module_name}.py"))
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _describe_module(module_name: str) -> List[Dict[str, Any]]:
+    """Import a server module and return its tool definitions as JSON."""
+    module = importlib.import_module(module_name)
+    tools = asyncio.run(module.mcp.list_tools())
+    return [tool.model_dump(mode="json", by_alias=True, exclude_none=True) for tool in tools]
+
+
+def load_manifest(modules: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Return the tool definitions of each module, from the cached manifest when
+    it is current and by importing the module otherwise.
+    """
+    environment = f"{sys.version_info[:2]}:{importlib.metadata.version('mcp')}"
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as fh:
+            cached = json.load(fh)
+        if cached.get("version") != MANIFEST_VERSION or cached.get("environment") != environment:
+            cached = {}
+    except (OSError, ValueError):
+        cached = {}
+
+    entries = cached.get("modules", {})
+    changed = False
+    for module_name in modules:
+        fingerprint = _fingerprint(module_name)
+        if entries.get(module_name, {}).get("fingerprint") != fingerprint:
+            entries[module_name] = {"fingerprint": fingerprint, "tools": _describe_module(module_name)}
+            changed = True
+
+    if changed:
+        os.makedirs(os.path.dirname(MANIFEST_PATH), exist_ok=True)
+        with open(MANIFEST_PATH, "w", encoding="utf-8") as fh:
+            json.dump({"version": MANIFEST_VERSION, "environment": environment, "modules": entries}, fh)
+
+    return {module_name: entries[module_name]["tools"] for module_name in modules}
+
+
+class GatewayServer(FastMCP):
+    """FastMCP server that lists manifest tools and forwards calls to lazily imported modules."""
+
+    def __init__(self, manifest: Dict[str, List[Dict[str, Any]]]):
+        super().__init__("Housecall Pro")
+        register_diagnostics_tools(self)
+
+        own_tools = {tool.name for tool in self._tool_manager.list_tools()}
+        owners: Dict[str, List[str]] = defaultdict(list)
+        for module_name, tools in manifest.items():
+            for tool in tools:
+                if tool["name"] not in own_tools:
+                    owners[tool["name"]].append(module_name)
+
+        self._routes: Dict[str, Tuple[str, str]] = {}
+        self._tools: List[MCPTool] = []
+        for module_name, tools in manifest.items():
+            for tool in tools:
+                name = tool["name"]
+                if name in own_tools:
+                    continue
+                exposed = name
+                if len(owners[name]) > 1 and module_name != self._primary_owner(name, owners[name]):
+                    exposed = f"{domain(module_name)}_{name}"
+                self._routes[exposed] = (module_name, name)
+                self._tools.append(MCPTool.model_validate({**tool, "name": exposed}))
+
+    @staticmethod
+    def _primary_owner(name: str, modules: List[str]) -> str:
+        """Pick the module whose domain best matches a shared tool name."""
+        return min(modules, key=lambda m: (-len(domain(m)) if domain(m) in name else 0, m))
+
+    def load_module(self, module_name: str) -> ModuleType:
+        """Import a domain module on first use."""
+        return sys.modules.get(module_name) or importlib.import_module(module_name)
+
+    async def list_tools(self) -> List[MCPTool]:
+        """List the gateway's own tools and every mounted module tool."""
+        return await super().list_tools() + self._tools
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Sequence[ContentBlock] | Dict[str, Any]:
+        """Call a gateway tool, or forward the call to the module that owns it."""
+        route = self._routes.get(name)
+        if route is None:
+            if self._tool_manager.get_tool(name) is None:
+                raise ToolError(f"Unknown tool: {name}")
+            return await super().call_tool(name, arguments)
+
+        module_name, tool_name = route
+        module = self.load_module(module_name)
+        return await module.mcp.call_tool(tool_name, arguments)
+
+
+# FastMCP server
+mcp = GatewayServer(load_manifest(discover_modules()))
+
+
+if __name__ == "__main__":
+    mcp.run()
@@ -8,21 +8,24 @@ including enabling and disabling application access.
 
 import os
 from typing import Optional, Dict, Any
-import json
 
 import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_output import to_json
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Application")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -44,24 +47,14 @@ async def make_api_request(
     json_data: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """Make an API request to Housecall Pro."""
-    url = f"{API_BASE_URL}{endpoint}"
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=get_headers(),
-                params=params,
-                json=json_data,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            return json.dumps({"error": f"HTTP error occurred: {str(e)}"}, indent=2)
-        except Exception as e:
-            return json.dumps({"error": f"An error occurred: {str(e)}"}, indent=2)
+    try:
+        return await api_request(
+            method, endpoint, get_headers(), params=params, json_data=json_data
+        )
+    except httpx.HTTPError as e:
+        return to_json({"error": f"HTTP error occurred: {str(e)}"})
+    except Exception as e:
+        return to_json({"error": f"An error occurred: {str(e)}"})
 
 
 @mcp.tool()
@@ -8,21 +8,24 @@ including CRUD operations for appointments.
 
 import os
 from typing import Optional, Dict, Any, List
-import json
 
 import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_output import to_json
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Appointments")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -37,28 +40,25 @@ def get_headers() -> Dict[str, str]:
     }
 
 
-def make_api_request(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+async def make_api_request(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    json_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """Make an API request to Housecall Pro."""
-    url = f"{API_BASE_URL}/{endpoint.lstrip('/')}"
-    
-    # Add headers
-    headers = get_headers()
-    if 'headers' in kwargs:
-        headers.update(kwargs.pop('headers'))
-    
     try:
-        with httpx.Client() as client:
-            response = client.request(method, url, headers=headers, **kwargs)
-            response.raise_for_status()
-            return response.json() if response.content else {}
+        return await api_request(
+            method, endpoint, get_headers(), params=params, json_data=json_data
+        )
     except httpx.HTTPStatusError as e:
-        return json.dumps({"error": f"HTTP {e.response.status_code}: {e.response.text}"}, indent=2)
+        return to_json({"error": f"HTTP {e.response.status_code}: {e.response.text}"})
     except Exception as e:
-        return json.dumps({"error": f"Request failed: {str(e)}"}, indent=2)
+        return to_json({"error": f"Request failed: {str(e)}"})
 
 
 @mcp.tool()
-def get_appointments(
+async def get_appointments(
     page: Optional[int] = 1,
     page_size: Optional[int] = 50,
     customer_id: Optional[str] = None,
@@ -98,12 +98,12 @@ def get_appointments(
     if status:
         params["status"] = status
     
-    result = make_api_request("GET", "appointments", params=params)
-    return json.dumps(result, indent=2)
+    result = await make_api_request("GET", "appointments", params=params)
+    return to_json(result)
 
 
 @mcp.tool()
-def create_appointment(
+async def create_appointment(
     customer_id: str,
     employee_id: str,
     start_time: str,
@@ -141,12 +141,12 @@ def create_appointment(
     if address:
         data["address"] = address
     
-    result = make_api_request("POST", "appointments", json=data)
-    return json.dumps(result, indent=2)
+    result = await make_api_request("POST", "appointments", json_data=data)
+    return to_json(result)
 
 
 @mcp.tool()
-def update_appointment(
+async def update_appointment(
     appointment_id: str,
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
@@ -181,12 +181,12 @@ def update_appointment(
     if status is not None:
         data["status"] = status
     
-    result = make_api_request("PUT", f"appointments/{appointment_id}", json=data)
-    return json.dumps(result, indent=2)
+    result = await make_api_request("PUT", f"appointments/{appointment_id}", json_data=data)
+    return to_json(result)
 
 
 @mcp.tool()
-def delete_appointment(appointment_id: str) -> str:
+async def delete_appointment(appointment_id: str) -> str:
     """
     Delete an appointment from Housecall Pro.
     
@@ -196,8 +196,8 @@ def delete_appointment(appointment_id: str) -> str:
     Returns:
         JSON string confirming deletion
     """
-    result = make_api_request("DELETE", f"appointments/{appointment_id}")
-    return json.dumps(result, indent=2)
+    result = await make_api_request("DELETE", f"appointments/{appointment_id}")
+    return to_json(result)
 
 
 if __name__ == "__main__":
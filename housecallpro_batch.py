@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Batch Helpers
+
+This module runs one API call per item for batch tools (several line items,
+jobs or tags in one tool call) with a bounded number of calls in flight.
+Every call still goes through the shared client, so the client-side rate
+limiter, retry policy and circuit breakers apply to each one. A failed item
+is recorded with its error and does not stop the others.
+
+Batches are configured through environment variables:
+    HOUSECALL_PRO_BATCH_CONCURRENCY: Calls in flight per batch (default 5)
+"""
+
+import asyncio
+import os
+from typing import Optional, Dict, Any, List, Awaitable, Callable, TypeVar
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+BATCH_CONCURRENCY = int(os.getenv("HOUSECALL_PRO_BATCH_CONCURRENCY", "5"))
+
+T = TypeVar("T")
+
+
+async def run_batch(
+    items: List[T],
+    call: Callable[[T], Awaitable[Any]],
+    concurrency: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Call `call(item)` for every item with at most `concurrency` calls in flight.
+
+    Args:
+        items: Items to process
+        call: Coroutine function run once per item
+        concurrency: Calls in flight at once (default BATCH_CONCURRENCY)
+
+    Returns:
+        One outcome per item, in input order: {"ok": True, "result": ...} or
+        {"ok": False, "error": "..."}
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency or BATCH_CONCURRENCY))
+
+    async def run_one(item: T) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                return {"ok": True, "result": await call(item)}
+            except Exception as e:
+                return {"ok": False, "error": str(e)}
+
+    return list(await asyncio.gather(*(run_one(item) for item in items)))
+
+
+def summarize(outcomes: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Count the succeeded and failed outcomes of a batch."""
+    succeeded = sum(1 for outcome in outcomes if outcome.get("ok"))
+    return {"succeeded": succeeded, "failed": len(outcomes) - succeeded}
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Response Cache
+
+This module provides the in-process response cache used by housecallpro_client
+for reference data that rarely changes within a conversation: company,
+application settings, job types, tags, lead sources, material categories
+and employees.
+
+Successful GET responses for those endpoint families are cached per
+endpoint and normalized query parameters, with a TTL per family and an LRU
+bound on the total response size. Concurrent identical requests share one
+API call (single-flight). Any non-GET request to a family, such as
+create_tag or update_job_type, invalidates that family's entries.
+
+The cache is configured through environment variables:
+    HOUSECALL_PRO_CACHE: Enable the response cache (default on)
+    HOUSECALL_PRO_CACHE_MAX_BYTES: Maximum total size of cached responses (default 16 MiB)
+    HOUSECALL_PRO_CACHE_TTL_<FAMILY>: TTL override in seconds for one family,
+        e.g. HOUSECALL_PRO_CACHE_TTL_TAGS=60 (0 disables caching for it)
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Awaitable, Callable, Hashable, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+from housecallpro_circuit import endpoint_family
+from housecallpro_ratelimit import limiter_key
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+CACHE_ENABLED = os.getenv("HOUSECALL_PRO_CACHE", "on").strip().lower() not in ("0", "false", "no", "off")
+CACHE_MAX_BYTES = int(os.getenv("HOUSECALL_PRO_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# Default TTL in seconds per endpoint family; families not listed are never cached
+CACHE_TTLS = {
+    "company": 3600,
+    "application": 600,
+    "job_types": 1800,
+    "tags": 900,
+    "lead_sources": 1800,
+    "material_categories": 1800,
+    "employees": 600,
+}
+
+Send = Callable[[], Awaitable[httpx.Response]]
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `call`, or wait for the identical call already in flight.
+
+        The call runs in its own task, so one caller being cancelled does not
+        cancel it for the others.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            self.calls += 1
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+
+class ResponseCache:
+    """LRU cache of responses with per-entry expiry and a total size bound."""
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Tuple, Tuple[float, httpx.Response]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple) -> Optional[httpx.Response]:
+        """Return a fresh cached response and mark it recently used."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def put(self, key: Tuple, response: httpx.Response, ttl: float) -> None:
+        """Store a response, evicting least recently used entries over the size bound."""
+        size = len(response.content)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, response)
+        self.size += size
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def generation(self, family: str) -> int:
+        """Return the invalidation counter for a family."""
+        return self._generations.get(family, 0)
+
+    def invalidate(self, family: str) -> None:
+        """Drop every entry of an endpoint family."""
+        self._generations[family] = self.generation(family) + 1
+        for key in [k for k in self._entries if k[0] == family]:
+            self._remove(key)
+            self.stats["invalidations"] += 1
+
+    def _remove(self, key: Tuple) -> None:
+        _, response = self._entries.pop(key)
+        self.size -= len(response.content)
+
+
+_cache = ResponseCache()
+_flight = SingleFlight()
+
+
+def cache_ttl(family: str) -> float:
+    """Return the TTL for an endpoint family, or 0 if it is not cached."""
+    if not CACHE_ENABLED:
+        return 0
+    override = os.getenv(f"HOUSECALL_PRO_CACHE_TTL_{family.upper()}")
+    if override:
+        return float(override)
+    return CACHE_TTLS.get(family, 0)
+
+
+def request_key(
+    endpoint: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, Any]],
+) -> Tuple:
+    """Identify a GET by its API key, endpoint and normalized query parameters."""
+    normalized = tuple(sorted(
+        (str(k), str(v)) for k, v in (params or {}).items() if v is not None
+    ))
+    return (limiter_key(headers), endpoint.strip("/"), normalized)
+
+
+async def through_cache(
+    method: str,
+    endpoint: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, Any]],
+    send: Send,
+) -> httpx.Response:
+    """
+    Serve a request from the cache when possible, otherwise send it.
+
+    GET requests to cached families are answered from the cache or
+    coalesced with an identical request in flight; successful responses are
+    stored. Other methods invalidate their family before and after sending,
+    so reads started during the mutation are not cached.
+    """
+    family = endpoint_family(endpoint)
+
+    if method.upper() != "GET":
+        _cache.invalidate(family)
+        try:
+            return await send()
+        finally:
+            _cache.invalidate(family)
+
+    ttl = cache_ttl(family)
+    if ttl <= 0:
+        return await send()
+
+    key = (family,) + request_key(endpoint, headers, params)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    async def fetch() -> httpx.Response:
+        generation = _cache.generation(family)
+        response = await send()
+        if response.is_success and _cache.generation(family) == generation:
+            _cache.put(key, response, ttl)
+        return response
+
+    return await _flight.run(key, fetch)
+
+
+def invalidate(endpoint: str) -> None:
+    """Drop cached responses for an endpoint's family."""
+    _cache.invalidate(endpoint_family(endpoint))
+
+
+def store(endpoint: str, headers: Dict[str, str], data: Any) -> bool:
+    """
+    Seed the cache with a known-fresh GET response for an endpoint, such as
+    a record delivered by a webhook event.
+
+    Returns:
+        True if the endpoint's family is cached and the response was stored
+    """
+    family = endpoint_family(endpoint)
+    ttl = cache_ttl(family)
+    if ttl <= 0:
+        return False
+    response = httpx.Response(200, json=data, request=httpx.Request("GET", endpoint))
+    _cache.put((family,) + request_key(endpoint, headers, None), response, ttl)
+    return True
+
+
+def get_stats() -> Dict[str, Any]:
+    """Return cache counters, current size and coalesced requests."""
+    return {
+        **_cache.stats,
+        "entries": len(_cache),
+        "bytes": _cache.size,
+        "max_bytes": _cache.max_bytes,
+        "coalesced": _flight.coalesced,
+    }
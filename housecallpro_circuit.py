@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Circuit Breaker
+
+This module keeps one circuit breaker per endpoint family (jobs, customers,
+invoices, ...) in the shared request path used by housecallpro_client.
+After several consecutive network errors or 5xx responses the circuit
+opens and requests to that family fail fast with CircuitOpenError instead
+of each waiting out the request timeout.
+
+While a circuit is open, a background task probes the family with a
+small GET once the recovery timeout has passed (half-open). A healthy
+response closes the circuit. A failed probe reopens it and doubles the
+recovery timeout, up to a maximum. If no background task is running,
+the first request after the recovery timeout acts as the probe.
+
+The breaker is configured through environment variables:
+    HOUSECALL_PRO_CIRCUIT_FAILURES: Consecutive failures that open a circuit (default 5, 0 disables)
+    HOUSECALL_PRO_CIRCUIT_RECOVERY: Seconds before an open circuit is probed (default 15)
+    HOUSECALL_PRO_CIRCUIT_MAX_RECOVERY: Maximum seconds between probes (default 120)
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from typing import Optional, Dict, Any, Awaitable, Callable, List
+
+import httpx
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+CIRCUIT_FAILURES = int(os.getenv("HOUSECALL_PRO_CIRCUIT_FAILURES", "5"))
+CIRCUIT_RECOVERY = float(os.getenv("HOUSECALL_PRO_CIRCUIT_RECOVERY", "15"))
+CIRCUIT_MAX_RECOVERY = float(os.getenv("HOUSECALL_PRO_CIRCUIT_MAX_RECOVERY", "120"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+Send = Callable[[], Awaitable[httpx.Response]]
+
+_breakers: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised instead of sending a request while its circuit is open."""
+
+    def __init__(self, breaker: "CircuitBreaker"):
+        self.family = breaker.family
+        self.retry_in = breaker.retry_in()
+        super().__init__(
+            f"Housecall Pro API is unavailable for '{breaker.family}' "
+            f"after {breaker.failures} consecutive failures "
+            f"(last: {breaker.last_failure}); not sending requests for "
+            f"another {self.retry_in:.0f}s"
+        )
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one endpoint family."""
+
+    def __init__(
+        self,
+        family: str,
+        probe_endpoint: str,
+        failure_threshold: int = CIRCUIT_FAILURES,
+        recovery_timeout: float = CIRCUIT_RECOVERY,
+        max_recovery_timeout: float = CIRCUIT_MAX_RECOVERY,
+    ):
+        self.family = family
+        self.probe_endpoint = probe_endpoint
+        self.failure_threshold = failure_threshold
+        self.base_recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max(recovery_timeout, max_recovery_timeout)
+        self.recovery_timeout = recovery_timeout
+
+        self.state = CLOSED
+        self.failures = 0
+        self.last_failure: Optional[str] = None
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self.rejected = 0
+        self.probes = 0
+
+        self.probe: Optional[Send] = None
+        self._trial_in_flight = False
+        self._probe_task: Optional[asyncio.Task] = None
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit may be probed."""
+        if self.state != OPEN or self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    def before_request(self) -> None:
+        """
+        Check whether a request may be sent.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                probe already in flight
+        """
+        if self.state == OPEN and self.retry_in() <= 0:
+            self.state = HALF_OPEN
+
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+
+        if self.state != CLOSED:
+            self.rejected += 1
+            raise CircuitOpenError(self)
+
+    def record_success(self) -> None:
+        """Close the circuit after a healthy response."""
+        if self.state != CLOSED:
+            logger.info("Circuit for '%s' closed", self.family)
+        self.state = CLOSED
+        self.failures = 0
+        self.recovery_timeout = self.base_recovery_timeout
+        self._trial_in_flight = False
+
+    def record_failure(self, reason: str) -> None:
+        """Count a failure and open the circuit at the threshold or on a failed probe."""
+        self.failures += 1
+        self.last_failure = reason
+
+        if self.state == HALF_OPEN:
+            self._trial_in_flight = False
+            self.recovery_timeout = min(self.max_recovery_timeout, self.recovery_timeout * 2)
+            self._open()
+        elif self.state == CLOSED and self.failures >= self.failure_threshold:
+            self._open()
+
+    def release_trial(self) -> None:
+        """Let another request probe a half-open circuit after a cancelled trial."""
+        self._trial_in_flight = False
+
+    def _open(self) -> None:
+        """Open the circuit and start background probing."""
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        logger.warning(
+            "Circuit for '%s' opened after %d failures (last: %s); probing in %.0fs",
+            self.family, self.failures, self.last_failure, self.recovery_timeout,
+        )
+        self._ensure_probe_task()
+
+    def _ensure_probe_task(self) -> None:
+        """Start the background probe task if none is running on this loop."""
+        if self.probe is None or (self._probe_task and not self._probe_task.done()):
+            return
+        try:
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_loop())
+        except RuntimeError:
+            self._probe_task = None
+
+    async def _probe_loop(self) -> None:
+        """Probe the open circuit until it closes."""
+        while self.state == OPEN:
+            await asyncio.sleep(self.retry_in())
+            if self.state != OPEN or self.probe is None:
+                return
+
+            self.state = HALF_OPEN
+            self._trial_in_flight = True
+            self.probes += 1
+            try:
+                response = await self.probe()
+            except httpx.HTTPError as e:
+                self.record_failure(type(e).__name__)
+                continue
+            except asyncio.CancelledError:
+                self.state = OPEN
+                self._trial_in_flight = False
+                raise
+
+            if response.status_code >= 500:
+                self.record_failure(str(response.status_code))
+            else:
+                self.record_success()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "family": self.family,
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "last_failure": self.last_failure,
+            "retry_in_seconds": round(self.retry_in(), 1),
+            "recovery_timeout": self.recovery_timeout,
+            "times_opened": self.times_opened,
+            "rejected_requests": self.rejected,
+            "probes": self.probes,
+        }
+
+
+def _family_segments(endpoint: str) -> List[str]:
+    """Return the path segments up to and including the endpoint family."""
+    segments = [s for s in endpoint.split("?")[0].strip("/").split("/") if s]
+    prefix: List[str] = []
+    while segments and re.fullmatch(r"v\d+", segments[0]):
+        prefix.append(segments.pop(0))
+    return prefix + segments[:1]
+
+
+def endpoint_family(endpoint: str) -> str:
+    """Map an endpoint path to its family, e.g. "/v1/invoices/123" -> "invoices"."""
+    segments = _family_segments(endpoint)
+    return segments[-1] if segments else "root"
+
+
+def get_breaker(endpoint: str) -> CircuitBreaker:
+    """Return the circuit breaker for an endpoint's family, creating it on first use."""
+    family = endpoint_family(endpoint)
+    breaker = _breakers.get(family)
+    if breaker is None:
+        probe_endpoint = "/" + "/".join(_family_segments(endpoint))
+        breaker = _breakers[family] = CircuitBreaker(family, probe_endpoint)
+    return breaker
+
+
+async def guarded(
+    endpoint: str,
+    send: Send,
+    probe: Callable[[str], Awaitable[httpx.Response]],
+) -> httpx.Response:
+    """
+    Send a request through the circuit breaker for its endpoint family.
+
+    Args:
+        endpoint: API endpoint path, used to pick the endpoint family
+        send: Coroutine function that sends the request once
+        probe: Coroutine function sending a health-check GET to a path
+
+    Raises:
+        CircuitOpenError: If the family's circuit is open
+    """
+    if CIRCUIT_FAILURES <= 0:
+        return await send()
+
+    breaker = get_breaker(endpoint)
+    breaker.probe = lambda: probe(breaker.probe_endpoint)
+    breaker.before_request()
+
+    try:
+        response = await send()
+    except httpx.HTTPError as e:
+        breaker.record_failure(type(e).__name__)
+        raise
+    except BaseException:
+        breaker.release_trial()
+        raise
+
+    if response.status_code >= 500:
+        breaker.record_failure(str(response.status_code))
+    else:
+        breaker.record_success()
+    return response
+
+
+def get_states() -> List[Dict[str, Any]]:
+    """Return the state of every circuit breaker created so far."""
+    return [breaker.snapshot() for breaker in _breakers.values()]
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Shared HTTP Client
+
+This module provides the pooled HTTP client shared by every Housecall Pro
+MCP server module. A single long-lived httpx.AsyncClient keeps connections
+to the API alive between tool calls, so back-to-back calls reuse warm
+connections instead of paying a new TCP+TLS handshake each time.
+
+Pool behaviour is configured through environment variables:
+    HOUSECALL_PRO_MAX_CONNECTIONS: Maximum open connections (default 20)
+    HOUSECALL_PRO_MAX_KEEPALIVE: Maximum idle keep-alive connections (default 10)
+    HOUSECALL_PRO_KEEPALIVE_EXPIRY: Seconds an idle connection is kept (default 60)
+    HOUSECALL_PRO_TIMEOUT: Request timeout in seconds (default 30)
+    HOUSECALL_PRO_HTTP2: Enable HTTP/2 when the h2 package is installed (default off)
+    HOUSECALL_PRO_API_BASE_URL: API base URL, e.g. a local mock server for
+        load testing (default https://api.housecallpro.com)
+
+Requests are throttled by the shared token bucket in housecallpro_ratelimit,
+transient failures are retried according to housecallpro_retry, and each
+endpoint family is guarded by a circuit breaker from housecallpro_circuit.
+Reference data GETs are served from the response cache in housecallpro_cache,
+and identical GETs in flight at the same time are coalesced into one call.
+
+upload_file sends a local file as multipart form data straight from disk, in
+64 KiB chunks, so large attachments never sit in memory as one bytes object.
+download_file does the reverse for GET responses such as invoice PDFs,
+writing the body to disk in DOWNLOAD_CHUNK_SIZE chunks as it arrives.
+"""
+
+import asyncio
+import hashlib
+import json
+import mimetypes
+import os
+import tempfile
+from typing import Optional, Dict, Any
+
+import httpx
+from dotenv import load_dotenv
+
+import housecallpro_cache
+import housecallpro_circuit
+import housecallpro_ratelimit
+import housecallpro_retry
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+API_BASE_URL = (os.getenv("HOUSECALL_PRO_API_BASE_URL") or "https://api.housecallpro.com").rstrip("/")
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# Identical GETs in flight at the same time share one request and parsed result
+_coalescer = housecallpro_cache.SingleFlight()
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment."""
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment."""
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    """Read a boolean setting from the environment."""
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def http2_available() -> bool:
+    """Return True if the optional h2 package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_pool_settings() -> Dict[str, Any]:
+    """Return the connection pool settings resolved from the environment."""
+    return {
+        "max_connections": _env_int("HOUSECALL_PRO_MAX_CONNECTIONS", 20),
+        "max_keepalive_connections": _env_int("HOUSECALL_PRO_MAX_KEEPALIVE", 10),
+        "keepalive_expiry": _env_float("HOUSECALL_PRO_KEEPALIVE_EXPIRY", 60.0),
+        "timeout": _env_float("HOUSECALL_PRO_TIMEOUT", 30.0),
+        "http2": _env_bool("HOUSECALL_PRO_HTTP2") and http2_available(),
+    }
+
+
+def _client_options() -> Dict[str, Any]:
+    """Build the httpx client options from the current pool settings."""
+    settings = get_pool_settings()
+    limits = httpx.Limits(
+        max_connections=settings["max_connections"],
+        max_keepalive_connections=settings["max_keepalive_connections"],
+        keepalive_expiry=settings["keepalive_expiry"],
+    )
+    return {
+        "limits": limits,
+        "timeout": httpx.Timeout(settings["timeout"]),
+        "http2": settings["http2"],
+    }
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the shared client, creating it on first use.
+
+    Connections are bound to the event loop that opened them, so a new
+    client is created if the running loop has changed since the last call.
+    """
+    global _client, _client_loop
+
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(**_client_options())
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client and release its pooled connections."""
+    global _client, _client_loop
+
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+def build_url(endpoint: str) -> str:
+    """Join an API endpoint path onto the API base URL."""
+    return f"{API_BASE_URL}/{endpoint.lstrip('/')}"
+
+
+def _request_headers(headers: Dict[str, str], files: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """Drop the JSON content type for multipart uploads so httpx can set the boundary."""
+    if files is None:
+        return headers
+    return {k: v for k, v in headers.items() if k.lower() != "content-type"}
+
+
+async def send_request(
+    method: str,
+    endpoint: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, Any]] = None,
+    json_data: Optional[Any] = None,
+    files: Optional[Dict[str, Any]] = None,
+) -> httpx.Response:
+    """
+    Send a request to Housecall Pro over the shared connection pool.
+
+    Every attempt first takes a token from the client-side rate limiter.
+    Transient failures are retried with backoff; multipart uploads are sent
+    once because their file handles cannot be replayed. Requests to an
+    endpoint family whose circuit is open fail fast. Cacheable GETs may be
+    answered from the response cache; other methods invalidate it.
+
+    Args:
+        method: HTTP method (GET, POST, PUT, PATCH, DELETE)
+        endpoint: API endpoint path
+        headers: Request headers, including authorization
+        params: Query parameters
+        json_data: JSON data for request body
+        files: Multipart files for upload requests
+
+    Returns:
+        The raw httpx response
+
+    Raises:
+        housecallpro_circuit.CircuitOpenError: If the endpoint's circuit is open
+    """
+    async def send_once() -> httpx.Response:
+        await housecallpro_ratelimit.acquire(headers)
+        client = get_client()
+        return await client.request(
+            method,
+            build_url(endpoint),
+            headers=_request_headers(headers, files),
+            params=params,
+            json=json_data,
+            files=files,
+        )
+
+    async def probe(path: str) -> httpx.Response:
+        await housecallpro_ratelimit.acquire(headers)
+        client = get_client()
+        return await client.get(build_url(path), headers=headers, params={"page_size": 1})
+
+    async def send() -> httpx.Response:
+        return await housecallpro_circuit.guarded(endpoint, send_once, probe)
+
+    async def send_with_retry() -> httpx.Response:
+        return await housecallpro_retry.send_with_retry(method, send, retry=files is None)
+
+    return await housecallpro_cache.through_cache(method, endpoint, headers, params, send_with_retry)
+
+
+async def api_request(
+    method: str,
+    endpoint: str,
+    headers: Dict[str, str],
+    params: Optional[Dict[str, Any]] = None,
+    json_data: Optional[Any] = None,
+    files: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """
+    Make an API request to Housecall Pro and return the parsed JSON body.
+
+    Concurrent identical GETs share one HTTP call and the same parsed result,
+    which callers must treat as read-only.
+
+    Raises:
+        httpx.HTTPStatusError: If the API returns an error status
+        httpx.HTTPError: If the request fails to complete
+    """
+    async def call() -> Any:
+        response = await send_request(
+            method, endpoint, headers, params=params, json_data=json_data, files=files
+        )
+        response.raise_for_status()
+        return response.json() if response.content else {}
+
+    if method.upper() != "GET":
+        return await call()
+    return await _coalescer.run(housecallpro_cache.request_key(endpoint, headers, params), call)
+
+
+async def upload_file(
+    endpoint: str,
+    headers: Dict[str, str],
+    file_path: str,
+    field: str = "attachment",
+    filename: Optional[str] = None,
+    content_type: Optional[str] = None,
+) -> Any:
+    """
+    Upload a local file as a multipart POST and return the parsed JSON body.
+
+    The file is streamed from disk as the request body is sent; its size
+    is taken from the file system for the Content-Length header.
+
+    Args:
+        endpoint: API endpoint path
+        headers: Request headers, including authorization
+        file_path: Path of the file to upload
+        field: Multipart form field name (default "attachment")
+        filename: File name sent to the API (default the file's base name)
+        content_type: MIME type (default guessed from the file name)
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        httpx.HTTPStatusError: If the API returns an error status
+    """
+    path = os.path.expanduser(file_path)
+    filename = filename or os.path.basename(path)
+    content_type = content_type or mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    with open(path, "rb") as fh:
+        return await api_request("POST", endpoint, headers, files={field: (filename, fh, content_type)})
+
+
+async def download_file(
+    url: str,
+    headers: Dict[str, str],
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Stream a GET response body to a file.
+
+    API endpoints go through the same rate limiter, circuit breaker and
+    retry policy as api_request. Absolute URLs on another host, such as
+    pre-signed file links, are fetched without the API headers so the
+    token is never sent elsewhere. The body is written to a temporary file
+    next to `path` and renamed into place once complete.
+
+    Args:
+        url: API endpoint path, or an absolute URL
+        headers: Request headers, including authorization
+        path: Destination file; parent directories are created
+        params: Query parameters
+
+    Returns:
+        {"path", "bytes", "sha256", "content_type"} for a written file. A JSON
+        response is not written; it is returned parsed as {"json": ...} so the
+        caller can follow a download link it contains.
+
+    Raises:
+        httpx.HTTPStatusError: If the final response has an error status
+    """
+    is_api = not url.startswith(("http://", "https://")) or url.startswith(f"{API_BASE_URL}/")
+    endpoint = url[len(API_BASE_URL):] if url.startswith(f"{API_BASE_URL}/") else url
+    target = build_url(endpoint) if is_api else url
+    request_headers = headers if is_api else {}
+
+    async def send_once() -> httpx.Response:
+        if is_api:
+            await housecallpro_ratelimit.acquire(headers)
+        client = get_client()
+        response = await client.send(
+            client.build_request("GET", target, headers=request_headers, params=params), stream=True
+        )
+        if response.status_code >= 400:
+            # Read error bodies so a response dropped by a retry releases its connection
+            await response.aread()
+        return response
+
+    async def probe(probe_path: str) -> httpx.Response:
+        await housecallpro_ratelimit.acquire(headers)
+        client = get_client()
+        return await client.get(build_url(probe_path), headers=headers, params={"page_size": 1})
+
+    async def send() -> httpx.Response:
+        if not is_api:
+            return await send_once()
+        return await housecallpro_circuit.guarded(endpoint, send_once, probe)
+
+    response = await housecallpro_retry.send_with_retry("GET", send)
+    try:
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "")
+        if "json" in content_type:
+            return {"json": json.loads(await response.aread() or b"{}")}
+
+        path = os.path.abspath(os.path.expanduser(path))
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, partial = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".part")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    fh.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            os.replace(partial, path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+    finally:
+        await response.aclose()
+
+    return {"path": path, "bytes": size, "sha256": digest.hexdigest(), "content_type": content_type}
+
+
+def get_coalescing_stats() -> Dict[str, int]:
+    """Return how many GETs were sent and how many joined a call already in flight."""
+    return {"sent": _coalescer.calls, "coalesced": _coalescer.coalesced}
+
@@ -8,19 +8,21 @@ This server provides company information functionality for Housecall Pro.
 import os
 from typing import Dict, Any
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Company")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -45,11 +47,7 @@ async def get_company() -> Dict[str, Any]:
     Returns:
         A dictionary containing the company information.
     """
-    headers = get_headers()
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{API_BASE_URL}/company", headers=headers)
-        response.raise_for_status()
-        return response.json()
+    return await api_request("GET", "/company", get_headers())
 
 if __name__ == "__main__":
     mcp.run() 
\ No newline at end of file
@@ -13,15 +13,21 @@ import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_output import select_fields
+from housecallpro_pagination import fetch_all_pages
+from housecallpro_replica import query_replica, unsupported_filters
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Customers")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -36,15 +42,16 @@ def get_headers() -> Dict[str, str]:
     }
 
 
-async def make_api_request(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+async def make_api_request(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    json_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """Make an API request to Housecall Pro."""
-    url = f"{API_BASE_URL}{endpoint}"
-    headers = get_headers()
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.request(method, url, headers=headers, **kwargs)
-        response.raise_for_status()
-        return response.json()
+    return await api_request(
+        method, endpoint, get_headers(), params=params, json_data=json_data
+    )
 
 
 # CUSTOMER ENDPOINTS
@@ -63,7 +70,10 @@ async def get_customers(
     created_start: Optional[str] = None,
     created_end: Optional[str] = None,
     updated_start: Optional[str] = None,
-    updated_end: Optional[str] = None
+    updated_end: Optional[str] = None,
+    all_pages: Optional[bool] = None,
+    use_replica: Optional[bool] = None,
+    fields: Optional[str] = None
 ) -> dict:
     """
     Get a list of customers with optional filtering.
@@ -82,6 +92,11 @@ async def get_customers(
         created_end: Filter by creation date end (ISO 8601 format)
         updated_start: Filter by update date start (ISO 8601 format)
         updated_end: Filter by update date end (ISO 8601 format)
+        all_pages: Follow pagination and return every matching customer, starting at `page`
+        use_replica: Answer from the local replica instead of the API (see housecallpro_sync);
+                     tags is not supported there
+        fields: Comma-separated fields to return for each customer, with dotted paths for
+                nested fields (e.g. "id,first_name,last_name,email,addresses.city"); default all
     """
     params = {
         "page": page,
@@ -102,19 +117,50 @@ async def get_customers(
     # Remove None values from params
     clean_params = {k: v for k, v in params.items() if v is not None}
     
-    return await make_api_request("GET", "/customers", params=clean_params)
+    if use_replica:
+        unsupported_filters(tags=tags)
+        result = await query_replica(
+            "customers",
+            get_headers(),
+            equals={
+                "email": email,
+                "mobile_number": phone,
+                "company": company_name,
+                "first_name": first_name,
+                "last_name": last_name,
+            },
+            ranges={
+                "created_at": (created_start, created_end),
+                "updated_at": (updated_start, updated_end),
+            },
+            search=(["first_name", "last_name", "email", "company", "mobile_number"], search),
+            page=page,
+            page_size=None if all_pages else per_page or 20,
+        )
+    elif all_pages:
+        result = await fetch_all_pages(
+            lambda p: make_api_request("GET", "/customers", params={**clean_params, "page": p}),
+            "customers",
+            start_page=page or 1,
+        )
+    else:
+        result = await make_api_request("GET", "/customers", params=clean_params)
+    
+    return select_fields(result, fields, "customers")
 
 
 @mcp.tool()
-async def get_customer(customer_id: str) -> dict:
+async def get_customer(customer_id: str, fields: Optional[str] = None) -> dict:
     """
     Get a specific customer by ID.
     
     Args:
         customer_id: The unique identifier for the customer
+        fields: Comma-separated fields to return, with dotted paths for nested
+                fields (e.g. "id,first_name,last_name,email,addresses.city"); default all
     """
     try:
-        return await make_api_request("GET", f"/customers/{customer_id}")
+        return select_fields(await make_api_request("GET", f"/customers/{customer_id}"), fields)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             return {"error": f"Customer {customer_id} not found"}
@@ -180,7 +226,7 @@ async def create_customer(
     if notes:
         customer_data["notes"] = notes
     
-    return await make_api_request("POST", "/customers", json=customer_data)
+    return await make_api_request("POST", "/customers", json_data=customer_data)
 
 
 @mcp.tool()
@@ -245,7 +291,7 @@ async def update_customer(
     if notes is not None:
         customer_data["notes"] = notes
     
-    return await make_api_request("PUT", f"/customers/{customer_id}", json=customer_data)
+    return await make_api_request("PUT", f"/customers/{customer_id}", json_data=customer_data)
 
 
 @mcp.tool()
@@ -324,7 +370,7 @@ async def create_customer_address(
     if contact_phone:
         address_data["contact_phone"] = contact_phone
     
-    return await make_api_request("POST", f"/customers/{customer_id}/addresses", json=address_data)
+    return await make_api_request("POST", f"/customers/{customer_id}/addresses", json_data=address_data)
 
 
 # Run the server
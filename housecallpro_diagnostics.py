@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Diagnostics Tools
+
+This module registers a diagnostics tool on a server module's FastMCP
+instance. The tool reports the shared request path's health for the
+current server process: circuit breaker state per endpoint family, retry
+counters, rate limiter counters, response cache counters and request
+coalescing counters.
+"""
+
+from mcp.server.fastmcp import FastMCP
+
+import housecallpro_cache
+import housecallpro_circuit
+import housecallpro_client
+import housecallpro_ratelimit
+import housecallpro_retry
+from housecallpro_output import to_json
+
+
+def register_diagnostics_tools(mcp: FastMCP) -> None:
+    """Add the get_api_diagnostics tool to a server."""
+
+    @mcp.tool()
+    async def get_api_diagnostics() -> str:
+        """
+        Show the health of this server's connection to the Housecall Pro API.
+
+        Returns:
+            JSON string with circuit breaker state per endpoint family
+            (closed, open or half_open), retry, rate limiter, response
+            cache and request coalescing counters
+        """
+        return to_json({
+            "circuits": housecallpro_circuit.get_states(),
+            "retries": housecallpro_retry.get_stats(),
+            "rate_limit": housecallpro_ratelimit.get_stats(),
+            "cache": housecallpro_cache.get_stats(),
+            "coalescing": housecallpro_client.get_coalescing_stats(),
+        })
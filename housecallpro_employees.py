@@ -8,21 +8,26 @@ including CRUD operations for employees.
 
 import os
 from typing import Optional, Dict, Any, List
-import json
 
 import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_output import to_json, select_fields
+from housecallpro_pagination import fetch_all_pages
+from housecallpro_replica import query_replica, unsupported_filters
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Employees")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -44,24 +49,14 @@ async def make_api_request(
     json_data: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """Make an API request to Housecall Pro."""
-    url = f"{API_BASE_URL}{endpoint}"
-    
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=get_headers(),
-                params=params,
-                json=json_data,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            return json.dumps({"error": f"HTTP error occurred: {str(e)}"}, indent=2)
-        except Exception as e:
-            return json.dumps({"error": f"An error occurred: {str(e)}"}, indent=2)
+    try:
+        return await api_request(
+            method, endpoint, get_headers(), params=params, json_data=json_data
+        )
+    except httpx.HTTPError as e:
+        return to_json({"error": f"HTTP error occurred: {str(e)}"})
+    except Exception as e:
+        return to_json({"error": f"An error occurred: {str(e)}"})
 
 # Employee Management Tools
 
@@ -76,7 +71,9 @@ async def get_employees(
     mobile_user: Optional[bool] = None,
     include_tags: Optional[bool] = None,
     sort_by: Optional[str] = None,
-    sort_direction: Optional[str] = None
+    sort_direction: Optional[str] = None,
+    use_replica: Optional[bool] = None,
+    fields: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Get a list of employees from Housecall Pro.
@@ -92,10 +89,31 @@ async def get_employees(
         include_tags: Include employee tags in response (true/false)
         sort_by: Field to sort by (e.g., 'first_name', 'last_name', 'email')
         sort_direction: Sort direction ('asc' or 'desc')
+        use_replica: Answer from the local replica instead of the API (see housecallpro_sync);
+                     only role and sorting are supported there
+        fields: Comma-separated fields to return for each employee, with dotted paths for
+                nested fields (e.g. "id,first_name,last_name,role"); default all
     
     Returns:
         List of employees with their details including names, roles, contact info, and status.
     """
+    if use_replica:
+        try:
+            unsupported_filters(
+                is_active=is_active, tag_ids=tag_ids, employee_type=employee_type, mobile_user=mobile_user
+            )
+            result = await query_replica(
+                "employees",
+                get_headers(),
+                equals={"role": role},
+                page=page,
+                page_size=page_size or 50,
+                sort_by=sort_by,
+                sort_direction=sort_direction,
+            )
+            return select_fields(result, fields, "employees")
+        except Exception as e:
+            return to_json({"error": f"Replica query failed: {str(e)}"})
     
     params = {}
     
@@ -120,12 +138,13 @@ async def get_employees(
     if sort_direction is not None:
         params["sort_direction"] = sort_direction
 
-    return await make_api_request("GET", "employees", params=params)
+    return select_fields(await make_api_request("GET", "employees", params=params), fields, "employees")
 
 @mcp.tool()
 async def get_employee_by_id(
     employee_id: str,
-    include_tags: Optional[bool] = None
+    include_tags: Optional[bool] = None,
+    fields: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Get a specific employee by their ID.
@@ -133,6 +152,8 @@ async def get_employee_by_id(
     Args:
         employee_id: The unique ID of the employee
         include_tags: Include employee tags in response (true/false)
+        fields: Comma-separated fields to return, with dotted paths for nested
+                fields (e.g. "id,first_name,last_name,role"); default all
     
     Returns:
         Employee details including personal info, role, contact details, and employment status.
@@ -142,7 +163,7 @@ async def get_employee_by_id(
     if include_tags is not None:
         params["include_tags"] = str(include_tags).lower()
     
-    return await make_api_request("GET", f"employees/{employee_id}", params=params)
+    return select_fields(await make_api_request("GET", f"employees/{employee_id}", params=params), fields)
 
 @mcp.tool()
 async def search_employees(
@@ -150,7 +171,8 @@ async def search_employees(
     page: Optional[int] = None,
     page_size: Optional[int] = None,
     is_active: Optional[bool] = None,
-    include_tags: Optional[bool] = None
+    include_tags: Optional[bool] = None,
+    fields: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Search employees by name, email, or phone number.
@@ -161,6 +183,8 @@ async def search_employees(
         page_size: Number of employees per page (max 100, default: 50)
         is_active: Filter by active status (true/false)
         include_tags: Include employee tags in response (true/false)
+        fields: Comma-separated fields to return for each employee, with dotted paths for
+                nested fields (e.g. "id,first_name,last_name,role"); default all
     
     Returns:
         List of employees matching the search criteria.
@@ -177,14 +201,15 @@ async def search_employees(
     if include_tags is not None:
         params["include_tags"] = str(include_tags).lower()
 
-    return await make_api_request("GET", "employees", params=params)
+    return select_fields(await make_api_request("GET", "employees", params=params), fields, "employees")
 
 @mcp.tool()
 async def get_employees_by_role(
     role: str,
     is_active: Optional[bool] = None,
     page: Optional[int] = None,
-    page_size: Optional[int] = None
+    page_size: Optional[int] = None,
+    fields: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Get employees filtered by their role.
@@ -194,6 +219,8 @@ async def get_employees_by_role(
         is_active: Filter by active status (true/false)
         page: Page number for pagination (default: 1)
         page_size: Number of employees per page (max 100, default: 50)
+        fields: Comma-separated fields to return for each employee, with dotted paths for
+                nested fields (e.g. "id,first_name,last_name,role"); default all
     
     Returns:
         List of employees with the specified role.
@@ -208,7 +235,7 @@ async def get_employees_by_role(
     if page_size is not None:
         params["page_size"] = min(page_size, 100)
 
-    return await make_api_request("GET", "employees", params=params)
+    return select_fields(await make_api_request("GET", "employees", params=params), fields, "employees")
 
 @mcp.tool()
 async def get_active_employees(
@@ -216,7 +243,8 @@ async def get_active_employees(
     page_size: Optional[int] = None,
     include_tags: Optional[bool] = None,
     sort_by: Optional[str] = None,
-    sort_direction: Optional[str] = None
+    sort_direction: Optional[str] = None,
+    fields: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Get only active employees.
@@ -227,6 +255,8 @@ async def get_active_employees(
         include_tags: Include employee tags in response (true/false)
         sort_by: Field to sort by (e.g., 'first_name', 'last_name', 'email')
         sort_direction: Sort direction ('asc' or 'desc')
+        fields: Comma-separated fields to return for each employee, with dotted paths for
+                nested fields (e.g. "id,first_name,last_name,role"); default all
     
     Returns:
         List of active employees.
@@ -245,13 +275,14 @@ async def get_active_employees(
     if sort_direction is not None:
         params["sort_direction"] = sort_direction
 
-    return await make_api_request("GET", "employees", params=params)
+    return select_fields(await make_api_request("GET", "employees", params=params), fields, "employees")
 
 @mcp.tool()
 async def get_mobile_employees(
     is_active: Optional[bool] = None,
     page: Optional[int] = None,
-    page_size: Optional[int] = None
+    page_size: Optional[int] = None,
+    fields: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Get employees who are mobile users.
@@ -260,6 +291,8 @@ async def get_mobile_employees(
         is_active: Filter by active status (true/false)
         page: Page number for pagination (default: 1)
         page_size: Number of employees per page (max 100, default: 50)
+        fields: Comma-separated fields to return for each employee, with dotted paths for
+                nested fields (e.g. "id,first_name,last_name,role"); default all
     
     Returns:
         List of employees who are mobile users.
@@ -274,7 +307,7 @@ async def get_mobile_employees(
     if page_size is not None:
         params["page_size"] = min(page_size, 100)
 
-    return await make_api_request("GET", "employees", params=params)
+    return select_fields(await make_api_request("GET", "employees", params=params), fields, "employees")
 
 @mcp.tool()
 async def summarize_employees() -> str:
@@ -286,8 +319,11 @@ async def summarize_employees() -> str:
     """
     
     try:
-        # Get all employees with minimal pagination
-        response = await make_api_request("GET", "employees", params={"page_size": 100})
+        # Get all employees, following pagination
+        response = await fetch_all_pages(
+            lambda page: make_api_request("GET", "employees", params={"page_size": 100, "page": page}),
+            "employees"
+        )
         
         if "error" in response:
             return f"Error fetching employees: {response.get('message', 'Unknown error')}"
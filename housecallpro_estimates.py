@@ -8,21 +8,26 @@ including CRUD operations for estimates.
 
 import os
 from typing import Optional, Dict, Any, List
-import json
 
 import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_export import EXPORT_PAGE_SIZE, export_path, export_pages
+from housecallpro_output import to_json, select_fields
+from housecallpro_replica import query_replica
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Estimates")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -37,33 +42,32 @@ def get_headers() -> Dict[str, str]:
     }
 
 
-def make_api_request(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+async def make_api_request(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    json_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """Make an API request to Housecall Pro."""
-    url = f"{API_BASE_URL}/{endpoint.lstrip('/')}"
-    
-    # Add headers
-    headers = get_headers()
-    if 'headers' in kwargs:
-        headers.update(kwargs.pop('headers'))
-    
     try:
-        with httpx.Client() as client:
-            response = client.request(method, url, headers=headers, **kwargs)
-            response.raise_for_status()
-            return response.json() if response.content else {}
+        return await api_request(
+            method, endpoint, get_headers(), params=params, json_data=json_data
+        )
     except httpx.HTTPStatusError as e:
-        return json.dumps({"error": f"HTTP {e.response.status_code}: {e.response.text}"}, indent=2)
+        return to_json({"error": f"HTTP {e.response.status_code}: {e.response.text}"})
     except Exception as e:
-        return json.dumps({"error": f"Request failed: {str(e)}"}, indent=2)
+        return to_json({"error": f"Request failed: {str(e)}"})
 
 
 @mcp.tool()
-def get_estimates(
+async def get_estimates(
     page: Optional[int] = 1,
     page_size: Optional[int] = 50,
     customer_id: Optional[str] = None,
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    use_replica: Optional[bool] = None,
+    fields: Optional[str] = None
 ) -> str:
     """
     Retrieve estimates from Housecall Pro.
@@ -74,10 +78,27 @@ def get_estimates(
         customer_id: Filter by customer ID
         start_date: Filter estimates created after this date (YYYY-MM-DD format)
         end_date: Filter estimates created before this date (YYYY-MM-DD format)
+        use_replica: Answer from the local replica instead of the API (see housecallpro_sync)
+        fields: Comma-separated fields to return for each estimate, with dotted paths for
+                nested fields (e.g. "id,status,total_amount,customer.last_name"); default all
     
     Returns:
         JSON string containing the estimates data
     """
+    if use_replica:
+        try:
+            result = await query_replica(
+                "estimates",
+                get_headers(),
+                equals={"customer.id": customer_id},
+                ranges={"created_at": (start_date, end_date)},
+                page=page,
+                page_size=page_size,
+            )
+        except Exception as e:
+            result = {"error": f"Replica query failed: {str(e)}"}
+        return to_json(select_fields(result, fields, "estimates"))
+    
     params = {
         "page": page,
         "page_size": min(page_size, 200)  # API max is 200
@@ -90,12 +111,12 @@ def get_estimates(
     if end_date:
         params["end_date"] = end_date
     
-    result = make_api_request("GET", "estimates", params=params)
-    return json.dumps(result, indent=2)
+    result = await make_api_request("GET", "estimates", params=params)
+    return to_json(select_fields(result, fields, "estimates"))
 
 
 @mcp.tool()
-def create_estimate(
+async def create_estimate(
     customer_id: str,
     employee_id: str,
     line_items: List[Dict[str, Any]],
@@ -126,12 +147,12 @@ def create_estimate(
     if work_status:
         data["work_status"] = work_status
     
-    result = make_api_request("POST", "estimates", json=data)
-    return json.dumps(result, indent=2)
+    result = await make_api_request("POST", "estimates", json_data=data)
+    return to_json(result)
 
 
 @mcp.tool()
-def update_estimate(
+async def update_estimate(
     estimate_id: str,
     notes: Optional[str] = None,
     work_status: Optional[str] = None,
@@ -158,12 +179,12 @@ def update_estimate(
     if line_items is not None:
         data["line_items"] = line_items
     
-    result = make_api_request("PUT", f"estimates/{estimate_id}", json=data)
-    return json.dumps(result, indent=2)
+    result = await make_api_request("PUT", f"estimates/{estimate_id}", json_data=data)
+    return to_json(result)
 
 
 @mcp.tool()
-def delete_estimate(estimate_id: str) -> str:
+async def delete_estimate(estimate_id: str) -> str:
     """
     Delete an estimate from Housecall Pro.
     
@@ -173,8 +194,66 @@ def delete_estimate(estimate_id: str) -> str:
     Returns:
         JSON string confirming deletion
     """
-    result = make_api_request("DELETE", f"estimates/{estimate_id}")
-    return json.dumps(result, indent=2)
+    result = await make_api_request("DELETE", f"estimates/{estimate_id}")
+    return to_json(result)
+
+
+@mcp.tool()
+async def export_estimates(
+    format: str = "ndjson",
+    path: Optional[str] = None,
+    customer_id: Optional[str] = None,
+    status: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    fields: Optional[str] = None,
+    partition_by_month: Optional[bool] = None
+) -> str:
+    """
+    Export every matching estimate to a local NDJSON, CSV, Parquet or Arrow file.
+    
+    Pages are streamed to disk as they arrive, so memory use stays flat for
+    any number of estimates. Only a summary is returned, not the estimates themselves.
+    
+    Args:
+        format: ndjson (one JSON estimate per line), csv (nested fields as dotted columns),
+                or parquet / arrow (typed columns for pandas or DuckDB; needs the analytics extra)
+        path: Output file; relative paths and the default name go in HOUSECALL_PRO_EXPORT_DIR
+        customer_id: Filter by customer ID
+        status: Filter by estimate status (pending, won, lost)
+        start_date: Export estimates created after this date (YYYY-MM-DD format)
+        end_date: Export estimates created before this date (YYYY-MM-DD format)
+        fields: Comma-separated fields to export for each estimate, with dotted paths for
+                nested fields (e.g. "id,status,total_amount,customer.last_name"); default all.
+                For parquet and arrow, the column names to export (e.g. "id,status,total_amount")
+        partition_by_month: Write a directory with one file per month (parquet and arrow only)
+    
+    Returns:
+        JSON string with the file path, row count, size in bytes and SHA-256 checksum
+    """
+    params = {"page_size": EXPORT_PAGE_SIZE}
+    
+    if customer_id:
+        params["customer_id"] = customer_id
+    if status:
+        params["status"] = status
+    if start_date:
+        params["start_date"] = start_date
+    if end_date:
+        params["end_date"] = end_date
+    
+    try:
+        result = await export_pages(
+            lambda p: make_api_request("GET", "estimates", params={**params, "page": p}),
+            "estimates",
+            export_path("estimates", format, path),
+            format,
+            fields,
+            bool(partition_by_month),
+        )
+    except Exception as e:
+        result = {"error": f"Export failed: {str(e)}"}
+    return to_json(result)
 
 
 if __name__ == "__main__":
@@ -9,19 +9,21 @@ including retrieving a list of events and fetching a specific event by its ID.
 import os
 from typing import Optional, Dict, Any, List
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Events")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -61,7 +63,6 @@ async def get_events(
     Returns:
         A dictionary containing a list of events and pagination information.
     """
-    headers = get_headers()
     params = {}
     if page is not None:
         params["page"] = page
@@ -76,12 +77,7 @@ async def get_events(
     if resource_names:
         params["resource_name"] = ",".join(resource_names)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{API_BASE_URL}/events", headers=headers, params=params
-        )
-        response.raise_for_status()
-        return response.json()
+    return await api_request("GET", "/events", get_headers(), params=params)
 
 
 @mcp.tool()
@@ -95,13 +91,7 @@ async def get_event_by_id(event_id: str) -> Dict[str, Any]:
     Returns:
         A dictionary containing the event details.
     """
-    headers = get_headers()
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{API_BASE_URL}/events/{event_id}", headers=headers
-        )
-        response.raise_for_status()
-        return response.json()
+    return await api_request("GET", f"/events/{event_id}", get_headers())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Streaming Export
+
+This module writes every record of a list endpoint to a local NDJSON or
+CSV file without holding the result set in memory. Pages flow through a
+pipeline of async generators: iter_pages fetches them (prefetching the
+next page), each page is projected with the tool's `fields`, its records
+are encoded one line at a time, and each line is written to disk and fed
+to a SHA-256 digest. Memory use depends on the page size, not on how many
+records are exported.
+
+The export is written to a `.part` file next to `path` and renamed into place once the last
+page has been written, so an interrupted export never leaves a file that
+looks complete.
+
+CSV columns are the dotted paths of the nested fields in the first page's
+records (e.g. customer.first_name). List values are written as JSON text.
+Columns that only appear after the first page are not written; their names
+are reported as dropped_columns. Pass `fields` to fix the columns.
+
+Jobs, invoices and estimates can also be exported as Parquet or Arrow IPC
+files with typed columns (COLUMNAR_SCHEMAS): amounts as int64 cents,
+statuses as dictionary-encoded strings and timestamps as UTC timestamps.
+pandas, DuckDB and Polars then read them without re-parsing JSON. Rows are
+written in batches of COLUMNAR_BATCH_ROWS, and with partition_by_month the
+export becomes a directory of hive-style month=YYYY-MM partitions. The
+columnar formats need the optional pyarrow package (the `analytics` extra).
+
+Exports are configured through environment variables:
+    HOUSECALL_PRO_EXPORT_DIR: Directory for exports given without an absolute
+        path (default ~/.housecallpro-mcp/exports)
+"""
+
+import csv
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, AsyncIterator, Tuple
+
+from dotenv import load_dotenv
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+    pq = None
+
+from housecallpro_output import to_json, select_fields
+from housecallpro_pagination import FetchPage, iter_pages
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+EXPORT_DIR = os.path.expanduser(os.getenv("HOUSECALL_PRO_EXPORT_DIR") or "~/.housecallpro-mcp/exports")
+
+EXPORT_FORMATS = ("ndjson", "csv", "parquet", "arrow")
+COLUMNAR_FORMATS = ("parquet", "arrow")
+EXPORT_PAGE_SIZE = 100
+EXPORT_MAX_PAGES = 10000
+
+# Rows buffered per file (and per month partition) before a batch is written;
+# each parquet batch becomes one row group
+COLUMNAR_BATCH_ROWS = 10000
+
+# Typed columns of the columnar exports: (column, type, source paths tried in
+# order). Types are string, status (dictionary-encoded), amount (int64 cents),
+# timestamp (UTC) and strings (list of strings). A source path through a list
+# collects the value from every element, e.g. assigned_employees.id.
+COLUMNAR_SCHEMAS = {
+    "jobs": [
+        ("id", "string", ("id",)),
+        ("invoice_number", "string", ("invoice_number",)),
+        ("customer_id", "string", ("customer.id",)),
+        ("work_status", "status", ("work_status",)),
+        ("total_amount", "amount", ("total_amount",)),
+        ("outstanding_balance", "amount", ("outstanding_balance",)),
+        ("scheduled_start", "timestamp", ("schedule.scheduled_start", "scheduled_start")),
+        ("scheduled_end", "timestamp", ("schedule.scheduled_end", "scheduled_end")),
+        ("completed_at", "timestamp", ("work_timestamps.completed_at", "completed_at")),
+        ("created_at", "timestamp", ("created_at",)),
+        ("updated_at", "timestamp", ("updated_at",)),
+        ("employee_ids", "strings", ("assigned_employees.id",)),
+        ("tags", "strings", ("tags",)),
+    ],
+    "invoices": [
+        ("id", "string", ("id",)),
+        ("invoice_number", "string", ("invoice_number",)),
+        ("job_id", "string", ("job_id",)),
+        ("customer_id", "string", ("customer.id",)),
+        ("status", "status", ("status",)),
+        ("amount", "amount", ("amount",)),
+        ("due_amount", "amount", ("due_amount",)),
+        ("invoice_date", "timestamp", ("invoice_date",)),
+        ("due_at", "timestamp", ("due_at", "due_date")),
+        ("paid_at", "timestamp", ("paid_at",)),
+        ("sent_at", "timestamp", ("sent_at",)),
+        ("created_at", "timestamp", ("created_at",)),
+        ("updated_at", "timestamp", ("updated_at",)),
+    ],
+    "estimates": [
+        ("id", "string", ("id",)),
+        ("estimate_number", "string", ("estimate_number",)),
+        ("customer_id", "string", ("customer.id",)),
+        ("status", "status", ("status",)),
+        ("work_status", "status", ("work_status",)),
+        ("total_amount", "amount", ("total_amount",)),
+        ("scheduled_start", "timestamp", ("schedule.scheduled_start", "scheduled_start")),
+        ("created_at", "timestamp", ("created_at",)),
+        ("updated_at", "timestamp", ("updated_at",)),
+    ],
+}
+
+# Columns whose month a record is partitioned by; the first non-empty one wins
+PARTITION_COLUMNS = {
+    "jobs": ("scheduled_start", "created_at"),
+    "invoices": ("invoice_date", "created_at"),
+    "estimates": ("created_at",),
+}
+UNKNOWN_MONTH = "unknown"
+
+
+def pyarrow_available() -> bool:
+    """Return True if the optional pyarrow package is installed."""
+    return pa is not None
+
+
+def export_path(name: str, fmt: str, path: Optional[str] = None) -> str:
+    """
+    Resolve where an export is written.
+
+    Args:
+        name: Resource name used for the default file name (e.g. "jobs")
+        fmt: Export format, used as the file extension
+        path: File path; relative paths are resolved against EXPORT_DIR.
+              Default `<name>_<timestamp>.<fmt>` in EXPORT_DIR.
+    """
+    if not path:
+        path = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.{fmt}"
+    return os.path.join(EXPORT_DIR, os.path.expanduser(path))
+
+
+def flatten(record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Flatten nested objects into dotted keys; lists are kept as values."""
+    row: Dict[str, Any] = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            row.update(flatten(value, f"{name}."))
+        else:
+            row[name] = value
+    return row
+
+
+def _cell(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return to_json(value, style="compact")
+    return value
+
+
+async def _records(
+    fetch_page: FetchPage,
+    items_key: str,
+    fields: Optional[str],
+    max_pages: int,
+    progress: Dict[str, Any],
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield the projected records of every page."""
+    async for data in iter_pages(fetch_page, items_key, max_pages=max_pages):
+        if "error" in data:
+            raise RuntimeError(data["error"])
+        progress["pages"] += 1
+        for record in select_fields(data, fields, items_key).get(items_key) or []:
+            progress["rows"] += 1
+            yield record
+
+
+async def _ndjson_lines(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for record in records:
+        yield to_json(record, style="compact") + "\n"
+
+
+async def _csv_lines(records: AsyncIterator[Dict[str, Any]], progress: Dict[str, Any]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer: Optional[csv.DictWriter] = None
+    columns: Dict[str, None] = {}
+    dropped: Dict[str, None] = {}
+
+    async for record in records:
+        row = flatten(record)
+        if writer is None:
+            columns = dict.fromkeys(row)
+            writer = csv.DictWriter(buffer, fieldnames=list(columns), extrasaction="ignore")
+            writer.writeheader()
+        for name in row:
+            if name not in columns:
+                dropped[name] = None
+        writer.writerow({name: _cell(value) for name, value in row.items()})
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    progress["columns"] = len(columns)
+    if dropped:
+        progress["dropped_columns"] = list(dropped)
+
+
+def _resolve(value: Any, parts: List[str]) -> Any:
+    """Follow a dotted path, collecting the values from every element of a list."""
+    for i, part in enumerate(parts):
+        if isinstance(value, list):
+            return [item for element in value if (item := _resolve(element, parts[i:])) is not None]
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _to_amount(value: Any) -> Optional[int]:
+    if value is None or value == "" or isinstance(value, bool):
+        return None
+    try:
+        return int(round(float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_timestamp(value: Any) -> Optional[datetime]:
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _to_strings(value: Any) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if not isinstance(value, list):
+        value = [value]
+    return [str(item) for item in value if item is not None]
+
+
+_CONVERTERS = {
+    "string": lambda value: None if value is None else str(value),
+    "status": lambda value: None if value is None else str(value),
+    "amount": _to_amount,
+    "timestamp": _to_timestamp,
+    "strings": _to_strings,
+}
+
+
+def _source(column: Tuple[str, str, Tuple[str, ...]]) -> Tuple[Any, List[List[str]]]:
+    _, kind, paths = column
+    return _CONVERTERS[kind], [path.split(".") for path in paths]
+
+
+def _column_value(record: Dict[str, Any], source: Tuple[Any, List[List[str]]]) -> Any:
+    """Convert the first non-empty source path of a record to the column's type."""
+    converter, paths = source
+    for parts in paths:
+        value = record.get(parts[0]) if len(parts) == 1 else _resolve(record, parts)
+        if value is not None and value != []:
+            return converter(value)
+    return None
+
+
+def columnar_columns(items_key: str, fields: Optional[str] = None) -> List[Tuple[str, str, Tuple[str, ...]]]:
+    """
+    Return the typed columns written for a resource.
+
+    Args:
+        items_key: Resource with a columnar schema (jobs, invoices or estimates)
+        fields: Comma-separated column names to keep; default all
+
+    Raises:
+        ValueError: If the resource has no columnar schema or a field is not a column
+    """
+    if items_key not in COLUMNAR_SCHEMAS:
+        raise ValueError(f"Columnar export is not available for {items_key}")
+    columns = COLUMNAR_SCHEMAS[items_key]
+    if not fields or not fields.strip():
+        return columns
+
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    by_name = {column[0]: column for column in columns}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise ValueError(
+            f"Unknown {items_key} columns: {', '.join(unknown)}; "
+            f"available: {', '.join(by_name)}"
+        )
+    return [by_name[name] for name in dict.fromkeys(names)]
+
+
+def _arrow_type(kind: str) -> Any:
+    return {
+        "string": pa.string(),
+        "status": pa.dictionary(pa.int32(), pa.string()),
+        "amount": pa.int64(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+        "strings": pa.list_(pa.string()),
+    }[kind]
+
+
+class _ColumnarFile:
+    """
+    One Parquet or Arrow IPC file, written in batches of COLUMNAR_BATCH_ROWS.
+
+    Status columns keep one dictionary per file that only ever grows, so
+    every batch's dictionary extends the previous one. Arrow IPC files
+    accept that as dictionary deltas; a replaced dictionary is an error.
+    """
+
+    def __init__(self, path: str, fmt: str, columns: List[Tuple[str, str, Tuple[str, ...]]]):
+        self.path = path
+        self.columns = columns
+        self.schema = pa.schema([(name, _arrow_type(kind)) for name, kind, _ in columns])
+        self.values: List[List[Any]] = [[] for _ in columns]
+        self.dictionaries: Dict[str, Dict[str, int]] = {name: {} for name, kind, _ in columns if kind == "status"}
+        self.rows = 0
+        if fmt == "parquet":
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self.writer = pa.ipc.new_file(path, self.schema, options=options)
+
+    def append(self, row: List[Any]) -> None:
+        for values, value in zip(self.values, row):
+            values.append(value)
+        self.rows += 1
+        if len(self.values[0]) >= COLUMNAR_BATCH_ROWS:
+            self.flush()
+
+    def _array(self, name: str, kind: str, values: List[Any]) -> Any:
+        if kind != "status":
+            return pa.array(values, type=_arrow_type(kind))
+        dictionary = self.dictionaries[name]
+        indices = [None if value is None else dictionary.setdefault(value, len(dictionary)) for value in values]
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=pa.int32()), pa.array(list(dictionary), type=pa.string())
+        )
+
+    def flush(self) -> None:
+        if not self.values[0]:
+            return
+        arrays = [
+            self._array(name, kind, values)
+            for (name, kind, _), values in zip(self.columns, self.values)
+        ]
+        self.writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+        self.values = [[] for _ in self.columns]
+
+    def close(self) -> None:
+        self.flush()
+        self.writer.close()
+
+
+def _file_digest(path: str) -> Tuple[int, str]:
+    """Return a file's size and SHA-256 checksum, reading it in chunks."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+async def _export_columnar(
+    fetch_page: FetchPage,
+    items_key: str,
+    path: str,
+    fmt: str,
+    fields: Optional[str],
+    partition_by_month: bool,
+    max_pages: int,
+) -> Dict[str, Any]:
+    """Write a Parquet or Arrow IPC export; see export_pages."""
+    if pa is None:
+        raise ValueError(
+            f"{fmt} export requires the optional pyarrow package "
+            "(install the analytics extra: uv sync --extra analytics)"
+        )
+    columns = columnar_columns(items_key, fields)
+    sources = [_source(column) for column in columns]
+    by_name = {column[0]: column for column in COLUMNAR_SCHEMAS[items_key]}
+    partition_sources = [_source(by_name[name]) for name in PARTITION_COLUMNS[items_key]]
+
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    if partition_by_month and os.path.isdir(path) and os.listdir(path):
+        raise FileExistsError(f"Export directory {path} already exists and is not empty")
+    staging = tempfile.mkdtemp(dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".part")
+
+    def month_of(record: Dict[str, Any]) -> str:
+        for source in partition_sources:
+            stamp = _column_value(record, source)
+            if stamp is not None:
+                return stamp.strftime("%Y-%m")
+        return UNKNOWN_MONTH
+
+    files: Dict[str, _ColumnarFile] = {}
+    progress: Dict[str, Any] = {"rows": 0, "pages": 0}
+    try:
+        async for record in _records(fetch_page, items_key, None, max_pages, progress):
+            key = month_of(record) if partition_by_month else ""
+            out = files.get(key)
+            if out is None:
+                name = f"month={key}/part-0.{fmt}" if partition_by_month else os.path.basename(path)
+                os.makedirs(os.path.dirname(os.path.join(staging, name)), exist_ok=True)
+                out = files[key] = _ColumnarFile(os.path.join(staging, name), fmt, columns)
+            out.append([_column_value(record, source) for source in sources])
+
+        if not partition_by_month and not files:
+            # An empty export is still a readable file with the schema
+            files[""] = _ColumnarFile(os.path.join(staging, os.path.basename(path)), fmt, columns)
+        for out in files.values():
+            out.close()
+
+        result: Dict[str, Any] = {"path": path, "format": fmt}
+        if partition_by_month:
+            partitions = []
+            for key in sorted(files):
+                size, checksum = _file_digest(files[key].path)
+                partitions.append({
+                    "month": key,
+                    "path": os.path.join(path, os.path.relpath(files[key].path, staging)),
+                    "rows": files[key].rows,
+                    "bytes": size,
+                    "sha256": checksum,
+                })
+            if os.path.isdir(path):
+                os.rmdir(path)
+            os.replace(staging, path)
+            result.update({
+                "rows": progress["rows"],
+                "bytes": sum(p["bytes"] for p in partitions),
+                "partitions": partitions,
+            })
+        else:
+            size, checksum = _file_digest(files[""].path)
+            os.replace(files[""].path, path)
+            os.rmdir(staging)
+            result.update({"rows": progress["rows"], "bytes": size, "sha256": checksum})
+    except BaseException:
+        for out in files.values():
+            try:
+                out.writer.close()
+            except Exception:
+                pass
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    result["pages"] = progress["pages"]
+    result["columns"] = [name for name, _, _ in columns]
+    return result
+
+
+async def export_pages(
+    fetch_page: FetchPage,
+    items_key: str,
+    path: str,
+    fmt: str = "ndjson",
+    fields: Optional[str] = None,
+    partition_by_month: bool = False,
+    max_pages: int = EXPORT_MAX_PAGES,
+) -> Dict[str, Any]:
+    """
+    Stream every page of a list endpoint to a file.
+
+    Args:
+        fetch_page: Coroutine function returning the response for a page number
+        items_key: Response key holding the page's records (e.g. "jobs")
+        path: Output file, or the output directory for partitioned exports;
+              parent directories are created
+        fmt: ndjson, csv, parquet or arrow
+        fields: Comma-separated fields to keep for each record (see select_fields);
+                for parquet and arrow, the column names to keep (see COLUMNAR_SCHEMAS)
+        partition_by_month: Write one file per month under month=YYYY-MM/
+                            directories (parquet and arrow only)
+        max_pages: Maximum number of pages to read
+
+    Returns:
+        The path, format, row count, byte size, SHA-256 checksum and number of
+        pages read. CSV and columnar exports also report their columns, and
+        partitioned exports report the rows, size and checksum per partition.
+
+    Raises:
+        ValueError: If the format is not supported for the resource
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format {fmt!r}; use one of: {', '.join(EXPORT_FORMATS)}")
+    if fmt in COLUMNAR_FORMATS:
+        return await _export_columnar(fetch_page, items_key, path, fmt, fields, partition_by_month, max_pages)
+    if partition_by_month:
+        raise ValueError("partition_by_month requires the parquet or arrow format")
+
+    progress: Dict[str, Any] = {"rows": 0, "pages": 0}
+    records = _records(fetch_page, items_key, fields, max_pages, progress)
+    lines = _ndjson_lines(records) if fmt == "ndjson" else _csv_lines(records, progress)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, partial = tempfile.mkstemp(dir=directory, prefix=f"{os.path.basename(path)}.", suffix=".part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            async for line in lines:
+                data = line.encode("utf-8")
+                fh.write(data)
+                digest.update(data)
+                size += len(data)
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+    result: Dict[str, Any] = {
+        "path": os.path.abspath(path),
+        "format": fmt,
+        "rows": progress.pop("rows"),
+        "bytes": size,
+        "sha256": digest.hexdigest(),
+        "pages": progress.pop("pages"),
+    }
+    result.update(progress)
+    return result
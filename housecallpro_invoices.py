@@ -6,27 +6,39 @@ This server provides invoice management functionality for Housecall Pro,
 including CRUD operations for invoices.
 """
 
-import json
+import asyncio
 import os
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request, download_file, upload_file
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_export import EXPORT_PAGE_SIZE, export_path, export_pages
+from housecallpro_output import to_json, select_fields
+from housecallpro_pagination import fetch_all_pages_parallel, iter_items
+from housecallpro_replica import query_replica, unsupported_filters
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Invoices")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
 
+# Parallel downloads for save_invoice_pdfs
+DOWNLOAD_CONCURRENCY = int(os.getenv("HOUSECALL_PRO_DOWNLOAD_CONCURRENCY", "4"))
+
+# Keys under which /invoices/{id}/download returns the PDF link
+PDF_URL_KEYS = ("url", "download_url", "pdf_url", "link")
+
 
 def get_headers() -> Dict[str, str]:
     """Get headers for API requests."""
@@ -37,15 +49,16 @@ def get_headers() -> Dict[str, str]:
     }
 
 
-def make_api_request(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+async def make_api_request(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    json_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """Make an API request to Housecall Pro."""
-    url = f"{API_BASE_URL}{endpoint}"
-    headers = get_headers()
-    
-    with httpx.Client() as client:
-        response = client.request(method, url, headers=headers, **kwargs)
-        response.raise_for_status()
-        return response.json()
+    return await api_request(
+        method, endpoint, get_headers(), params=params, json_data=json_data
+    )
 
 
 # Invoice Management Tools
@@ -54,7 +67,8 @@ def make_api_request(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
 async def get_job_invoices(
     job_id: str,
     include_line_items: Optional[bool] = None,
-    include_attachments: Optional[bool] = None
+    include_attachments: Optional[bool] = None,
+    fields: Optional[str] = None
 ) -> str:
     """
     Retrieve all invoices for a specific job.
@@ -63,6 +77,8 @@ async def get_job_invoices(
         job_id: The ID of the job to get invoices for
         include_line_items: Include line items in the response
         include_attachments: Include attachments in the response
+        fields: Comma-separated fields to return for each invoice, with dotted paths for
+                nested fields (e.g. "id,invoice_number,amount,due_at"); default all
     """
     params = {}
     
@@ -72,8 +88,8 @@ async def get_job_invoices(
         params["include_attachments"] = str(include_attachments).lower()
     
     try:
-        result = make_api_request("GET", f"/jobs/{job_id}/invoices", params=params)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("GET", f"/jobs/{job_id}/invoices", params=params)
+        return to_json(select_fields(result, fields, "invoices"))
     except Exception as e:
         return f"Error getting job invoices: {str(e)}"
 
@@ -95,7 +111,10 @@ async def get_invoices(
     sort_by: Optional[str] = None,
     sort_direction: Optional[str] = None,
     include_line_items: Optional[bool] = None,
-    include_attachments: Optional[bool] = None
+    include_attachments: Optional[bool] = None,
+    all_pages: Optional[bool] = None,
+    use_replica: Optional[bool] = None,
+    fields: Optional[str] = None
 ) -> str:
     """
     Retrieve a list of invoices with optional filtering.
@@ -117,6 +136,11 @@ async def get_invoices(
         sort_direction: Sort direction (asc or desc)
         include_line_items: Include line items in response
         include_attachments: Include attachments in response
+        all_pages: Follow pagination and return every matching invoice, starting at `page`
+        use_replica: Answer from the local replica instead of the API (see housecallpro_sync);
+                     sent and past_due are not supported there
+        fields: Comma-separated fields to return for each invoice, with dotted paths for
+                nested fields (e.g. "id,customer.first_name,amount,due_at"); default all
     """
     params = {}
     
@@ -154,8 +178,31 @@ async def get_invoices(
         params["include_attachments"] = str(include_attachments).lower()
     
     try:
-        result = make_api_request("GET", "/invoices", params=params)
-        return json.dumps(result, indent=2)
+        if use_replica:
+            unsupported_filters(sent=sent, past_due=past_due)
+            result = await query_replica(
+                "invoices",
+                get_headers(),
+                equals={"customer.id": customer_id, "status": status},
+                ranges={
+                    "due_at": (due_date_start, due_date_end),
+                    "created_at": (created_after, created_before),
+                    "updated_at": (updated_after, updated_before),
+                },
+                page=page,
+                page_size=None if all_pages else page_size or 25,
+                sort_by=sort_by,
+                sort_direction=sort_direction,
+            )
+        elif all_pages:
+            result = await fetch_all_pages_parallel(
+                lambda p: make_api_request("GET", "/invoices", params={**params, "page": p}),
+                "invoices",
+                start_page=page or 1,
+            )
+        else:
+            result = await make_api_request("GET", "/invoices", params=params)
+        return to_json(select_fields(result, fields, "invoices"))
     except Exception as e:
         return f"Error getting invoices: {str(e)}"
 
@@ -164,7 +211,8 @@ async def get_invoices(
 async def get_invoice_by_id(
     invoice_id: str,
     include_line_items: Optional[bool] = None,
-    include_attachments: Optional[bool] = None
+    include_attachments: Optional[bool] = None,
+    fields: Optional[str] = None
 ) -> str:
     """
     Get detailed information about a specific invoice.
@@ -173,6 +221,8 @@ async def get_invoice_by_id(
         invoice_id: The ID of the invoice to retrieve
         include_line_items: Include line items in the response
         include_attachments: Include attachments in the response
+        fields: Comma-separated fields to return, with dotted paths for nested
+                fields (e.g. "id,customer.first_name,amount,due_at"); default all
     """
     params = {}
     
@@ -182,8 +232,8 @@ async def get_invoice_by_id(
         params["include_attachments"] = str(include_attachments).lower()
     
     try:
-        result = make_api_request("GET", f"/invoices/{invoice_id}", params=params)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("GET", f"/invoices/{invoice_id}", params=params)
+        return to_json(select_fields(result, fields))
     except Exception as e:
         return f"Error getting invoice: {str(e)}"
 
@@ -234,8 +284,8 @@ async def create_invoice(
         invoice_data["include_line_items"] = include_line_items
     
     try:
-        result = make_api_request("POST", "/invoices", json_data=invoice_data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", "/invoices", json_data=invoice_data)
+        return to_json(result)
     except Exception as e:
         return f"Error creating invoice: {str(e)}"
 
@@ -278,8 +328,8 @@ async def update_invoice(
         update_data["payment_methods"] = payment_methods
     
     try:
-        result = make_api_request("PATCH", f"/invoices/{invoice_id}", json_data=update_data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("PATCH", f"/invoices/{invoice_id}", json_data=update_data)
+        return to_json(result)
     except Exception as e:
         return f"Error updating invoice: {str(e)}"
 
@@ -308,8 +358,8 @@ async def send_invoice(
         send_data["include_attachments"] = include_attachments
     
     try:
-        result = make_api_request("POST", f"/invoices/{invoice_id}/send", json_data=send_data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", f"/invoices/{invoice_id}/send", json_data=send_data)
+        return to_json(result)
     except Exception as e:
         return f"Error sending invoice: {str(e)}"
 
@@ -332,8 +382,8 @@ async def void_invoice(
         void_data["reason"] = reason
     
     try:
-        result = make_api_request("POST", f"/invoices/{invoice_id}/void", json_data=void_data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", f"/invoices/{invoice_id}/void", json_data=void_data)
+        return to_json(result)
     except Exception as e:
         return f"Error voiding invoice: {str(e)}"
 
@@ -371,8 +421,8 @@ async def mark_invoice_paid(
         payment_data["notes"] = notes
     
     try:
-        result = make_api_request("POST", f"/invoices/{invoice_id}/payments", json_data=payment_data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", f"/invoices/{invoice_id}/payments", json_data=payment_data)
+        return to_json(result)
     except Exception as e:
         return f"Error marking invoice as paid: {str(e)}"
 
@@ -386,8 +436,8 @@ async def get_invoice_payments(invoice_id: str) -> str:
         invoice_id: The ID of the invoice to get payments for
     """
     try:
-        result = make_api_request("GET", f"/invoices/{invoice_id}/payments")
-        return json.dumps(result, indent=2)
+        result = await make_api_request("GET", f"/invoices/{invoice_id}/payments")
+        return to_json(result)
     except Exception as e:
         return f"Error getting invoice payments: {str(e)}"
 
@@ -410,12 +460,173 @@ async def download_invoice_pdf(
         params["include_attachments"] = str(include_attachments).lower()
     
     try:
-        result = make_api_request("GET", f"/invoices/{invoice_id}/download", params=params)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("GET", f"/invoices/{invoice_id}/download", params=params)
+        return to_json(result)
     except Exception as e:
         return f"Error getting invoice download URL: {str(e)}"
 
 
+def _pdf_url(data: Any) -> Optional[str]:
+    """Find the PDF link in a /download response, searching nested objects."""
+    if not isinstance(data, dict):
+        return None
+    for key in PDF_URL_KEYS:
+        if isinstance(data.get(key), str) and data[key]:
+            return data[key]
+    for value in data.values():
+        url = _pdf_url(value)
+        if url:
+            return url
+    return None
+
+
+async def _save_pdf(invoice_id: str, path: str, include_attachments: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Stream one invoice PDF to `path`.
+
+    /invoices/{id}/download either returns the PDF itself or JSON holding a
+    link to it; a link is followed and streamed the same way.
+    """
+    params = {}
+    if include_attachments is not None:
+        params["include_attachments"] = str(include_attachments).lower()
+    
+    result = await download_file(f"/invoices/{invoice_id}/download", get_headers(), path, params=params)
+    if "json" in result:
+        url = _pdf_url(result["json"])
+        if not url:
+            raise ValueError(f"No download link in response: {to_json(result['json'])}")
+        result = await download_file(url, get_headers(), path)
+        if "json" in result:
+            raise ValueError("Download link returned JSON instead of a PDF")
+    return result
+
+
+@mcp.tool()
+async def save_invoice_pdf(
+    invoice_id: str,
+    path: Optional[str] = None,
+    include_attachments: Optional[bool] = None
+) -> str:
+    """
+    Download an invoice PDF to a local file.
+    
+    The PDF is streamed to disk in fixed-size chunks as it arrives. Only the
+    file location, size and checksum are returned.
+    
+    Args:
+        invoice_id: The ID of the invoice to download
+        path: Output file; relative paths and the default name (invoice_<id>.pdf)
+              go in HOUSECALL_PRO_EXPORT_DIR
+        include_attachments: Whether to include job attachments in PDF
+    """
+    try:
+        result = await _save_pdf(
+            invoice_id, export_path("invoices", "pdf", path or f"invoice_{invoice_id}.pdf"), include_attachments
+        )
+        return to_json({"invoice_id": invoice_id, **result})
+    except Exception as e:
+        return f"Error saving invoice PDF: {str(e)}"
+
+
+@mcp.tool()
+async def save_invoice_pdfs(
+    invoice_ids: Optional[List[str]] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    status: Optional[str] = None,
+    directory: Optional[str] = None,
+    include_attachments: Optional[bool] = None,
+    concurrency: Optional[int] = None,
+    overwrite: Optional[bool] = None
+) -> str:
+    """
+    Download many invoice PDFs to a local directory concurrently.
+    
+    Pass invoice_ids, or a created date range (optionally with status) to
+    download every matching invoice. Each PDF is saved as <invoice_id>.pdf.
+    PDFs already in the directory are skipped, so after failures the same
+    call can be repeated to resume where it stopped.
+    
+    Args:
+        invoice_ids: IDs of the invoices to download
+        created_after: Download invoices created after this date (ISO 8601)
+        created_before: Download invoices created before this date (ISO 8601)
+        status: With a date range, only download invoices with this status
+        directory: Output directory; relative paths go in HOUSECALL_PRO_EXPORT_DIR
+                   (default invoice_pdfs)
+        include_attachments: Whether to include job attachments in each PDF
+        concurrency: Downloads in flight at once (default HOUSECALL_PRO_DOWNLOAD_CONCURRENCY, 4)
+        overwrite: Download again even if the PDF already exists
+    
+    Returns:
+        Counts of downloaded, skipped and failed PDFs, total bytes, and the
+        error for each failed invoice
+    """
+    if not invoice_ids and not (created_after or created_before):
+        return "Error saving invoice PDFs: pass invoice_ids or created_after/created_before"
+    
+    target = export_path("invoices", "pdf", directory or "invoice_pdfs")
+    workers = max(1, concurrency or DOWNLOAD_CONCURRENCY)
+    summary: Dict[str, Any] = {"directory": target, "downloaded": 0, "skipped": 0, "failed": 0, "bytes": 0}
+    errors: List[Dict[str, str]] = []
+    
+    async def pending_ids() -> AsyncIterator[str]:
+        if invoice_ids:
+            for invoice_id in dict.fromkeys(invoice_ids):
+                yield invoice_id
+            return
+        params = {"page_size": EXPORT_PAGE_SIZE}
+        if created_after:
+            params["created_after"] = created_after
+        if created_before:
+            params["created_before"] = created_before
+        if status:
+            params["status"] = status
+        async for invoice in iter_items(
+            lambda p: make_api_request("GET", "/invoices", params={**params, "page": p}), "invoices"
+        ):
+            yield invoice["id"]
+    
+    async def worker(queue: asyncio.Queue) -> None:
+        while True:
+            invoice_id = await queue.get()
+            if invoice_id is None:
+                return
+            path = os.path.join(target, f"{invoice_id}.pdf")
+            if not overwrite and os.path.exists(path):
+                summary["skipped"] += 1
+                continue
+            try:
+                result = await _save_pdf(invoice_id, path, include_attachments)
+            except Exception as e:
+                summary["failed"] += 1
+                errors.append({"invoice_id": invoice_id, "error": str(e)})
+            else:
+                summary["downloaded"] += 1
+                summary["bytes"] += result["bytes"]
+    
+    # A bounded queue keeps listing only slightly ahead of the downloads
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers)
+    tasks = [asyncio.ensure_future(worker(queue)) for _ in range(workers)]
+    try:
+        async for invoice_id in pending_ids():
+            await queue.put(invoice_id)
+    except Exception as e:
+        summary["error"] = f"Listing invoices failed: {str(e)}"
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    for _ in tasks:
+        await queue.put(None)
+    await asyncio.gather(*tasks)
+    
+    if errors:
+        summary["errors"] = errors
+    return to_json(summary)
+
+
 @mcp.tool()
 async def get_invoice_line_items(invoice_id: str) -> str:
     """
@@ -425,8 +636,8 @@ async def get_invoice_line_items(invoice_id: str) -> str:
         invoice_id: The ID of the invoice to get line items for
     """
     try:
-        result = make_api_request("GET", f"/invoices/{invoice_id}/line_items")
-        return json.dumps(result, indent=2)
+        result = await make_api_request("GET", f"/invoices/{invoice_id}/line_items")
+        return to_json(result)
     except Exception as e:
         return f"Error getting invoice line items: {str(e)}"
 
@@ -471,8 +682,8 @@ async def add_invoice_line_item(
         line_item_data["taxable"] = taxable
     
     try:
-        result = make_api_request("POST", f"/invoices/{invoice_id}/line_items", json_data=line_item_data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", f"/invoices/{invoice_id}/line_items", json_data=line_item_data)
+        return to_json(result)
     except Exception as e:
         return f"Error adding invoice line item: {str(e)}"
 
@@ -521,8 +732,8 @@ async def update_invoice_line_item(
         update_data["taxable"] = taxable
     
     try:
-        result = make_api_request("PATCH", f"/invoices/{invoice_id}/line_items/{line_item_id}", json_data=update_data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("PATCH", f"/invoices/{invoice_id}/line_items/{line_item_id}", json_data=update_data)
+        return to_json(result)
     except Exception as e:
         return f"Error updating invoice line item: {str(e)}"
 
@@ -540,8 +751,8 @@ async def delete_invoice_line_item(
         line_item_id: The ID of the line item to delete
     """
     try:
-        result = make_api_request("DELETE", f"/invoices/{invoice_id}/line_items/{line_item_id}")
-        return json.dumps(result, indent=2)
+        result = await make_api_request("DELETE", f"/invoices/{invoice_id}/line_items/{line_item_id}")
+        return to_json(result)
     except Exception as e:
         return f"Error deleting invoice line item: {str(e)}"
 
@@ -555,8 +766,8 @@ async def get_invoice_attachments(invoice_id: str) -> str:
         invoice_id: The ID of the invoice to get attachments for
     """
     try:
-        result = make_api_request("GET", f"/invoices/{invoice_id}/attachments")
-        return json.dumps(result, indent=2)
+        result = await make_api_request("GET", f"/invoices/{invoice_id}/attachments")
+        return to_json(result)
     except Exception as e:
         return f"Error getting invoice attachments: {str(e)}"
 
@@ -564,31 +775,129 @@ async def get_invoice_attachments(invoice_id: str) -> str:
 @mcp.tool()
 async def add_invoice_attachment(
     invoice_id: str,
-    name: str,
-    file_data: str,
-    content_type: str = "application/octet-stream"
+    name: Optional[str] = None,
+    file_data: Optional[str] = None,
+    content_type: Optional[str] = None,
+    file_path: Optional[str] = None
 ) -> str:
     """
     Add an attachment to an invoice.
     
+    Pass either file_path or file_data. A file_path is streamed from disk as a
+    multipart upload, so large files never pass through the tool arguments.
+    
     Args:
         invoice_id: The ID of the invoice to add attachment to
-        name: Name of the attachment
-        file_data: Base64 encoded file data
-        content_type: MIME type of the file
+        name: Name of the attachment (default the file name of file_path)
+        file_data: Base64 encoded file data, for small files
+        content_type: MIME type of the file (default application/octet-stream for
+                      file_data, guessed from the name for file_path)
+        file_path: Path of a local file to upload
     """
-    attachment_data = {
-        "name": name,
-        "file_data": file_data,
-        "content_type": content_type
-    }
+    if (file_path is None) == (file_data is None):
+        return "Error adding invoice attachment: pass exactly one of file_path or file_data"
     
     try:
-        result = make_api_request("POST", f"/invoices/{invoice_id}/attachments", json_data=attachment_data)
-        return json.dumps(result, indent=2)
+        if file_path is not None:
+            result = await upload_file(
+                f"/invoices/{invoice_id}/attachments",
+                get_headers(),
+                file_path,
+                filename=name,
+                content_type=content_type
+            )
+            return to_json(result)
+        if not name:
+            return "Error adding invoice attachment: name is required with file_data"
+        
+        attachment_data = {
+            "name": name,
+            "file_data": file_data,
+            "content_type": content_type or "application/octet-stream"
+        }
+        result = await make_api_request("POST", f"/invoices/{invoice_id}/attachments", json_data=attachment_data)
+        return to_json(result)
     except Exception as e:
         return f"Error adding invoice attachment: {str(e)}"
 
 
+@mcp.tool()
+async def export_invoices(
+    format: str = "ndjson",
+    path: Optional[str] = None,
+    customer_id: Optional[str] = None,
+    status: Optional[str] = None,
+    due_date_start: Optional[str] = None,
+    due_date_end: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    updated_after: Optional[str] = None,
+    updated_before: Optional[str] = None,
+    include_line_items: Optional[bool] = None,
+    fields: Optional[str] = None,
+    partition_by_month: Optional[bool] = None
+) -> str:
+    """
+    Export every matching invoice to a local NDJSON, CSV, Parquet or Arrow file.
+    
+    Pages are streamed to disk as they arrive, so memory use stays flat for
+    any number of invoices. Only a summary is returned, not the invoices themselves.
+    
+    Args:
+        format: ndjson (one JSON invoice per line), csv (nested fields as dotted columns),
+                or parquet / arrow (typed columns for pandas or DuckDB; needs the analytics extra)
+        path: Output file; relative paths and the default name go in HOUSECALL_PRO_EXPORT_DIR
+        customer_id: Filter by customer ID
+        status: Filter by invoice status (open, paid, voided, etc.)
+        due_date_start: Start date filter for due dates (YYYY-MM-DD format)
+        due_date_end: End date filter for due dates (YYYY-MM-DD format)
+        created_after: Export invoices created after this date (ISO 8601)
+        created_before: Export invoices created before this date (ISO 8601)
+        updated_after: Export invoices updated after this date (ISO 8601)
+        updated_before: Export invoices updated before this date (ISO 8601)
+        include_line_items: Include line items in each invoice
+        fields: Comma-separated fields to export for each invoice, with dotted paths for
+                nested fields (e.g. "id,customer.first_name,amount,due_at"); default all.
+                For parquet and arrow, the column names to export (e.g. "id,customer_id,amount")
+        partition_by_month: Write a directory with one file per month (parquet and arrow only)
+    
+    Returns:
+        The file path, row count, size in bytes and SHA-256 checksum
+    """
+    params = {"page_size": EXPORT_PAGE_SIZE}
+    
+    if customer_id:
+        params["customer_id"] = customer_id
+    if status:
+        params["status"] = status
+    if due_date_start:
+        params["due_date_start"] = due_date_start
+    if due_date_end:
+        params["due_date_end"] = due_date_end
+    if created_after:
+        params["created_after"] = created_after
+    if created_before:
+        params["created_before"] = created_before
+    if updated_after:
+        params["updated_after"] = updated_after
+    if updated_before:
+        params["updated_before"] = updated_before
+    if include_line_items is not None:
+        params["include_line_items"] = str(include_line_items).lower()
+    
+    try:
+        result = await export_pages(
+            lambda p: make_api_request("GET", "/invoices", params={**params, "page": p}),
+            "invoices",
+            export_path("invoices", format, path),
+            format,
+            fields,
+            bool(partition_by_month),
+        )
+        return to_json(result)
+    except Exception as e:
+        return f"Error exporting invoices: {str(e)}"
+
+
 if __name__ == "__main__":
     mcp.run() 
\ No newline at end of file
@@ -9,19 +9,22 @@ allowing for filtering and sorting of invoices.
 import os
 from typing import Optional, Dict, Any, List
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_pagination import fetch_all_pages
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Invoices Query")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -36,15 +39,16 @@ def get_headers() -> Dict[str, str]:
     }
 
 
-def make_api_request(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+async def make_api_request(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    json_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """Make an API request to Housecall Pro."""
-    url = f"{API_BASE_URL}{endpoint}"
-    headers = get_headers()
-    
-    with httpx.Client() as client:
-        response = client.request(method, url, headers=headers, **kwargs)
-        response.raise_for_status()
-        return response.json()
+    return await api_request(
+        method, endpoint, get_headers(), params=params, json_data=json_data
+    )
 
 
 @mcp.tool()
@@ -63,6 +67,7 @@ async def get_invoices(
     paid_date_end: Optional[str] = None,
     sort_by: Optional[str] = None,
     sort_dir: Optional[str] = None,
+    all_pages: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """
     Retrieves a list of invoices with extensive filtering and sorting options.
@@ -82,6 +87,7 @@ async def get_invoices(
         paid_date_end: End of paid date range (YYYY-MM-DD).
         sort_by: Field to sort by (invoice_date, due_date, etc.).
         sort_dir: Sort direction (asc, desc).
+        all_pages: Follow pagination and return every matching invoice, starting at `page`.
 
     Returns:
         A dictionary containing a list of invoices and pagination info.
@@ -107,7 +113,14 @@ async def get_invoices(
         if v is not None
     }
 
-    return make_api_request("GET", "/v1/invoices", params=params)
+    if all_pages:
+        return await fetch_all_pages(
+            lambda p: make_api_request("GET", "/v1/invoices", params={**params, "page": p}),
+            "invoices",
+            start_page=page or 1,
+        )
+
+    return await make_api_request("GET", "/v1/invoices", params=params)
 
 
 if __name__ == "__main__":
@@ -6,7 +6,6 @@ This server provides job invoice management functionality for Housecall Pro,
 including operations for job-related invoices.
 """
 
-import json
 import os
 from typing import Optional, Dict, Any, List
 
@@ -14,15 +13,19 @@ import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_output import to_json
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Job Invoices")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -37,15 +40,16 @@ def get_headers() -> Dict[str, str]:
     }
 
 
-def make_api_request(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+async def make_api_request(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    json_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """Make an API request to Housecall Pro."""
-    url = f"{API_BASE_URL}{endpoint}"
-    headers = get_headers()
-    
-    with httpx.Client() as client:
-        response = client.request(method, url, headers=headers, **kwargs)
-        response.raise_for_status()
-        return response.json()
+    return await api_request(
+        method, endpoint, get_headers(), params=params, json_data=json_data
+    )
 
 
 @mcp.tool()
@@ -85,7 +89,7 @@ async def get_job_invoices(
     
     try:
         result = await make_api_request("GET", f"/jobs/{job_id}/invoices", params=params)
-        return json.dumps(result, indent=2)
+        return to_json(result)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             return f"Error: Job with ID '{job_id}' not found"
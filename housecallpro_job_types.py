@@ -8,21 +8,24 @@ including CRUD operations for job types.
 
 import os
 from typing import Optional, Dict, Any, List
-import json
 
 import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_output import to_json
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Job Types")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -37,15 +40,16 @@ def get_headers() -> Dict[str, str]:
     }
 
 
-def make_api_request(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+async def make_api_request(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    json_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """Make an API request to Housecall Pro."""
-    url = f"{API_BASE_URL}{endpoint}"
-    headers = get_headers()
-    
-    with httpx.Client() as client:
-        response = client.request(method, url, headers=headers, **kwargs)
-        response.raise_for_status()
-        return response.json()
+    return await api_request(
+        method, endpoint, get_headers(), params=params, json_data=json_data
+    )
 
 
 @mcp.tool()
@@ -90,17 +94,17 @@ async def get_job_types(
         params["name"] = name
     
     try:
-        result = make_api_request("GET", "/job_types", params=params)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("GET", "/job_types", params=params)
+        return to_json(result)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 401:
-            return json.dumps({"error": "Unauthorized - check your API credentials"}, indent=2)
+            return to_json({"error": "Unauthorized - check your API credentials"})
         elif e.response.status_code == 403:
-            return json.dumps({"error": "Access denied - insufficient permissions"}, indent=2)
+            return to_json({"error": "Access denied - insufficient permissions"})
         else:
-            return json.dumps({"error": f"Error getting job types: {e.response.status_code} - {e.response.text}"}, indent=2)
+            return to_json({"error": f"Error getting job types: {e.response.status_code} - {e.response.text}"})
     except Exception as e:
-        return json.dumps({"error": f"Error getting job types: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error getting job types: {str(e)}"})
 
 
 @mcp.tool()
@@ -147,21 +151,21 @@ async def create_job_type(
         data["default_price"] = default_price
     
     try:
-        result = make_api_request("POST", "/job_types", json_data=data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", "/job_types", json_data=data)
+        return to_json(result)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 400:
-            return json.dumps({"error": f"Bad request - check your input data: {e.response.text}"}, indent=2)
+            return to_json({"error": f"Bad request - check your input data: {e.response.text}"})
         elif e.response.status_code == 401:
-            return json.dumps({"error": "Unauthorized - check your API credentials"}, indent=2)
+            return to_json({"error": "Unauthorized - check your API credentials"})
         elif e.response.status_code == 403:
-            return json.dumps({"error": "Access denied - insufficient permissions"}, indent=2)
+            return to_json({"error": "Access denied - insufficient permissions"})
         elif e.response.status_code == 409:
-            return json.dumps({"error": f"Job type with name '{name}' already exists"}, indent=2)
+            return to_json({"error": f"Job type with name '{name}' already exists"})
         else:
-            return json.dumps({"error": f"Error creating job type: {e.response.status_code} - {e.response.text}"}, indent=2)
+            return to_json({"error": f"Error creating job type: {e.response.status_code} - {e.response.text}"})
     except Exception as e:
-        return json.dumps({"error": f"Error creating job type: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error creating job type: {str(e)}"})
 
 
 @mcp.tool()
@@ -215,8 +219,8 @@ async def update_job_type(
         return "Error: No fields provided to update"
     
     try:
-        result = make_api_request("PUT", f"/job_types/{job_type_id}", json_data=data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("PUT", f"/job_types/{job_type_id}", json_data=data)
+        return to_json(result)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 400:
             return f"Error: Bad request - check your input data: {e.response.text}"
@@ -246,8 +250,8 @@ async def get_job_type_by_id(job_type_id: str) -> str:
         JSON string containing the job type details
     """
     try:
-        result = make_api_request("GET", f"/job_types/{job_type_id}")
-        return json.dumps(result, indent=2)
+        result = await make_api_request("GET", f"/job_types/{job_type_id}")
+        return to_json(result)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             return f"Error: Job type with ID '{job_type_id}' not found"
@@ -7,23 +7,38 @@ including job CRUD operations, line item management, scheduling, attachments,
 notes, tags, and more.
 """
 
-import json
 import os
-from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Awaitable, Callable
 
 import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_batch import run_batch, summarize
+from housecallpro_circuit import CircuitOpenError
+from housecallpro_client import api_request, upload_file
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_export import EXPORT_PAGE_SIZE, export_path, export_pages
+from housecallpro_output import to_json, select_fields
+from housecallpro_pagination import fetch_all_pages_parallel
+from housecallpro_replica import query_replica, unsupported_filters
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Jobs")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
+
+# Response keys that may hold a job's line items
+LINE_ITEM_KEYS = ("line_items", "data")
+
+# Page size used to list the jobs a bulk tool acts on
+BULK_PAGE_SIZE = 100
 
 
 def get_headers() -> Dict[str, str]:
@@ -39,22 +54,21 @@ def get_headers() -> Dict[str, str]:
 
 
 async def make_api_request(
-    method: str, endpoint: str, params: Optional[Dict] = None, json_data: Optional[Dict] = None
+    method: str,
+    endpoint: str,
+    params: Optional[Dict] = None,
+    json_data: Optional[Dict] = None,
+    files: Optional[Dict] = None,
 ) -> Dict[str, Any]:
     """Make an authenticated API request to Housecall Pro."""
-    headers = get_headers()
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.request(
-            method,
-            f"{API_BASE_URL}{endpoint}",
-            headers=headers,
-            params=params,
-            json=json_data,
-            timeout=30.0,
-        )
-        response.raise_for_status()
-        return response.json()
+    return await api_request(
+        method,
+        endpoint,
+        get_headers(),
+        params=params,
+        json_data=json_data,
+        files=files,
+    )
 
 
 # Job Management Tools
@@ -83,6 +97,9 @@ async def get_jobs(
     scheduled_start_max: Optional[str] = None,
     scheduled_end_min: Optional[str] = None,
     scheduled_end_max: Optional[str] = None,
+    all_pages: Optional[bool] = None,
+    use_replica: Optional[bool] = None,
+    fields: Optional[str] = None,
 ) -> str:
     """
     Retrieve a list of jobs with optional filtering.
@@ -110,6 +127,11 @@ async def get_jobs(
         scheduled_start_max: Maximum scheduled start time (ISO 8601)
         scheduled_end_min: Minimum scheduled end time (ISO 8601)
         scheduled_end_max: Maximum scheduled end time (ISO 8601)
+        all_pages: Follow pagination and return every matching job, starting at `page`
+        use_replica: Answer from the local replica instead of the API (see housecallpro_sync);
+                     status, date_start, date_end and tags are not supported there
+        fields: Comma-separated fields to return for each job, with dotted paths for
+                nested fields (e.g. "id,customer.first_name,total_amount,schedule.scheduled_start"); default all
     """
     params = {}
     
@@ -153,25 +175,55 @@ async def get_jobs(
         params["scheduled_end_max"] = scheduled_end_max
     
     try:
-        result = await make_api_request("GET", "/jobs", params=params)
-        return json.dumps(result, indent=2)
+        if use_replica:
+            unsupported_filters(status=status, date_start=date_start, date_end=date_end, tags=tags)
+            result = await query_replica(
+                "jobs",
+                get_headers(),
+                equals={
+                    "customer.id": customer_id,
+                    "assigned_employees[*].id": employee_id,
+                    "work_status": work_status,
+                },
+                ranges={
+                    "created_at": (created_after, created_before),
+                    "updated_at": (updated_after, updated_before),
+                    "schedule.scheduled_start": (scheduled_start_min, scheduled_start_max),
+                    "schedule.scheduled_end": (scheduled_end_min, scheduled_end_max),
+                },
+                page=page,
+                page_size=None if all_pages else page_size or 25,
+                sort_by=sort_by,
+                sort_direction=sort_direction,
+            )
+        elif all_pages:
+            result = await fetch_all_pages_parallel(
+                lambda p: make_api_request("GET", "/jobs", params={**params, "page": p}),
+                "jobs",
+                start_page=page or 1,
+            )
+        else:
+            result = await make_api_request("GET", "/jobs", params=params)
+        return to_json(select_fields(result, fields, "jobs"))
     except Exception as e:
-        return json.dumps({"error": f"Error getting jobs: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error getting jobs: {str(e)}"})
 
 
 @mcp.tool()
-async def get_job_by_id(job_id: str) -> str:
+async def get_job_by_id(job_id: str, fields: Optional[str] = None) -> str:
     """
     Get detailed information about a specific job.
     
     Args:
         job_id: The ID of the job to retrieve
+        fields: Comma-separated fields to return, with dotted paths for nested
+                fields (e.g. "id,customer.first_name,total_amount"); default all
     """
     try:
         result = await make_api_request("GET", f"/jobs/{job_id}")
-        return json.dumps(result, indent=2)
+        return to_json(select_fields(result, fields))
     except Exception as e:
-        return json.dumps({"error": f"Error getting job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error getting job {job_id}: {str(e)}"})
 
 
 @mcp.tool()
@@ -222,9 +274,9 @@ async def create_job(
     
     try:
         result = await make_api_request("POST", "/jobs", json_data=data)
-        return json.dumps(result, indent=2)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error creating job: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error creating job: {str(e)}"})
 
 
 # Job Attachments
@@ -232,31 +284,50 @@ async def create_job(
 @mcp.tool()
 async def add_job_attachment(
     job_id: str,
-    name: str,
-    file_data: str,
-    content_type: str = "application/octet-stream",
+    name: Optional[str] = None,
+    file_data: Optional[str] = None,
+    content_type: Optional[str] = None,
+    file_path: Optional[str] = None,
 ) -> str:
     """
     Add an attachment to a job.
     
+    Pass either file_path or file_data. A file_path is streamed from disk,
+    so large photos and documents never pass through the tool arguments.
+    
     Args:
         job_id: ID of the job
-        name: Name of the attachment
-        file_data: Base64 encoded file data
-        content_type: MIME type of the file
+        name: Name of the attachment (default the file name of file_path)
+        file_data: Base64 encoded file data, for small files
+        content_type: MIME type of the file (default guessed from the name)
+        file_path: Path of a local file to upload
     """
     try:
+        if (file_path is None) == (file_data is None):
+            raise ValueError("Pass exactly one of file_path or file_data")
+        if file_path is not None:
+            result = await upload_file(
+                f"/jobs/{job_id}/attachments",
+                get_headers(),
+                file_path,
+                filename=name,
+                content_type=content_type,
+            )
+            return to_json(result)
+        if not name:
+            raise ValueError("name is required with file_data")
+        
         import base64
         file_bytes = base64.b64decode(file_data)
         
         files = {
-            "attachment": (name, file_bytes, content_type)
+            "attachment": (name, file_bytes, content_type or "application/octet-stream")
         }
         
         result = await make_api_request("POST", f"/jobs/{job_id}/attachments", files=files)
-        return json.dumps(result, indent=2)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error adding attachment to job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error adding attachment to job {job_id}: {str(e)}"})
 
 
 # Job Line Items
@@ -271,9 +342,9 @@ async def get_job_line_items(job_id: str) -> str:
     """
     try:
         result = await make_api_request("GET", f"/jobs/{job_id}/line_items")
-        return json.dumps(result, indent=2)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error getting line items for job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error getting line items for job {job_id}: {str(e)}"})
 
 
 @mcp.tool()
@@ -312,10 +383,10 @@ async def add_job_line_item(
         data["sku"] = sku
     
     try:
-        result = await make_api_request("POST", f"/jobs/{job_id}/line_items", data=data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", f"/jobs/{job_id}/line_items", json_data=data)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error adding line item to job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error adding line item to job {job_id}: {str(e)}"})
 
 
 @mcp.tool()
@@ -335,10 +406,162 @@ async def bulk_update_job_line_items(
     }
     
     try:
-        result = await make_api_request("PUT", f"/jobs/{job_id}/line_items", data=data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("PUT", f"/jobs/{job_id}/line_items", json_data=data)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error bulk updating line items for job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error bulk updating line items for job {job_id}: {str(e)}"})
+
+
+def _line_item_list(response: Any) -> Optional[List[Dict[str, Any]]]:
+    """Return the line items of a line item response, or None if it is not a complete list."""
+    if isinstance(response, list):
+        return response
+    if not isinstance(response, dict) or int(response.get("total_pages") or 1) > 1:
+        return None
+    for key in LINE_ITEM_KEYS:
+        if isinstance(response.get(key), list):
+            return response[key]
+    return None
+
+
+def _not_applied(error: Exception) -> bool:
+    """True if a failed request certainly changed nothing on the server."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return 400 <= status < 500 and status != 408
+    # Failed before any of the request was sent
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, CircuitOpenError))
+
+
+async def _bulk_add_line_items(job_id: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Append line items to a job with one bulk PUT.
+
+    The bulk endpoint sets the job's whole line item list, so the current
+    items are read first and sent back unchanged ahead of the new ones.
+    This is a read-modify-write: line items someone else adds to the job
+    between the read and the write are lost.
+
+    Returns:
+        {"ids": [...]} with the new line item IDs where the response lists them,
+        or {"error": "..."} if nothing was changed (the read failed, or the PUT
+        was rejected with a 4xx or never sent), so the items can be posted instead
+
+    Raises:
+        Exception: If the PUT failed in a way that may still have been applied,
+                   such as a read timeout or a 5xx after retries
+    """
+    try:
+        existing = _line_item_list(await make_api_request("GET", f"/jobs/{job_id}/line_items"))
+    except Exception as e:
+        return {"error": str(e)}
+    if existing is None:
+        return {"error": "could not read the job's current line items"}
+    
+    try:
+        result = await make_api_request(
+            "PUT", f"/jobs/{job_id}/line_items", json_data={"line_items": existing + items}
+        )
+    except Exception as e:
+        if _not_applied(e):
+            return {"error": str(e)}
+        raise
+    saved = _line_item_list(result) or []
+    if len(saved) != len(existing) + len(items):
+        return {"ids": [None] * len(items)}
+    return {"ids": [item.get("id") if isinstance(item, dict) else None for item in saved[len(existing):]]}
+
+
+@mcp.tool()
+async def add_job_line_items(
+    line_items: List[Dict[str, Any]],
+    job_id: Optional[str] = None,
+    mode: str = "auto",
+    concurrency: Optional[int] = None,
+) -> str:
+    """
+    Add many line items to one or more jobs in one call.
+    
+    In auto mode, each job's items are appended with a single bulk PUT to
+    /jobs/{id}/line_items. The PUT replaces the whole list, so the job's current
+    items are read first and sent back with the new ones; line items someone
+    else adds between that read and the write are lost. If the PUT is rejected
+    (4xx) or never sent, the items are posted one by one instead, with up to
+    `concurrency` requests in flight. If it fails in a way that may still have
+    been applied (a timeout or a server error), the items are reported as
+    failed rather than posted again, so they are never added twice.
+    
+    Args:
+        line_items: Line items to add, each with name, quantity and price, and optionally
+                    unit, description and sku. Give an item a job_id to add it to another job.
+        job_id: Job for the items that do not name their own job_id
+        mode: auto (bulk per job, falling back to individual POSTs), bulk, or individual
+        concurrency: Requests in flight at once (default HOUSECALL_PRO_BATCH_CONCURRENCY, 5)
+    
+    Returns:
+        Succeeded and failed counts, and one result per item in input order with its
+        job_id, name, line item id where known, and error if it failed
+    """
+    if mode not in ("auto", "bulk", "individual"):
+        return to_json({"error": f"Unknown mode {mode!r}; use auto, bulk or individual"})
+    
+    results: List[Dict[str, Any]] = []
+    payloads: List[Dict[str, Any]] = []
+    by_job: Dict[str, List[int]] = {}
+    for index, item in enumerate(line_items):
+        item = dict(item)
+        payloads.append(item)
+        target = item.pop("job_id", None) or job_id
+        entry = {"index": index, "job_id": target, "name": item.get("name")}
+        missing = [key for key in ("name", "quantity", "price") if item.get(key) is None]
+        if not target:
+            entry.update(ok=False, error="no job_id")
+        elif missing:
+            entry.update(ok=False, error=f"missing {', '.join(missing)}")
+        else:
+            by_job.setdefault(target, []).append(index)
+        results.append(entry)
+    
+    if mode == "individual":
+        individual = [i for indexes in by_job.values() for i in indexes]
+    else:
+        individual = []
+        jobs = list(by_job)
+        outcomes = await run_batch(
+            jobs, lambda job: _bulk_add_line_items(job, [payloads[i] for i in by_job[job]]), concurrency
+        )
+        for job, outcome in zip(jobs, outcomes):
+            result = outcome.get("result") or {}
+            if "ids" in result:
+                for i, new_id in zip(by_job[job], result["ids"]):
+                    results[i].update(ok=True, method="bulk", id=new_id)
+                continue
+            if outcome["ok"] and mode == "auto":
+                individual.extend(by_job[job])
+                continue
+            if outcome["ok"]:
+                error = f"bulk update failed: {result['error']}"
+            else:
+                error = f"bulk update failed and may have been applied; check the job before retrying: {outcome['error']}"
+            for i in by_job[job]:
+                results[i].update(ok=False, error=error)
+    
+    outcomes = await run_batch(
+        individual,
+        lambda i: make_api_request("POST", f"/jobs/{results[i]['job_id']}/line_items", json_data=payloads[i]),
+        concurrency,
+    )
+    for i, outcome in zip(individual, outcomes):
+        if outcome["ok"]:
+            created = outcome["result"]
+            results[i].update(ok=True, method="post", id=created.get("id") if isinstance(created, dict) else None)
+        else:
+            results[i].update(ok=False, error=outcome["error"])
+    
+    for entry in results:
+        if entry.get("id") is None:
+            entry.pop("id", None)
+    return to_json({**summarize(results), "items": results})
 
 
 @mcp.tool()
@@ -381,10 +604,10 @@ async def update_job_line_item(
         data["sku"] = sku
     
     try:
-        result = await make_api_request("PUT", f"/jobs/{job_id}/line_items/{line_item_id}", data=data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("PUT", f"/jobs/{job_id}/line_items/{line_item_id}", json_data=data)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error updating line item {line_item_id} for job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error updating line item {line_item_id} for job {job_id}: {str(e)}"})
 
 
 @mcp.tool()
@@ -398,9 +621,9 @@ async def delete_job_line_item(job_id: str, line_item_id: str) -> str:
     """
     try:
         result = await make_api_request("DELETE", f"/jobs/{job_id}/line_items/{line_item_id}")
-        return json.dumps(result, indent=2)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error deleting line item {line_item_id} from job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error deleting line item {line_item_id} from job {job_id}: {str(e)}"})
 
 
 # Job Scheduling
@@ -430,10 +653,10 @@ async def update_job_schedule(
         data["employee_ids"] = employee_ids
     
     try:
-        result = await make_api_request("PUT", f"/jobs/{job_id}/schedule", data=data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("PUT", f"/jobs/{job_id}/schedule", json_data=data)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error updating schedule for job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error updating schedule for job {job_id}: {str(e)}"})
 
 
 @mcp.tool()
@@ -446,9 +669,9 @@ async def delete_job_schedule(job_id: str) -> str:
     """
     try:
         result = await make_api_request("DELETE", f"/jobs/{job_id}/schedule")
-        return json.dumps(result, indent=2)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error deleting schedule for job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error deleting schedule for job {job_id}: {str(e)}"})
 
 
 @mcp.tool()
@@ -468,10 +691,10 @@ async def dispatch_job_to_employees(
     }
     
     try:
-        result = await make_api_request("POST", f"/jobs/{job_id}/dispatch", data=data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", f"/jobs/{job_id}/dispatch", json_data=data)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error dispatching job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error dispatching job {job_id}: {str(e)}"})
 
 
 # Job Input Materials
@@ -486,9 +709,9 @@ async def get_job_input_materials(job_id: str) -> str:
     """
     try:
         result = await make_api_request("GET", f"/jobs/{job_id}/input_materials")
-        return json.dumps(result, indent=2)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error getting input materials for job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error getting input materials for job {job_id}: {str(e)}"})
 
 
 @mcp.tool()
@@ -508,10 +731,10 @@ async def bulk_update_job_input_materials(
     }
     
     try:
-        result = await make_api_request("PUT", f"/jobs/{job_id}/input_materials", data=data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("PUT", f"/jobs/{job_id}/input_materials", json_data=data)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error bulk updating input materials for job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error bulk updating input materials for job {job_id}: {str(e)}"})
 
 
 # Job Tags
@@ -530,10 +753,10 @@ async def add_job_tag(job_id: str, tag: str) -> str:
     }
     
     try:
-        result = await make_api_request("POST", f"/jobs/{job_id}/tags", data=data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", f"/jobs/{job_id}/tags", json_data=data)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error adding tag to job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error adding tag to job {job_id}: {str(e)}"})
 
 
 @mcp.tool()
@@ -547,9 +770,295 @@ async def remove_job_tag(job_id: str, tag: str) -> str:
     """
     try:
         result = await make_api_request("DELETE", f"/jobs/{job_id}/tags/{tag}")
-        return json.dumps(result, indent=2)
+        return to_json(result)
+    except Exception as e:
+        return to_json({"error": f"Error removing tag from job {job_id}: {str(e)}"})
+
+
+# Bulk Job Actions
+
+async def _target_jobs(job_ids: Optional[List[str]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Resolve the jobs a bulk tool acts on.
+    
+    Explicit job_ids are used as given. Otherwise every job matching the
+    filters is listed first. One or the other is required, so a bulk call
+    never acts on every job by accident.
+    
+    Raises:
+        ValueError: If neither job_ids nor a filter is given
+    """
+    if job_ids:
+        return [{"id": job_id} for job_id in dict.fromkeys(job_ids)]
+    params = {key: value for key, value in filters.items() if value}
+    if not params:
+        raise ValueError("Give job_ids or at least one job filter")
+    params["page_size"] = BULK_PAGE_SIZE
+    result = await fetch_all_pages_parallel(
+        lambda p: make_api_request("GET", "/jobs", params={**params, "page": p}),
+        "jobs",
+    )
+    return [job for job in result.get("jobs") or [] if isinstance(job, dict) and job.get("id")]
+
+
+async def _run_bulk(
+    action: str,
+    job_ids: Optional[List[str]],
+    filters: Dict[str, Any],
+    call: Callable[[Dict[str, Any]], Awaitable[Any]],
+    concurrency: Optional[int],
+    dry_run: Optional[bool],
+) -> str:
+    """Run `call(job)` for every target job and return a compact per-job summary."""
+    try:
+        jobs = await _target_jobs(job_ids, filters)
     except Exception as e:
-        return json.dumps({"error": f"Error removing tag from job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error selecting jobs to {action}: {str(e)}"})
+    
+    ids = [job["id"] for job in jobs]
+    if dry_run:
+        return to_json({"matched": len(ids), "job_ids": ids})
+    
+    outcomes = await run_batch(jobs, call, concurrency)
+    return to_json({
+        "matched": len(ids),
+        **summarize(outcomes),
+        "succeeded_ids": [job_id for job_id, outcome in zip(ids, outcomes) if outcome["ok"]],
+        # First line only: HTTP errors carry a long documentation link
+        "errors": {
+            job_id: (outcome["error"].splitlines() or [""])[0]
+            for job_id, outcome in zip(ids, outcomes) if not outcome["ok"]
+        },
+    })
+
+
+def _job_filters(
+    customer_id: Optional[str],
+    employee_id: Optional[str],
+    work_status: Optional[str],
+    tags: Optional[str],
+    scheduled_start_min: Optional[str],
+    scheduled_start_max: Optional[str],
+) -> Dict[str, Any]:
+    """Collect the GET /jobs filters shared by the bulk tools."""
+    return {
+        "customer_id": customer_id,
+        "employee_id": employee_id,
+        "work_status": work_status,
+        "tags": tags,
+        "scheduled_start_min": scheduled_start_min,
+        "scheduled_start_max": scheduled_start_max,
+    }
+
+
+@mcp.tool()
+async def bulk_add_job_tag(
+    tag: str,
+    job_ids: Optional[List[str]] = None,
+    customer_id: Optional[str] = None,
+    employee_id: Optional[str] = None,
+    work_status: Optional[str] = None,
+    tags: Optional[str] = None,
+    scheduled_start_min: Optional[str] = None,
+    scheduled_start_max: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    dry_run: Optional[bool] = None,
+) -> str:
+    """
+    Add a tag to many jobs, given as job IDs or as a job filter.
+    
+    Args:
+        tag: Tag to add to each job
+        job_ids: Jobs to tag; if omitted, every job matching the filters below
+        customer_id: Filter by customer ID
+        employee_id: Filter by assigned employee ID
+        work_status: Filter by work status
+        tags: Filter by tags (comma-separated)
+        scheduled_start_min: Minimum scheduled start time (ISO 8601), e.g. tomorrow's date
+        scheduled_start_max: Maximum scheduled start time (ISO 8601)
+        concurrency: Requests in flight at once (default HOUSECALL_PRO_BATCH_CONCURRENCY, 5)
+        dry_run: Only list the matching job IDs, without changing anything
+    
+    Returns:
+        Matched, succeeded and failed counts, the IDs that succeeded, and an error per failed job
+    """
+    return await _run_bulk(
+        "tag",
+        job_ids,
+        _job_filters(customer_id, employee_id, work_status, tags, scheduled_start_min, scheduled_start_max),
+        lambda job: make_api_request("POST", f"/jobs/{job['id']}/tags", json_data={"tag": tag}),
+        concurrency,
+        dry_run,
+    )
+
+
+@mcp.tool()
+async def bulk_remove_job_tag(
+    tag: str,
+    job_ids: Optional[List[str]] = None,
+    customer_id: Optional[str] = None,
+    employee_id: Optional[str] = None,
+    work_status: Optional[str] = None,
+    tags: Optional[str] = None,
+    scheduled_start_min: Optional[str] = None,
+    scheduled_start_max: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    dry_run: Optional[bool] = None,
+) -> str:
+    """
+    Remove a tag from many jobs, given as job IDs or as a job filter.
+    
+    Args:
+        tag: Tag to remove from each job
+        job_ids: Jobs to untag; if omitted, every job matching the filters below
+        customer_id: Filter by customer ID
+        employee_id: Filter by assigned employee ID
+        work_status: Filter by work status
+        tags: Filter by tags (comma-separated)
+        scheduled_start_min: Minimum scheduled start time (ISO 8601)
+        scheduled_start_max: Maximum scheduled start time (ISO 8601)
+        concurrency: Requests in flight at once (default HOUSECALL_PRO_BATCH_CONCURRENCY, 5)
+        dry_run: Only list the matching job IDs, without changing anything
+    
+    Returns:
+        Matched, succeeded and failed counts, the IDs that succeeded, and an error per failed job
+    """
+    return await _run_bulk(
+        "untag",
+        job_ids,
+        _job_filters(customer_id, employee_id, work_status, tags, scheduled_start_min, scheduled_start_max),
+        lambda job: make_api_request("DELETE", f"/jobs/{job['id']}/tags/{tag}"),
+        concurrency,
+        dry_run,
+    )
+
+
+@mcp.tool()
+async def bulk_dispatch_jobs(
+    employee_ids: List[str],
+    job_ids: Optional[List[str]] = None,
+    customer_id: Optional[str] = None,
+    employee_id: Optional[str] = None,
+    work_status: Optional[str] = None,
+    tags: Optional[str] = None,
+    scheduled_start_min: Optional[str] = None,
+    scheduled_start_max: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    dry_run: Optional[bool] = None,
+) -> str:
+    """
+    Dispatch many jobs to the same employees, e.g. to hand one technician's week to another.
+    
+    Args:
+        employee_ids: Employee IDs to dispatch each job to
+        job_ids: Jobs to dispatch; if omitted, every job matching the filters below
+        customer_id: Filter by customer ID
+        employee_id: Filter by currently assigned employee ID
+        work_status: Filter by work status
+        tags: Filter by tags (comma-separated)
+        scheduled_start_min: Minimum scheduled start time (ISO 8601)
+        scheduled_start_max: Maximum scheduled start time (ISO 8601)
+        concurrency: Requests in flight at once (default HOUSECALL_PRO_BATCH_CONCURRENCY, 5)
+        dry_run: Only list the matching job IDs, without changing anything
+    
+    Returns:
+        Matched, succeeded and failed counts, the IDs that succeeded, and an error per failed job
+    """
+    return await _run_bulk(
+        "dispatch",
+        job_ids,
+        _job_filters(customer_id, employee_id, work_status, tags, scheduled_start_min, scheduled_start_max),
+        lambda job: make_api_request("POST", f"/jobs/{job['id']}/dispatch", json_data={"employee_ids": employee_ids}),
+        concurrency,
+        dry_run,
+    )
+
+
+def _shift_time(value: Any, minutes: int) -> str:
+    """Move an ISO 8601 timestamp by `minutes`, keeping a trailing Z."""
+    if not isinstance(value, str) or not value:
+        raise ValueError("job has no scheduled time to shift")
+    shifted = datetime.fromisoformat(value.replace("Z", "+00:00")) + timedelta(minutes=minutes)
+    text = shifted.isoformat()
+    return text.replace("+00:00", "Z") if value.endswith("Z") else text
+
+
+async def _reschedule_job(
+    job: Dict[str, Any],
+    shift_minutes: Optional[int],
+    scheduled_start: Optional[str],
+    scheduled_end: Optional[str],
+    employee_ids: Optional[List[str]],
+) -> Any:
+    """Update one job's schedule, shifting its current window when shift_minutes is given."""
+    if shift_minutes:
+        if "schedule" not in job and "scheduled_start" not in job:
+            job = await make_api_request("GET", f"/jobs/{job['id']}")
+        # The API nests the window under "schedule"; accept it at the top level too
+        window = job.get("schedule") if isinstance(job.get("schedule"), dict) else job
+        scheduled_start = _shift_time(window.get("scheduled_start"), shift_minutes)
+        scheduled_end = _shift_time(window.get("scheduled_end"), shift_minutes)
+    
+    data: Dict[str, Any] = {
+        "scheduled_start": scheduled_start,
+        "scheduled_end": scheduled_end,
+    }
+    if employee_ids:
+        data["employee_ids"] = employee_ids
+    return await make_api_request("PUT", f"/jobs/{job['id']}/schedule", json_data=data)
+
+
+@mcp.tool()
+async def bulk_update_job_schedule(
+    shift_minutes: Optional[int] = None,
+    scheduled_start: Optional[str] = None,
+    scheduled_end: Optional[str] = None,
+    employee_ids: Optional[List[str]] = None,
+    job_ids: Optional[List[str]] = None,
+    customer_id: Optional[str] = None,
+    employee_id: Optional[str] = None,
+    work_status: Optional[str] = None,
+    tags: Optional[str] = None,
+    scheduled_start_min: Optional[str] = None,
+    scheduled_start_max: Optional[str] = None,
+    concurrency: Optional[int] = None,
+    dry_run: Optional[bool] = None,
+) -> str:
+    """
+    Reschedule many jobs, given as job IDs or as a job filter.
+    
+    Either shift each job's current window by shift_minutes (1440 moves it to the
+    same time the next day), or give one scheduled_start and scheduled_end for all of them.
+    
+    Args:
+        shift_minutes: Minutes to move each job's scheduled start and end (negative moves earlier)
+        scheduled_start: New scheduled start time for every job (ISO 8601)
+        scheduled_end: New scheduled end time for every job (ISO 8601)
+        employee_ids: Employee IDs to assign to each job
+        job_ids: Jobs to reschedule; if omitted, every job matching the filters below
+        customer_id: Filter by customer ID
+        employee_id: Filter by assigned employee ID
+        work_status: Filter by work status
+        tags: Filter by tags (comma-separated)
+        scheduled_start_min: Minimum scheduled start time (ISO 8601)
+        scheduled_start_max: Maximum scheduled start time (ISO 8601)
+        concurrency: Requests in flight at once (default HOUSECALL_PRO_BATCH_CONCURRENCY, 5)
+        dry_run: Only list the matching job IDs, without changing anything
+    
+    Returns:
+        Matched, succeeded and failed counts, the IDs that succeeded, and an error per failed job
+    """
+    if bool(shift_minutes) == bool(scheduled_start and scheduled_end):
+        return to_json({"error": "Give either shift_minutes or both scheduled_start and scheduled_end"})
+    
+    return await _run_bulk(
+        "reschedule",
+        job_ids,
+        _job_filters(customer_id, employee_id, work_status, tags, scheduled_start_min, scheduled_start_max),
+        lambda job: _reschedule_job(job, shift_minutes, scheduled_start, scheduled_end, employee_ids),
+        concurrency,
+        dry_run,
+    )
 
 
 # Job Notes
@@ -574,10 +1083,10 @@ async def add_job_note(
     }
     
     try:
-        result = await make_api_request("POST", f"/jobs/{job_id}/notes", data=data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", f"/jobs/{job_id}/notes", json_data=data)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error adding note to job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error adding note to job {job_id}: {str(e)}"})
 
 
 @mcp.tool()
@@ -591,9 +1100,9 @@ async def delete_job_note(job_id: str, note_id: str) -> str:
     """
     try:
         result = await make_api_request("DELETE", f"/jobs/{job_id}/notes/{note_id}")
-        return json.dumps(result, indent=2)
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error deleting note {note_id} from job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error deleting note {note_id} from job {job_id}: {str(e)}"})
 
 
 # Job Links
@@ -624,10 +1133,98 @@ async def create_job_link(
         data["description"] = description
     
     try:
-        result = await make_api_request("POST", f"/jobs/{job_id}/links", data=data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", f"/jobs/{job_id}/links", json_data=data)
+        return to_json(result)
+    except Exception as e:
+        return to_json({"error": f"Error creating link for job {job_id}: {str(e)}"})
+
+
+# Job Exports
+
+@mcp.tool()
+async def export_jobs(
+    format: str = "ndjson",
+    path: Optional[str] = None,
+    customer_id: Optional[str] = None,
+    employee_id: Optional[str] = None,
+    work_status: Optional[str] = None,
+    tags: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    updated_after: Optional[str] = None,
+    updated_before: Optional[str] = None,
+    scheduled_start_min: Optional[str] = None,
+    scheduled_start_max: Optional[str] = None,
+    include_line_items: Optional[bool] = None,
+    fields: Optional[str] = None,
+    partition_by_month: Optional[bool] = None,
+) -> str:
+    """
+    Export every matching job to a local NDJSON, CSV, Parquet or Arrow file.
+    
+    Pages are streamed to disk as they arrive, so memory use stays flat for
+    any number of jobs. Only a summary is returned, not the jobs themselves.
+    
+    Args:
+        format: ndjson (one JSON job per line), csv (nested fields as dotted columns),
+                or parquet / arrow (typed columns for pandas or DuckDB; needs the analytics extra)
+        path: Output file; relative paths and the default name go in HOUSECALL_PRO_EXPORT_DIR
+        customer_id: Filter by customer ID
+        employee_id: Filter by employee ID
+        work_status: Filter by work status
+        tags: Filter by tags (comma-separated)
+        created_after: Export jobs created after this date (ISO 8601)
+        created_before: Export jobs created before this date (ISO 8601)
+        updated_after: Export jobs updated after this date (ISO 8601)
+        updated_before: Export jobs updated before this date (ISO 8601)
+        scheduled_start_min: Minimum scheduled start time (ISO 8601)
+        scheduled_start_max: Maximum scheduled start time (ISO 8601)
+        include_line_items: Include line items in each job
+        fields: Comma-separated fields to export for each job, with dotted paths for
+                nested fields (e.g. "id,customer.first_name,total_amount,schedule.scheduled_start"); default all.
+                For parquet and arrow, the column names to export (e.g. "id,customer_id,total_amount")
+        partition_by_month: Write a directory with one file per month (parquet and arrow only)
+    
+    Returns:
+        The file path, row count, size in bytes and SHA-256 checksum
+    """
+    params: Dict[str, Any] = {"page_size": EXPORT_PAGE_SIZE}
+    
+    if customer_id:
+        params["customer_id"] = customer_id
+    if employee_id:
+        params["employee_id"] = employee_id
+    if work_status:
+        params["work_status"] = work_status
+    if tags:
+        params["tags"] = tags
+    if created_after:
+        params["created_after"] = created_after
+    if created_before:
+        params["created_before"] = created_before
+    if updated_after:
+        params["updated_after"] = updated_after
+    if updated_before:
+        params["updated_before"] = updated_before
+    if scheduled_start_min:
+        params["scheduled_start_min"] = scheduled_start_min
+    if scheduled_start_max:
+        params["scheduled_start_max"] = scheduled_start_max
+    if include_line_items is not None:
+        params["include_line_items"] = str(include_line_items).lower()
+    
+    try:
+        result = await export_pages(
+            lambda p: make_api_request("GET", "/jobs", params={**params, "page": p}),
+            "jobs",
+            export_path("jobs", format, path),
+            format,
+            fields,
+            bool(partition_by_month),
+        )
+        return to_json(result)
     except Exception as e:
-        return json.dumps({"error": f"Error creating link for job {job_id}: {str(e)}"}, indent=2)
+        return to_json({"error": f"Error exporting jobs: {str(e)}"})
 
 
 if __name__ == "__main__":
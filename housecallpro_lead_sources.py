@@ -9,19 +9,21 @@ including retrieving, creating, and updating lead sources.
 import os
 from typing import Optional, Dict, Any
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import send_request
+from housecallpro_diagnostics import register_diagnostics_tools
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Lead Sources")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -149,29 +151,18 @@ async def update_lead_source(
 
 async def make_api_request(method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
     """Make authenticated API request to Housecall Pro."""
-    async with httpx.AsyncClient() as client:
-        headers = get_headers()
-        
-        url = f"{API_BASE_URL}{endpoint}"
-        
-        if method.upper() == "GET":
-            response = await client.get(url, headers=headers, params=params)
-        elif method.upper() == "POST":
-            response = await client.post(url, headers=headers, json=data)
-        elif method.upper() == "PUT":
-            response = await client.put(url, headers=headers, json=data)
-        elif method.upper() == "PATCH":
-            response = await client.patch(url, headers=headers, json=data)
-        elif method.upper() == "DELETE":
-            response = await client.delete(url, headers=headers)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
-        
-        if response.status_code >= 400:
-            error_msg = f"API request failed: {response.status_code} {response.text}"
-            return {"error": error_msg, "status_code": response.status_code}
-        
-        return response.json() if response.content else {}
+    if method.upper() not in ("GET", "POST", "PUT", "PATCH", "DELETE"):
+        raise ValueError(f"Unsupported HTTP method: {method}")
+    
+    response = await send_request(
+        method.upper(), endpoint, get_headers(), params=params, json_data=data
+    )
+    
+    if response.status_code >= 400:
+        error_msg = f"API request failed: {response.status_code} {response.text}"
+        return {"error": error_msg, "status_code": response.status_code}
+    
+    return response.json() if response.content else {}
 
 
 if __name__ == "__main__":
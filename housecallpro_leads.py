@@ -6,23 +6,27 @@ This server provides lead management functionality for Housecall Pro,
 including CRUD operations for leads and related entities.
 """
 
-import json
 import os
 from typing import Optional, Dict, Any, List
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_output import to_json, select_fields
+from housecallpro_pagination import fetch_all_pages
+from housecallpro_replica import query_replica
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Leads")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -37,15 +41,16 @@ def get_headers() -> Dict[str, str]:
     }
 
 
-def make_api_request(method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+async def make_api_request(
+    method: str,
+    endpoint: str,
+    params: Optional[Dict[str, Any]] = None,
+    json_data: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """Make an API request to Housecall Pro."""
-    url = f"{API_BASE_URL}{endpoint}"
-    headers = get_headers()
-    
-    with httpx.Client() as client:
-        response = client.request(method, url, headers=headers, **kwargs)
-        response.raise_for_status()
-        return response.json()
+    return await api_request(
+        method, endpoint, get_headers(), params=params, json_data=json_data
+    )
 
 
 @mcp.tool()
@@ -64,7 +69,10 @@ async def get_leads(
     updated_before: Optional[str] = None,
     customer_name: Optional[str] = None,
     customer_email: Optional[str] = None,
-    customer_phone: Optional[str] = None
+    customer_phone: Optional[str] = None,
+    all_pages: Optional[bool] = None,
+    use_replica: Optional[bool] = None,
+    fields: Optional[str] = None
 ) -> str:
     """
     Retrieve leads with optional filtering and pagination.
@@ -85,6 +93,10 @@ async def get_leads(
         customer_name: Filter by customer name (partial match)
         customer_email: Filter by customer email
         customer_phone: Filter by customer phone number
+        all_pages: Follow pagination and return every matching lead, starting at `page`
+        use_replica: Answer from the local replica instead of the API (see housecallpro_sync)
+        fields: Comma-separated fields to return for each lead, with dotted paths for
+                nested fields (e.g. "id,status,customer.first_name,customer.last_name"); default all
     
     Returns:
         JSON string containing leads data or error message
@@ -123,33 +135,64 @@ async def get_leads(
         if customer_phone:
             params["customer_phone"] = customer_phone
         
-        result = make_api_request("GET", "/leads", params=params)
-        return json.dumps(result, indent=2)
+        if use_replica:
+            result = await query_replica(
+                "leads",
+                get_headers(),
+                equals={
+                    "status": status,
+                    "lead_source": source,
+                    "assigned_employee.id": employee_id,
+                    "job_type.id": job_type_id,
+                    "customer.email": customer_email,
+                    "customer.mobile_number": customer_phone,
+                },
+                ranges={
+                    "created_at": (created_after, created_before),
+                    "updated_at": (updated_after, updated_before),
+                },
+                search=(["customer.first_name", "customer.last_name", "customer.company"], customer_name),
+                page=page,
+                page_size=None if all_pages else page_size or 25,
+                sort_by=sort_by,
+                sort_direction=sort_direction,
+            )
+        elif all_pages:
+            result = await fetch_all_pages(
+                lambda p: make_api_request("GET", "/leads", params={**params, "page": p}),
+                "leads",
+                start_page=page or 1,
+            )
+        else:
+            result = await make_api_request("GET", "/leads", params=params)
+        return to_json(select_fields(result, fields, "leads"))
         
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=2)
+        return to_json({"error": str(e)})
 
 
 @mcp.tool()
-async def get_lead(lead_id: str) -> str:
+async def get_lead(lead_id: str, fields: Optional[str] = None) -> str:
     """
     Retrieve a specific lead by ID.
     
     Args:
         lead_id: The unique identifier of the lead
+        fields: Comma-separated fields to return, with dotted paths for nested
+                fields (e.g. "id,status,customer.first_name,customer.last_name"); default all
     
     Returns:
         JSON string containing lead data or error message
     """
     try:
         if not lead_id:
-            return json.dumps({"error": "lead_id is required"}, indent=2)
+            return to_json({"error": "lead_id is required"})
         
-        result = make_api_request("GET", f"/leads/{lead_id}")
-        return json.dumps(result, indent=2)
+        result = await make_api_request("GET", f"/leads/{lead_id}")
+        return to_json(select_fields(result, fields))
         
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=2)
+        return to_json({"error": str(e)})
 
 
 @mcp.tool()
@@ -195,7 +238,7 @@ async def create_lead(
     """
     try:
         if not customer_name:
-            return json.dumps({"error": "customer_name is required"}, indent=2)
+            return to_json({"error": "customer_name is required"})
         
         lead_data = {
             "customer": {
@@ -239,11 +282,11 @@ async def create_lead(
         if custom_fields:
             lead_data["custom_fields"] = custom_fields
         
-        result = make_api_request("POST", "/leads", json=lead_data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", "/leads", json_data=lead_data)
+        return to_json(result)
         
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=2)
+        return to_json({"error": str(e)})
 
 
 @mcp.tool()
@@ -293,7 +336,7 @@ async def update_lead(
     """
     try:
         if not lead_id:
-            return json.dumps({"error": "lead_id is required"}, indent=2)
+            return to_json({"error": "lead_id is required"})
         
         update_data = {}
         
@@ -342,13 +385,13 @@ async def update_lead(
             update_data["custom_fields"] = custom_fields
         
         if not update_data:
-            return json.dumps({"error": "At least one field must be provided for update"}, indent=2)
+            return to_json({"error": "At least one field must be provided for update"})
         
-        result = make_api_request("PATCH", f"/leads/{lead_id}", json=update_data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("PATCH", f"/leads/{lead_id}", json_data=update_data)
+        return to_json(result)
         
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=2)
+        return to_json({"error": str(e)})
 
 
 @mcp.tool()
@@ -378,7 +421,7 @@ async def convert_lead_to_job(
     """
     try:
         if not lead_id:
-            return json.dumps({"error": "lead_id is required"}, indent=2)
+            return to_json({"error": "lead_id is required"})
         
         conversion_data = {}
         
@@ -395,11 +438,11 @@ async def convert_lead_to_job(
         if employee_ids:
             conversion_data["employee_ids"] = employee_ids
         
-        result = make_api_request("POST", f"/leads/{lead_id}/convert", json=conversion_data)
-        return json.dumps(result, indent=2)
+        result = await make_api_request("POST", f"/leads/{lead_id}/convert", json_data=conversion_data)
+        return to_json(result)
         
     except Exception as e:
-        return json.dumps({"error": str(e)}, indent=2)
+        return to_json({"error": str(e)})
 
 
 if __name__ == "__main__":
@@ -9,19 +9,21 @@ including retrieving, creating, updating, and deleting material categories.
 import os
 from typing import Optional, Dict, Any
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Material Categories")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -59,19 +61,9 @@ async def make_api_request(
     Raises:
         Exception: If the API request fails
     """
-    url = f"{API_BASE_URL}/{endpoint.lstrip('/')}"
-    headers = get_headers()
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.request(
-            method=method,
-            url=url,
-            headers=headers,
-            params=params,
-            json=json_data
-        )
-        response.raise_for_status()
-        return response.json()
+    return await api_request(
+        method, endpoint, get_headers(), params=params, json_data=json_data
+    )
 
 
 @mcp.tool()
@@ -150,7 +142,7 @@ async def create_material_category(
         data["description"] = description.strip()
     
     try:
-        result = await make_api_request("POST", "/material_categories", data=data)
+        result = await make_api_request("POST", "/material_categories", json_data=data)
         return {
             "success": True,
             "data": result,
@@ -212,7 +204,7 @@ async def update_material_category(
         }
     
     try:
-        result = await make_api_request("PUT", f"/material_categories/{category_id}", data=data)
+        result = await make_api_request("PUT", f"/material_categories/{category_id}", json_data=data)
         return {
             "success": True,
             "data": result,
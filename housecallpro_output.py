@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Output Encoding
+
+This module serializes tool results into the JSON strings the server
+modules return to the MCP client. Output is compact by default, with no
+indentation and no spaces after separators. Pretty-printing a large job
+or invoice list adds roughly a third to its size, and every extra byte
+costs encode time and LLM context. When the optional orjson package is
+installed, it is used as a faster encoder.
+
+Tools that accept a `fields` argument project their response down to the
+requested fields with select_fields before it is serialized, so unused
+nested data never reaches the client.
+
+Output is configured through environment variables:
+    HOUSECALL_PRO_JSON_STYLE: compact, or pretty for indent=2 output (default compact)
+    HOUSECALL_PRO_JSON_BACKEND: auto, orjson or json; auto uses orjson when
+        it is installed (default auto)
+"""
+
+import json
+import os
+from typing import Optional, Dict, Any
+
+from dotenv import load_dotenv
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+JSON_STYLE = os.getenv("HOUSECALL_PRO_JSON_STYLE", "compact").strip().lower()
+JSON_BACKEND = os.getenv("HOUSECALL_PRO_JSON_BACKEND", "auto").strip().lower()
+
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def orjson_available() -> bool:
+    """Return True if the optional orjson package is installed."""
+    return orjson is not None
+
+
+def get_backend() -> str:
+    """Return the encoder in use: "orjson" or "json"."""
+    if JSON_BACKEND == "json" or orjson is None:
+        return "json"
+    return "orjson"
+
+
+def to_json(obj: Any, style: Optional[str] = None) -> str:
+    """
+    Serialize a tool result to a JSON string.
+
+    Args:
+        obj: JSON-compatible result
+        style: compact or pretty; defaults to HOUSECALL_PRO_JSON_STYLE
+
+    Returns:
+        JSON string. Non-ASCII text is kept as UTF-8 rather than escaped,
+        and values JSON cannot represent are converted with str().
+    """
+    pretty = (style or JSON_STYLE) == "pretty"
+    if get_backend() == "orjson":
+        try:
+            return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+        except TypeError:
+            # orjson rejects non-string keys and integers wider than 64 bits
+            pass
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+    return json.dumps(obj, separators=_COMPACT_SEPARATORS, ensure_ascii=False, default=str)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Parse a comma-separated field list into a path tree.
+
+    "id,customer.first_name,customer.last_name" becomes
+    {"id": None, "customer": {"first_name": None, "last_name": None}}, where
+    None keeps the whole value. A path that is already kept whole absorbs
+    any deeper path, so "customer,customer.id" keeps all of customer.
+
+    Returns:
+        The path tree, or None when no fields were requested
+    """
+    if not fields or not fields.strip():
+        return None
+
+    tree: Dict[str, Any] = {}
+    for path in fields.split(","):
+        parts = [part.strip() for part in path.split(".") if part.strip()]
+        node = tree
+        for i, part in enumerate(parts):
+            if i == len(parts) - 1:
+                node[part] = None
+            elif part not in node:
+                node[part] = node = {}
+            elif node[part] is None:
+                break
+            else:
+                node = node[part]
+    return tree or None
+
+
+def _project(value: Any, tree: Optional[Dict[str, Any]]) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: _project(value[key], sub) for key, sub in tree.items() if key in value}
+    return value
+
+
+def select_fields(result: Any, fields: Optional[str], items_key: Optional[str] = None) -> Any:
+    """
+    Project an API response down to the requested fields.
+
+    Dotted paths select nested fields, and a path through a list applies to
+    every element, e.g. "assigned_employees.id". Fields a record does not
+    have are left out.
+
+    Args:
+        result: API response
+        fields: Comma-separated field paths; None or empty returns result unchanged
+        items_key: For list responses, the key holding the records (e.g. "jobs").
+                   Only the records are projected; page metadata is kept.
+
+    Returns:
+        The projected response. Error responses are returned unchanged.
+    """
+    tree = parse_fields(fields)
+    if tree is None or not isinstance(result, dict) or ("error" in result and "error" not in tree):
+        return result
+    if items_key is None:
+        return _project(result, tree)
+    if not isinstance(result.get(items_key), list):
+        return result
+    return {**result, items_key: _project(result[items_key], tree)}
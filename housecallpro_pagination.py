@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Pagination Helpers
+
+This module provides an async pagination engine for Housecall Pro list
+endpoints. It follows the page/total_pages metadata returned by the API and
+prefetches page N+1 while page N is being consumed, so full scans overlap
+network time with processing.
+
+For large scans, fetch_all_pages_parallel reads the first page, then fetches
+the remaining pages concurrently inside an adaptive window that grows on
+fast responses and shrinks on 429s or latency spikes.
+
+Each server module supplies a `fetch_page(page)` coroutine built on its own
+make_api_request helper, so the module's headers and error handling apply.
+"""
+
+import asyncio
+import os
+from collections import deque
+from typing import Optional, Dict, Any, List, AsyncIterator, Awaitable, Callable
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+FetchPage = Callable[[int], Awaitable[Dict[str, Any]]]
+
+# Safety cap for endpoints that do not report total_pages
+DEFAULT_MAX_PAGES = 500
+
+# Parallel page fetch window
+PAGE_CONCURRENCY_INITIAL = int(os.getenv("HOUSECALL_PRO_PAGE_CONCURRENCY_INITIAL", "2"))
+PAGE_CONCURRENCY_MAX = int(os.getenv("HOUSECALL_PRO_PAGE_CONCURRENCY_MAX", "8"))
+
+# How often a throttled (429) page is retried before the scan fails
+MAX_THROTTLE_RETRIES = 5
+THROTTLE_BACKOFF = 0.5
+
+
+class AdaptiveWindow:
+    """
+    Concurrency window for parallel page fetches.
+
+    The window grows by one after each fast response, shrinks by one when a
+    response is much slower than the running average latency, and halves
+    when the API answers 429 Too Many Requests.
+    """
+
+    def __init__(
+        self,
+        initial: int = PAGE_CONCURRENCY_INITIAL,
+        minimum: int = 1,
+        maximum: int = PAGE_CONCURRENCY_MAX,
+        spike_factor: float = 2.0,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.size = min(max(initial, self.minimum), self.maximum)
+        self.spike_factor = spike_factor
+        self.average_latency: Optional[float] = None
+
+    def record_success(self, latency: float) -> None:
+        """Adjust the window after a successful page fetch."""
+        if self.average_latency is None:
+            self.average_latency = latency
+
+        if latency > self.spike_factor * self.average_latency:
+            self.size = max(self.minimum, self.size - 1)
+        else:
+            self.size = min(self.maximum, self.size + 1)
+
+        self.average_latency = 0.8 * self.average_latency + 0.2 * latency
+
+    def record_throttle(self) -> None:
+        """Halve the window after a 429 response."""
+        self.size = max(self.minimum, self.size // 2)
+
+
+def _is_throttled(error: Exception) -> bool:
+    """Return True if an exception carries a 429 Too Many Requests response."""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+def _has_next_page(data: Dict[str, Any], page: int, items_key: Optional[str]) -> bool:
+    """Decide from a page response whether another page should be fetched."""
+    total_pages = data.get("total_pages")
+    if total_pages is not None:
+        return page < int(total_pages)
+    # Without total_pages, keep going until the API returns an empty page
+    return bool(items_key and data.get(items_key))
+
+
+async def iter_pages(
+    fetch_page: FetchPage,
+    items_key: Optional[str] = None,
+    start_page: int = 1,
+    max_pages: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield page responses in order, prefetching the next page in the background.
+
+    Args:
+        fetch_page: Coroutine function returning the response for a page number
+        items_key: Response key holding the page's items (e.g. "jobs"); used to
+                   detect the last page when the API omits total_pages
+        start_page: First page to fetch (default 1)
+        max_pages: Maximum number of pages to fetch (default DEFAULT_MAX_PAGES)
+
+    Raises:
+        ValueError: If a page response is not a JSON object
+    """
+    limit = max_pages if max_pages is not None else DEFAULT_MAX_PAGES
+    page = start_page
+    fetched = 1
+    pending: Optional[asyncio.Future] = asyncio.ensure_future(fetch_page(page))
+
+    try:
+        while pending is not None:
+            data = await pending
+            pending = None
+
+            if not isinstance(data, dict):
+                raise ValueError(f"Unexpected response for page {page}: {data}")
+
+            if fetched < limit and _has_next_page(data, page, items_key):
+                pending = asyncio.ensure_future(fetch_page(page + 1))
+                fetched += 1
+
+            yield data
+            page += 1
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def iter_items(
+    fetch_page: FetchPage,
+    items_key: str,
+    start_page: int = 1,
+    max_pages: Optional[int] = None,
+) -> AsyncIterator[Any]:
+    """Yield the individual items of every page, in order."""
+    async for data in iter_pages(fetch_page, items_key, start_page, max_pages):
+        for item in data.get(items_key) or []:
+            yield item
+
+
+async def fetch_all_pages(
+    fetch_page: FetchPage,
+    items_key: str,
+    start_page: int = 1,
+    max_pages: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Fetch every page and merge the items into a single response.
+
+    Returns:
+        A response shaped like a single page, with all items under `items_key`
+        plus "total_items" and "pages_fetched"
+    """
+    pages = [data async for data in iter_pages(fetch_page, items_key, start_page, max_pages)]
+    return _merge_pages(pages, items_key)
+
+
+def _merge_pages(pages: List[Dict[str, Any]], items_key: str) -> Dict[str, Any]:
+    """Merge page responses, in order, into a single response."""
+    items: List[Any] = []
+    for data in pages:
+        items.extend(data.get(items_key) or [])
+
+    last = pages[-1] if pages else {}
+    merged = {k: v for k, v in last.items() if k not in (items_key, "page")}
+    merged[items_key] = items
+    merged["total_items"] = len(items)
+    merged["pages_fetched"] = len(pages)
+    return merged
+
+
+async def fetch_pages_parallel(
+    fetch_page: FetchPage,
+    items_key: Optional[str] = None,
+    start_page: int = 1,
+    max_pages: Optional[int] = None,
+    window: Optional[AdaptiveWindow] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch every page concurrently once the first page reports total_pages.
+
+    Pages are dispatched inside an AdaptiveWindow. A page that gets a 429
+    response is put back at the front of the queue after a short pause.
+    If the first page has no total_pages, the remaining pages are read
+    sequentially with iter_pages.
+
+    Returns:
+        Page responses in page order
+    """
+    limit = max_pages if max_pages is not None else DEFAULT_MAX_PAGES
+    window = window or AdaptiveWindow()
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    first = await fetch_page(start_page)
+    if not isinstance(first, dict):
+        raise ValueError(f"Unexpected response for page {start_page}: {first}")
+    window.record_success(loop.time() - started)
+
+    if limit <= 1 or not _has_next_page(first, start_page, items_key):
+        return [first]
+
+    if first.get("total_pages") is None:
+        rest = iter_pages(fetch_page, items_key, start_page + 1, limit - 1)
+        return [first] + [data async for data in rest]
+
+    last_page = min(int(first["total_pages"]), start_page + limit - 1)
+    queue = deque(range(start_page + 1, last_page + 1))
+    results = {start_page: first}
+    throttled: Dict[int, int] = {}
+    in_flight: Dict[asyncio.Future, tuple] = {}
+
+    try:
+        while queue or in_flight:
+            while queue and len(in_flight) < window.size:
+                page = queue.popleft()
+                in_flight[asyncio.ensure_future(fetch_page(page))] = (page, loop.time())
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                page, started = in_flight.pop(task)
+                try:
+                    data = task.result()
+                except Exception as e:
+                    if not _is_throttled(e) or throttled.get(page, 0) >= MAX_THROTTLE_RETRIES:
+                        raise
+                    throttled[page] = throttled.get(page, 0) + 1
+                    window.record_throttle()
+                    queue.appendleft(page)
+                    await asyncio.sleep(THROTTLE_BACKOFF * throttled[page])
+                    continue
+
+                if not isinstance(data, dict):
+                    raise ValueError(f"Unexpected response for page {page}: {data}")
+                window.record_success(loop.time() - started)
+                results[page] = data
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+    return [results[page] for page in sorted(results)]
+
+
+async def fetch_all_pages_parallel(
+    fetch_page: FetchPage,
+    items_key: str,
+    start_page: int = 1,
+    max_pages: Optional[int] = None,
+    window: Optional[AdaptiveWindow] = None,
+) -> Dict[str, Any]:
+    """
+    Parallel counterpart of fetch_all_pages.
+
+    Returns:
+        A response shaped like a single page, with all items under `items_key`
+        plus "total_items" and "pages_fetched"
+    """
+    pages = await fetch_pages_parallel(fetch_page, items_key, start_page, max_pages, window)
+    return _merge_pages(pages, items_key)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Client-Side Rate Limiting
+
+This module provides the token-bucket rate limiter that every request in
+housecallpro_client passes through. Several MCP server processes usually
+run side by side with the same API key, so by default the bucket state is
+kept in a small file under the temp directory and updated under a file
+lock. Every process then draws from one shared budget instead of assuming
+it owns the full rate.
+
+The limiter is configured through environment variables:
+    HOUSECALL_PRO_RATE_LIMIT: Sustained requests per second (default 5, 0 disables)
+    HOUSECALL_PRO_RATE_BURST: Bucket capacity, i.e. allowed burst (default 10)
+    HOUSECALL_PRO_RATE_LIMIT_FILE: Shared state file; "none" keeps the
+        bucket local to the process (default: temp directory, one file per API key)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, Tuple
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait before retrying when another process holds the shared state lock
+LOCK_RETRY_DELAY = 0.002
+
+_limiters: Dict[str, "TokenBucket"] = {}
+_stats = {"requests": 0, "throttled": 0, "wait_seconds": 0.0}
+
+
+class TokenBucket:
+    """
+    In-process token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each
+    request takes one token and waits when the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.time()
+
+    def _refill(self, tokens: float, updated: float, now: float) -> float:
+        """Return the token count after refilling from `updated` to `now`."""
+        elapsed = max(0.0, now - updated)
+        return min(self.capacity, tokens + elapsed * self.rate)
+
+    def _take(self, tokens: float, now: float) -> Tuple[float, float]:
+        """
+        Try to take one token.
+
+        Returns:
+            The remaining token count and how long to wait before retrying
+            (0 if a token was taken)
+        """
+        if tokens >= 1.0:
+            return tokens - 1.0, 0.0
+        return tokens, (1.0 - tokens) / self.rate
+
+    def try_acquire(self) -> Optional[float]:
+        """
+        Take a token if one is available, otherwise return the wait time.
+
+        Returns:
+            0 if a token was taken, the seconds to wait for one, or None if the
+            bucket state is busy and should be retried after LOCK_RETRY_DELAY
+        """
+        now = time.time()
+        tokens = self._refill(self._tokens, self._updated, now)
+        self._tokens, wait = self._take(tokens, now)
+        self._updated = now
+        return wait
+
+    async def acquire(self) -> float:
+        """
+        Wait until a token is available and take it.
+
+        Returns:
+            Total seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire()
+            if wait is None:
+                await asyncio.sleep(LOCK_RETRY_DELAY)
+                continue
+            if wait <= 0:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in a locked file shared by processes.
+
+    The lock is taken without blocking: when another process holds it,
+    try_acquire returns None and acquire yields to the event loop before
+    trying again, so lock contention never stalls other tool calls. If the
+    state file cannot be opened, the bucket falls back to limiting this
+    process only.
+    """
+
+    def __init__(self, rate: float, capacity: float, path: str):
+        super().__init__(rate, capacity)
+        self.path = path
+        self._local: Optional[TokenBucket] = None
+
+    @contextmanager
+    def _locked_state(self, fd: int) -> Iterator[Optional[Any]]:
+        """Try to lock the open state file; yields None if it is locked elsewhere."""
+        with os.fdopen(fd, "r+b") as fh:
+            try:
+                if os.name == "nt":
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield None
+                return
+            try:
+                yield fh
+            finally:
+                if os.name == "nt":
+                    fh.seek(0)
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+                else:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    def try_acquire(self) -> Optional[float]:
+        """Take a token from the shared bucket if one is available and the state is not locked."""
+        if self._local is not None:
+            return self._local.try_acquire()
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError as e:
+            logger.warning(
+                "Cannot open shared rate limit file %s (%s); limiting this process only", self.path, e
+            )
+            self._local = TokenBucket(self.rate, self.capacity)
+            return self._local.try_acquire()
+
+        with self._locked_state(fd) as fh:
+            if fh is None:
+                return None
+            now = time.time()
+            fh.seek(0)
+            try:
+                state = json.loads(fh.read() or b"{}")
+                tokens = float(state.get("tokens", self.capacity))
+                updated = float(state.get("updated", now))
+            except (ValueError, TypeError, AttributeError):
+                tokens, updated = self.capacity, now
+
+            tokens = self._refill(tokens, updated, now)
+            tokens, wait = self._take(tokens, now)
+
+            fh.seek(0)
+            fh.truncate()
+            fh.write(json.dumps({"tokens": tokens, "updated": now}).encode())
+            fh.flush()
+        return wait
+
+
+def _limiter_settings() -> Dict[str, Any]:
+    """Return the limiter settings resolved from the environment."""
+    return {
+        "rate": float(os.getenv("HOUSECALL_PRO_RATE_LIMIT") or 5),
+        "burst": float(os.getenv("HOUSECALL_PRO_RATE_BURST") or 10),
+        "path": os.getenv("HOUSECALL_PRO_RATE_LIMIT_FILE"),
+    }
+
+
+def get_limiter(key: str) -> Optional[TokenBucket]:
+    """
+    Return the limiter for an API key, creating it on first use.
+
+    Returns:
+        The token bucket, or None if rate limiting is disabled
+    """
+    if key in _limiters:
+        return _limiters[key]
+
+    settings = _limiter_settings()
+    if settings["rate"] <= 0:
+        limiter = None
+    elif (settings["path"] or "").lower() == "none":
+        limiter = TokenBucket(settings["rate"], settings["burst"])
+    else:
+        path = settings["path"] or os.path.join(
+            tempfile.gettempdir(), f"housecallpro_ratelimit_{key}.json"
+        )
+        limiter = SharedTokenBucket(settings["rate"], settings["burst"], path)
+
+    _limiters[key] = limiter
+    return limiter
+
+
+def limiter_key(headers: Dict[str, str]) -> str:
+    """Derive a bucket key from the request's Authorization header."""
+    authorization = headers.get("Authorization", "")
+    return hashlib.sha256(authorization.encode()).hexdigest()[:16]
+
+
+async def acquire(headers: Dict[str, str]) -> None:
+    """Wait for a rate limit token for the API key in `headers`."""
+    limiter = get_limiter(limiter_key(headers))
+    _stats["requests"] += 1
+    if limiter is None:
+        return
+
+    waited = await limiter.acquire()
+    if waited > 0:
+        _stats["throttled"] += 1
+        _stats["wait_seconds"] += waited
+
+
+def get_stats() -> Dict[str, Any]:
+    """Return counters for requests seen and time spent waiting for tokens."""
+    return dict(_stats)
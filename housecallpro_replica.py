@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Local Replica
+
+This module mirrors Housecall Pro records into a local SQLite database so
+analytical questions (revenue trends, close rate by month, jobs per
+technician) can be answered without sweeping the live API.
+
+Each record is stored as its JSON document in a single `records` table,
+keyed by resource and id, with created_at/updated_at pulled out for
+indexing. The first sync of a resource is a full backfill. Later syncs of
+jobs, invoices and leads only fetch records changed since the last seen
+updated_at, using the API's updated_after filter. Resources without that
+filter are re-read in full, and records that disappeared upstream are pruned.
+
+Read tools answer from the replica with query_replica, which translates
+their filters into SQL over the stored JSON.
+
+The replica is configured through environment variables:
+    HOUSECALL_PRO_REPLICA_PATH: SQLite database file (default ~/.housecallpro-mcp/replica.db)
+    HOUSECALL_PRO_REPLICA_MAX_AGE: Seconds after which incremental resources
+        are synced again before a replica read (default 900, 0 never refreshes)
+"""
+
+import asyncio
+import json
+import math
+import os
+import re
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+from dotenv import load_dotenv
+
+from housecallpro_client import api_request
+from housecallpro_pagination import iter_pages
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+REPLICA_PATH = os.path.expanduser(
+    os.getenv("HOUSECALL_PRO_REPLICA_PATH") or "~/.housecallpro-mcp/replica.db"
+)
+REPLICA_MAX_AGE = float(os.getenv("HOUSECALL_PRO_REPLICA_MAX_AGE", "900"))
+
+SYNC_PAGE_SIZE = 100
+SYNC_MAX_PAGES = 10000
+
+# Mirrored resources: list endpoint, response items key, and whether the
+# endpoint supports updated_after for incremental sync
+RESOURCES = {
+    "jobs": {"endpoint": "/jobs", "items_key": "jobs", "incremental": True},
+    "invoices": {"endpoint": "/invoices", "items_key": "invoices", "incremental": True},
+    "leads": {"endpoint": "/leads", "items_key": "leads", "incremental": True},
+    "customers": {"endpoint": "/customers", "items_key": "customers", "incremental": False},
+    "estimates": {"endpoint": "/estimates", "items_key": "estimates", "incremental": False},
+    "employees": {"endpoint": "/employees", "items_key": "employees", "incremental": False},
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    resource TEXT NOT NULL,
+    id TEXT NOT NULL,
+    created_at TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (resource, id)
+);
+CREATE INDEX IF NOT EXISTS idx_records_created ON records (resource, created_at);
+CREATE INDEX IF NOT EXISTS idx_records_updated ON records (resource, updated_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    resource TEXT PRIMARY KEY,
+    last_synced_at TEXT,
+    last_full_sync_at TEXT,
+    high_water_mark TEXT,
+    record_count INTEGER
+);
+"""
+
+# Field paths accepted in filters and sort_by: "customer.id", "assigned_employees[*].id", "tags[*]"
+_FIELD_PATH = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\[\*\])?(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+
+_sync_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    """Open the replica database, creating it and its schema on first use."""
+    path = path or REPLICA_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def upsert_records(
+    resource: str,
+    items: Iterable[Dict[str, Any]],
+    path: Optional[str] = None,
+    keep_newer: bool = False,
+) -> int:
+    """
+    Insert or replace records of a resource.
+
+    Args:
+        keep_newer: Leave a stored record alone when its updated_at is later
+                    than the incoming one's (for out-of-order webhook events)
+
+    Returns:
+        Number of records written
+    """
+    rows = [
+        (resource, str(item["id"]), item.get("created_at"), item.get("updated_at"), json.dumps(item))
+        for item in items
+        if isinstance(item, dict) and item.get("id") is not None
+    ]
+    with closing(connect(path)) as conn, conn:
+        if not keep_newer:
+            conn.executemany(
+                "INSERT OR REPLACE INTO records (resource, id, created_at, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            return len(rows)
+        cursor = conn.executemany(
+            "INSERT INTO records (resource, id, created_at, updated_at, data) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(resource, id) DO UPDATE SET "
+            "created_at = excluded.created_at, updated_at = excluded.updated_at, data = excluded.data "
+            "WHERE records.updated_at IS NULL OR excluded.updated_at IS NULL "
+            "OR excluded.updated_at >= records.updated_at",
+            rows,
+        )
+        return cursor.rowcount
+
+
+def delete_record(resource: str, record_id: str, path: Optional[str] = None) -> None:
+    """Remove one record from the replica."""
+    with closing(connect(path)) as conn, conn:
+        conn.execute("DELETE FROM records WHERE resource = ? AND id = ?", (resource, str(record_id)))
+
+
+def _prune(conn: sqlite3.Connection, resource: str, keep_ids: Iterable[str]) -> int:
+    """Delete records of a resource whose id is not in keep_ids."""
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep_ids (id TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM keep_ids")
+    conn.executemany("INSERT OR IGNORE INTO keep_ids (id) VALUES (?)", ((i,) for i in keep_ids))
+    cursor = conn.execute(
+        "DELETE FROM records WHERE resource = ? AND id NOT IN (SELECT id FROM keep_ids)",
+        (resource,),
+    )
+    return cursor.rowcount
+
+
+def _finish_sync(
+    resource: str,
+    full: bool,
+    high_water_mark: Optional[str],
+    keep_ids: Optional[Iterable[str]],
+    path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Prune after a full sync and record the sync state."""
+    with closing(connect(path)) as conn, conn:
+        pruned = _prune(conn, resource, keep_ids) if keep_ids is not None else 0
+        count = conn.execute(
+            "SELECT COUNT(*) FROM records WHERE resource = ?", (resource,)
+        ).fetchone()[0]
+        now = _now()
+        conn.execute(
+            "INSERT INTO sync_state (resource, last_synced_at, last_full_sync_at, high_water_mark, record_count) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(resource) DO UPDATE SET "
+            "last_synced_at = excluded.last_synced_at, "
+            "last_full_sync_at = COALESCE(excluded.last_full_sync_at, last_full_sync_at), "
+            "high_water_mark = COALESCE(excluded.high_water_mark, high_water_mark), "
+            "record_count = excluded.record_count",
+            (resource, now, now if full else None, high_water_mark, count),
+        )
+    return {"pruned": pruned, "record_count": count}
+
+
+def get_sync_state(resource: Optional[str] = None, path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Return the sync state of one resource, or of every synced resource."""
+    with closing(connect(path)) as conn:
+        if resource:
+            rows = conn.execute("SELECT * FROM sync_state WHERE resource = ?", (resource,)).fetchall()
+        else:
+            rows = conn.execute("SELECT * FROM sync_state ORDER BY resource").fetchall()
+    return {row["resource"]: dict(row) for row in rows}
+
+
+async def sync_resource(
+    resource: str,
+    headers: Dict[str, str],
+    full: bool = False,
+    path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Sync one resource into the replica.
+
+    Args:
+        resource: Resource name, one of RESOURCES
+        headers: Request headers, including authorization
+        full: Re-read every record even if an incremental sync is possible
+        path: Replica database file (default REPLICA_PATH)
+
+    Returns:
+        Summary with the sync mode, records fetched and pruned, and the record count
+
+    Raises:
+        ValueError: If the resource is not mirrored
+    """
+    if resource not in RESOURCES:
+        raise ValueError(f"Unknown replica resource '{resource}'. Choose from: {', '.join(RESOURCES)}")
+
+    lock = _sync_locks.setdefault(resource, asyncio.Lock())
+    async with lock:
+        spec = RESOURCES[resource]
+        state = (await asyncio.to_thread(get_sync_state, resource, path)).get(resource)
+        since = state["high_water_mark"] if state else None
+        incremental = spec["incremental"] and not full and since is not None
+
+        params: Dict[str, Any] = {"page_size": SYNC_PAGE_SIZE}
+        if incremental:
+            params["updated_after"] = since
+
+        async def fetch_page(page: int) -> Dict[str, Any]:
+            return await api_request("GET", spec["endpoint"], headers, params={**params, "page": page})
+
+        fetched = 0
+        high_water_mark = since
+        seen_ids: Optional[List[str]] = None if incremental else []
+        async for data in iter_pages(fetch_page, spec["items_key"], max_pages=SYNC_MAX_PAGES):
+            items = data.get(spec["items_key"]) or []
+            fetched += await asyncio.to_thread(upsert_records, resource, items, path)
+            for item in items:
+                updated_at = item.get("updated_at")
+                if updated_at and (high_water_mark is None or updated_at > high_water_mark):
+                    high_water_mark = updated_at
+                if seen_ids is not None and item.get("id") is not None:
+                    seen_ids.append(str(item["id"]))
+
+        summary = await asyncio.to_thread(
+            _finish_sync, resource, not incremental, high_water_mark, seen_ids, path
+        )
+        return {
+            "resource": resource,
+            "mode": "incremental" if incremental else "full",
+            "updated_after": since if incremental else None,
+            "fetched": fetched,
+            **summary,
+        }
+
+
+async def ensure_fresh(resource: str, headers: Dict[str, str], path: Optional[str] = None) -> None:
+    """
+    Make sure a resource can be read from the replica.
+
+    Incremental resources older than REPLICA_MAX_AGE are synced first.
+
+    Raises:
+        ValueError: If the resource has never been synced
+    """
+    state = (await asyncio.to_thread(get_sync_state, resource, path)).get(resource)
+    if state is None:
+        raise ValueError(
+            f"The local replica has no {resource} yet; run sync_replica first"
+        )
+    if not RESOURCES[resource]["incremental"] or REPLICA_MAX_AGE <= 0:
+        return
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(state["last_synced_at"])
+    if age.total_seconds() > REPLICA_MAX_AGE:
+        await sync_resource(resource, headers, path=path)
+
+
+def _json_path(field: str) -> str:
+    if not _FIELD_PATH.match(field) or "[*]" in field:
+        raise ValueError(f"Unsupported replica field '{field}'")
+    return "$." + field
+
+
+def _condition(field: str, op: str, value: Any) -> Tuple[str, List[Any]]:
+    """Build an SQL condition comparing a JSON field, or any element of a list field, to a value."""
+    if not _FIELD_PATH.match(field):
+        raise ValueError(f"Unsupported replica field '{field}'")
+    if isinstance(value, bool):
+        value = int(value)
+
+    if "[*]" in field:
+        list_field, _, item_field = field.partition("[*]")
+        element = f"json_extract(value, '${item_field}')" if item_field else "value"
+        sql = (
+            f"EXISTS (SELECT 1 FROM json_each(data, '$.{list_field}') "
+            f"WHERE {element} {op} ?)"
+        )
+        return sql, [value]
+    return f"json_extract(data, '{_json_path(field)}') {op} ?", [value]
+
+
+def query_records(
+    resource: str,
+    equals: Optional[Dict[str, Any]] = None,
+    ranges: Optional[Dict[str, Tuple[Optional[str], Optional[str]]]] = None,
+    search: Optional[Tuple[List[str], Optional[str]]] = None,
+    page: Optional[int] = None,
+    page_size: Optional[int] = None,
+    sort_by: Optional[str] = None,
+    sort_direction: Optional[str] = None,
+    path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Query replica records with API-style filters.
+
+    Args:
+        resource: Resource name, one of RESOURCES
+        equals: Field path -> required value; "list[*].field" matches any element
+        ranges: Field path -> (minimum, maximum), either bound may be None
+        search: (field paths, text) for a case-insensitive partial match on any field
+        page: Page number (default 1)
+        page_size: Records per page; None returns every match
+        sort_by: Field path to sort by (default created_at)
+        sort_direction: "asc" or "desc" (default desc)
+        path: Replica database file (default REPLICA_PATH)
+
+    Returns:
+        A response shaped like an API list page, with items under the
+        resource's items key
+
+    Raises:
+        ValueError: If a field path is not supported
+    """
+    conditions = ["resource = ?"]
+    args: List[Any] = [resource]
+
+    for field, value in (equals or {}).items():
+        if value is not None:
+            sql, values = _condition(field, "=", value)
+            conditions.append(sql)
+            args.extend(values)
+
+    for field, (minimum, maximum) in (ranges or {}).items():
+        if minimum is not None:
+            sql, values = _condition(field, ">=", minimum)
+            conditions.append(sql)
+            args.extend(values)
+        if maximum is not None:
+            sql, values = _condition(field, "<=", maximum)
+            conditions.append(sql)
+            args.extend(values)
+
+    if search and search[1]:
+        fields, text = search
+        matches = [f"json_extract(data, '{_json_path(f)}') LIKE ?" for f in fields]
+        conditions.append("(" + " OR ".join(matches) + ")")
+        args.extend([f"%{text}%"] * len(fields))
+
+    order = f"json_extract(data, '{_json_path(sort_by)}')" if sort_by else "created_at"
+    direction = "ASC" if (sort_direction or "").lower() == "asc" else "DESC"
+    where = " AND ".join(conditions)
+
+    with closing(connect(path)) as conn:
+        total = conn.execute(f"SELECT COUNT(*) FROM records WHERE {where}", args).fetchone()[0]
+        sql = f"SELECT data FROM records WHERE {where} ORDER BY {order} {direction}, id"
+        page = page or 1
+        if page_size:
+            sql += " LIMIT ? OFFSET ?"
+            rows = conn.execute(sql, args + [page_size, (page - 1) * page_size]).fetchall()
+        else:
+            rows = conn.execute(sql, args).fetchall()
+        synced_at = conn.execute(
+            "SELECT last_synced_at FROM sync_state WHERE resource = ?", (resource,)
+        ).fetchone()
+
+    return {
+        RESOURCES[resource]["items_key"]: [json.loads(row["data"]) for row in rows],
+        "page": page,
+        "page_size": page_size or total,
+        "total_pages": math.ceil(total / page_size) if page_size else 1,
+        "total_items": total,
+        "source": "replica",
+        "replica_synced_at": synced_at[0] if synced_at else None,
+    }
+
+
+async def query_replica(
+    resource: str,
+    headers: Dict[str, str],
+    **filters: Any,
+) -> Dict[str, Any]:
+    """
+    Answer a list query from the replica, refreshing it first if it is stale.
+
+    Takes the same filter arguments as query_records.
+    """
+    await ensure_fresh(resource, headers)
+    return await asyncio.to_thread(query_records, resource, **filters)
+
+
+def unsupported_filters(**filters: Any) -> None:
+    """
+    Reject API filters the replica cannot answer.
+
+    Raises:
+        ValueError: If any of the given filters is set
+    """
+    used = [name for name, value in filters.items() if value is not None]
+    if used:
+        raise ValueError(f"Filters not supported with use_replica: {', '.join(used)}")
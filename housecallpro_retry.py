@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Retry Policy
+
+This module retries transient failures in the shared request path used by
+housecallpro_client. Idempotent requests (GET, HEAD, OPTIONS, PUT, DELETE)
+are retried on 429/5xx gateway responses and on network errors, with
+exponential backoff and full jitter. A Retry-After header from the API
+takes precedence over the computed delay. Other methods are retried only
+when the request never reached the API (connect errors, 429).
+
+Retries are capped per request and by a retry budget shared by every
+request made during one MCP tool call, so a fan-out such as the weekly
+scorecard cannot turn one outage into minutes of retrying.
+
+The policy is configured through environment variables:
+    HOUSECALL_PRO_RETRY_ATTEMPTS: Retries per request (default 3, 0 disables)
+    HOUSECALL_PRO_RETRY_BASE_DELAY: Base backoff delay in seconds (default 0.25)
+    HOUSECALL_PRO_RETRY_MAX_DELAY: Maximum delay between attempts in seconds (default 8)
+    HOUSECALL_PRO_RETRY_BUDGET: Retries allowed per tool call (default 10)
+    HOUSECALL_PRO_RETRY_BUDGET_SECONDS: Total retry wait allowed per tool call (default 20)
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Awaitable, Callable, Hashable
+
+import httpx
+from dotenv import load_dotenv
+from mcp.server.lowlevel.server import request_ctx
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RETRY_ATTEMPTS = int(os.getenv("HOUSECALL_PRO_RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("HOUSECALL_PRO_RETRY_BASE_DELAY", "0.25"))
+RETRY_MAX_DELAY = float(os.getenv("HOUSECALL_PRO_RETRY_MAX_DELAY", "8"))
+RETRY_BUDGET = int(os.getenv("HOUSECALL_PRO_RETRY_BUDGET", "10"))
+RETRY_BUDGET_SECONDS = float(os.getenv("HOUSECALL_PRO_RETRY_BUDGET_SECONDS", "20"))
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Errors raised before the request reached the API, safe to retry for any method
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Errors that may have happened after the request was sent
+TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+# Budgets of recent tool calls, keyed by MCP session and request id
+MAX_TRACKED_BUDGETS = 256
+_budgets: "OrderedDict[Hashable, RetryBudget]" = OrderedDict()
+
+_stats: Dict[str, Any] = {
+    "requests": 0,
+    "retries": 0,
+    "recovered": 0,
+    "gave_up": 0,
+    "budget_exhausted": 0,
+    "retry_wait_seconds": 0.0,
+    "reasons": {},
+}
+
+
+class RetryBudget:
+    """Retries and retry wait time left for one tool call."""
+
+    def __init__(self, retries: int = RETRY_BUDGET, seconds: float = RETRY_BUDGET_SECONDS):
+        self.retries = retries
+        self.seconds = seconds
+
+    def spend(self, delay: float) -> bool:
+        """Take one retry and `delay` seconds from the budget if both are left."""
+        if self.retries <= 0 or delay > self.seconds:
+            return False
+        self.retries -= 1
+        self.seconds -= delay
+        return True
+
+
+def current_budget() -> RetryBudget:
+    """
+    Return the retry budget for the current tool call.
+
+    Inside an MCP request the budget is shared by every API request the tool
+    makes, including concurrent ones. Outside a request (scripts, benchmarks)
+    each API request gets its own budget.
+    """
+    ctx = request_ctx.get(None)
+    if ctx is None:
+        return RetryBudget()
+
+    key = (id(ctx.session), ctx.request_id)
+    budget = _budgets.get(key)
+    if budget is None:
+        budget = _budgets[key] = RetryBudget()
+        if len(_budgets) > MAX_TRACKED_BUDGETS:
+            _budgets.popitem(last=False)
+    return budget
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given as seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    Return the delay before retry number `attempt` (0-based).
+
+    Uses full jitter: a uniform random delay between zero and the
+    exponential backoff ceiling. A Retry-After value overrides it.
+    """
+    if retry_after is not None:
+        return retry_after
+    ceiling = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def _retryable_error(method: str, error: Exception) -> bool:
+    """Return True if a transport error may be retried for this method."""
+    if isinstance(error, NOT_SENT_ERRORS):
+        return True
+    return method in IDEMPOTENT_METHODS and isinstance(error, TRANSIENT_ERRORS)
+
+
+def _retryable_status(method: str, status_code: int) -> bool:
+    """Return True if a response status may be retried for this method."""
+    if status_code == 429:
+        return True
+    return method in IDEMPOTENT_METHODS and status_code in RETRY_STATUSES
+
+
+def _record_retry(reason: str, delay: float) -> None:
+    """Count a retry and its wait time."""
+    _stats["retries"] += 1
+    _stats["retry_wait_seconds"] += delay
+    _stats["reasons"][reason] = _stats["reasons"].get(reason, 0) + 1
+
+
+async def send_with_retry(
+    method: str,
+    send: Callable[[], Awaitable[httpx.Response]],
+    retry: bool = True,
+) -> httpx.Response:
+    """
+    Send a request, retrying transient failures according to the policy.
+
+    Args:
+        method: HTTP method of the request
+        send: Coroutine function that sends the request once
+        retry: Set to False for requests whose body cannot be replayed
+
+    Returns:
+        The final response; a retryable error status is returned as-is once
+        retries or the budget run out
+
+    Raises:
+        httpx.HTTPError: If the final attempt fails to complete
+    """
+    method = method.upper()
+    _stats["requests"] += 1
+    attempts = RETRY_ATTEMPTS if retry else 0
+    budget: Optional[RetryBudget] = None
+    attempt = 0
+
+    while True:
+        error: Optional[Exception] = None
+        response: Optional[httpx.Response] = None
+        try:
+            response = await send()
+        except httpx.HTTPError as e:
+            if attempt >= attempts or not _retryable_error(method, e):
+                if attempt:
+                    _stats["gave_up"] += 1
+                raise
+            error = e
+            reason = type(e).__name__
+            retry_after = None
+        else:
+            if attempt >= attempts or not _retryable_status(method, response.status_code):
+                if attempt:
+                    key = "recovered" if response.status_code < 400 else "gave_up"
+                    _stats[key] += 1
+                return response
+            reason = str(response.status_code)
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+        delay = backoff_delay(attempt, retry_after)
+        budget = budget or current_budget()
+        if not budget.spend(delay):
+            _stats["budget_exhausted"] += 1
+            _stats["gave_up"] += 1
+            if error is not None:
+                raise error
+            return response
+
+        _record_retry(reason, delay)
+        logger.warning(
+            "Retrying %s request after %s (attempt %d of %d, waiting %.2fs)",
+            method, reason, attempt + 1, attempts, delay,
+        )
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def get_stats() -> Dict[str, Any]:
+    """Return retry counters: retries by reason, recoveries and give-ups."""
+    stats = dict(_stats)
+    stats["reasons"] = dict(_stats["reasons"])
+    return stats
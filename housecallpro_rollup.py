@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Weekly Revenue Rollups
+
+This module keeps revenue and job count per ISO week (Monday to Sunday,
+local time) in a small SQLite database, so multi-week trend questions read
+stored totals instead of pulling every completed job again. Totals use the
+same rules as get_weekly_revenue: jobs with work_status "complete", bucketed
+by completed_at, summing total_amount. Each week also has a breakdown by
+job type and by assigned employee. A job with several employees counts in
+full for each of them, so employee totals can add up to more than the week.
+
+A week missing from the store is computed with one sweep of its completed
+jobs. Once a week has ended and HOUSECALL_PRO_ROLLUP_GRACE_HOURS have
+passed, it is closed and its totals are frozen. Open weeks (the current
+week, and last week during the grace period) keep one row per counted job.
+They are refreshed incrementally: only jobs updated since the last refresh
+are fetched (updated_after), added, moved or dropped, and the week's totals
+re-summed from the stored rows. delete_weeks forgets weeks so the next read
+computes them again, e.g. after a correction to an already closed week.
+
+Rollups are configured through environment variables:
+    HOUSECALL_PRO_ROLLUP_PATH: SQLite database file (default ~/.housecallpro-mcp/rollups.db)
+    HOUSECALL_PRO_ROLLUP_MAX_AGE: Seconds before open weeks are refreshed again
+        on read (default 300, 0 refreshes on every read)
+    HOUSECALL_PRO_ROLLUP_GRACE_HOURS: Hours after a week ends before it is
+        frozen (default 24)
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+from contextlib import closing
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+
+from dotenv import load_dotenv
+
+from housecallpro_client import api_request
+from housecallpro_pagination import fetch_all_pages_parallel
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+ROLLUP_PATH = os.path.expanduser(
+    os.getenv("HOUSECALL_PRO_ROLLUP_PATH") or "~/.housecallpro-mcp/rollups.db"
+)
+ROLLUP_MAX_AGE = float(os.getenv("HOUSECALL_PRO_ROLLUP_MAX_AGE", "300"))
+ROLLUP_GRACE_HOURS = float(os.getenv("HOUSECALL_PRO_ROLLUP_GRACE_HOURS", "24"))
+
+ROLLUP_PAGE_SIZE = 100
+ROLLUP_MAX_PAGES = 10000
+
+# Incremental refreshes ask for jobs updated a little before the last refresh
+# started, so a job saved during that refresh is not missed; re-applying a job
+# is harmless
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+# Breakdown dimensions, and the row key used for the week's own totals
+BREAKDOWNS = ("job_type", "employee")
+TOTAL = "total"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS weeks (
+    week_start TEXT PRIMARY KEY,
+    iso_week TEXT NOT NULL,
+    closed INTEGER NOT NULL DEFAULT 0,
+    refreshed_at TEXT NOT NULL,
+    updated_after TEXT
+);
+CREATE TABLE IF NOT EXISTS week_totals (
+    week_start TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    key TEXT NOT NULL,
+    label TEXT,
+    revenue REAL NOT NULL,
+    job_count INTEGER NOT NULL,
+    PRIMARY KEY (week_start, dimension, key)
+);
+CREATE TABLE IF NOT EXISTS open_week_jobs (
+    job_id TEXT PRIMARY KEY,
+    week_start TEXT NOT NULL,
+    revenue REAL NOT NULL,
+    job_type_id TEXT,
+    job_type_name TEXT,
+    employees TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_open_week_jobs_week ON open_week_jobs (week_start);
+"""
+
+_refresh_lock: Optional[asyncio.Lock] = None
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    """Open the rollup database, creating it and its schema on first use."""
+    path = path or ROLLUP_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def week_start_of(day: date) -> date:
+    """Return the Monday of the week containing `day`."""
+    return day - timedelta(days=day.weekday())
+
+
+def iso_week(week_start: date) -> str:
+    """Label a week as YYYY-Www."""
+    year, week, _ = week_start.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def format_hcp_date(dt: datetime) -> str:
+    """
+    Format datetime for HouseCall Pro API.
+    HCP expects: YYYY-MM-DDTHH:MM:SS (no microseconds, no timezone suffix)
+    """
+    return dt.replace(microsecond=0).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _refresh_cursor(value: str) -> str:
+    """
+    Return a stored updated_after cursor in format_hcp_date form, local time.
+
+    Cursors used to be stored as UTC with an offset; those are converted.
+    """
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return format_hcp_date(parsed)
+
+
+def is_closed(week_start: date, now: Optional[datetime] = None) -> bool:
+    """True once a week has ended and the grace period has passed."""
+    end = datetime.combine(week_start + timedelta(days=7), datetime.min.time())
+    return (now or datetime.now()) >= end + timedelta(hours=ROLLUP_GRACE_HOURS)
+
+
+def _completed_week(job: Dict[str, Any]) -> Optional[date]:
+    """Return the week a completed job counts in, or None if it does not count."""
+    completed_at = job.get("completed_at")
+    if job.get("work_status") != "complete" or not isinstance(completed_at, str) or not completed_at:
+        return None
+    try:
+        completed = datetime.fromisoformat(completed_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if completed.tzinfo is not None:
+        completed = completed.astimezone().replace(tzinfo=None)
+    return week_start_of(completed.date())
+
+
+def _job_row(job: Dict[str, Any], week_start: date) -> Tuple[Any, ...]:
+    """Reduce a job to the open_week_jobs row it contributes."""
+    job_type = (job.get("job_fields") or {}).get("job_type") or job.get("job_type") or {}
+    if not isinstance(job_type, dict):
+        job_type = {"id": str(job_type), "name": str(job_type)}
+    employees = [
+        {
+            "id": str(employee.get("id")),
+            "name": " ".join(
+                part for part in (employee.get("first_name"), employee.get("last_name")) if part
+            ) or None,
+        }
+        for employee in job.get("assigned_employees") or []
+        if isinstance(employee, dict) and employee.get("id") is not None
+    ]
+    return (
+        str(job["id"]),
+        week_start.isoformat(),
+        float(job.get("total_amount", 0) or 0),
+        str(job_type["id"]) if job_type.get("id") is not None else None,
+        job_type.get("name"),
+        json.dumps(employees),
+    )
+
+
+def _apply_jobs(
+    conn: sqlite3.Connection,
+    jobs: Iterable[Dict[str, Any]],
+    open_weeks: List[str],
+    full: bool,
+) -> int:
+    """
+    Record jobs against the open weeks they now count in.
+
+    With `full`, the jobs are a complete sweep of those weeks and replace
+    their rows. Otherwise they are recent updates: a job that no longer
+    counts in an open week (reopened, or completed in another week) is dropped.
+
+    Returns:
+        Number of jobs counted in an open week
+    """
+    placeholders = ",".join("?" * len(open_weeks))
+    if full:
+        conn.execute(f"DELETE FROM open_week_jobs WHERE week_start IN ({placeholders})", open_weeks)
+    counted = 0
+    for job in jobs:
+        if not isinstance(job, dict) or job.get("id") is None:
+            continue
+        week = _completed_week(job)
+        if week is not None and week.isoformat() in open_weeks:
+            conn.execute(
+                "INSERT OR REPLACE INTO open_week_jobs "
+                "(job_id, week_start, revenue, job_type_id, job_type_name, employees) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                _job_row(job, week),
+            )
+            counted += 1
+        elif not full:
+            conn.execute(
+                f"DELETE FROM open_week_jobs WHERE job_id = ? AND week_start IN ({placeholders})",
+                [str(job["id"]), *open_weeks],
+            )
+    return counted
+
+
+def _sum_week(conn: sqlite3.Connection, week_start: str) -> None:
+    """Re-sum a week's totals and breakdowns from its stored job rows."""
+    rows = conn.execute(
+        "SELECT revenue, job_type_id, job_type_name, employees FROM open_week_jobs WHERE week_start = ?",
+        (week_start,),
+    ).fetchall()
+    totals: Dict[Tuple[str, str], List[Any]] = {(TOTAL, ""): [None, 0.0, 0]}
+    for row in rows:
+        keys = [(TOTAL, "", None), ("job_type", row["job_type_id"] or "", row["job_type_name"])]
+        keys += [("employee", employee["id"], employee["name"]) for employee in json.loads(row["employees"])]
+        for dimension, key, label in keys:
+            entry = totals.setdefault((dimension, key), [label, 0.0, 0])
+            entry[1] += row["revenue"]
+            entry[2] += 1
+    conn.execute("DELETE FROM week_totals WHERE week_start = ?", (week_start,))
+    conn.executemany(
+        "INSERT INTO week_totals (week_start, dimension, key, label, revenue, job_count) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        [(week_start, dimension, key, label, revenue, count)
+         for (dimension, key), (label, revenue, count) in totals.items()],
+    )
+
+
+def _save_weeks(
+    jobs: List[Dict[str, Any]],
+    weeks: List[date],
+    full: bool,
+    updated_after: str,
+    path: Optional[str],
+) -> int:
+    """Apply fetched jobs to weeks, re-sum them, and freeze the ones that have closed."""
+    labels = [week.isoformat() for week in weeks]
+    now = datetime.now()
+    with closing(connect(path)) as conn, conn:
+        counted = _apply_jobs(conn, jobs, labels, full)
+        # A job may have moved out of another open week; re-sum those too
+        for (label,) in conn.execute("SELECT week_start FROM weeks WHERE closed = 0").fetchall():
+            if label not in labels:
+                _sum_week(conn, label)
+        for week in weeks:
+            label = week.isoformat()
+            _sum_week(conn, label)
+            closed = is_closed(week, now)
+            conn.execute(
+                "INSERT INTO weeks (week_start, iso_week, closed, refreshed_at, updated_after) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(week_start) DO UPDATE SET "
+                "closed = excluded.closed, refreshed_at = excluded.refreshed_at, "
+                "updated_after = excluded.updated_after",
+                (label, iso_week(week), int(closed), _now(), updated_after),
+            )
+            if closed:
+                # Frozen: the totals stay, the per-job rows are no longer needed
+                conn.execute("DELETE FROM open_week_jobs WHERE week_start = ?", (label,))
+    return counted
+
+
+def get_weeks(path: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Return the stored state of every week, keyed by week start."""
+    with closing(connect(path)) as conn:
+        rows = conn.execute("SELECT * FROM weeks").fetchall()
+    return {row["week_start"]: dict(row) for row in rows}
+
+
+def delete_weeks(weeks: Iterable[date], path: Optional[str] = None) -> None:
+    """Forget stored weeks so they are computed again on the next read."""
+    labels = [(week.isoformat(),) for week in weeks]
+    with closing(connect(path)) as conn, conn:
+        for table in ("weeks", "week_totals", "open_week_jobs"):
+            conn.executemany(f"DELETE FROM {table} WHERE week_start = ?", labels)
+
+
+async def _fetch_jobs(headers: Dict[str, str], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Fetch every job matching params, several pages at a time."""
+    params = {**params, "page_size": ROLLUP_PAGE_SIZE}
+    data = await fetch_all_pages_parallel(
+        lambda page: api_request("GET", "/jobs", headers, params={**params, "page": page}),
+        "jobs",
+        max_pages=ROLLUP_MAX_PAGES,
+    )
+    return data.get("jobs") or []
+
+
+async def _sweep(headers: Dict[str, str], weeks: List[date], path: Optional[str]) -> int:
+    """Compute weeks from scratch with one sweep of the completed jobs spanning them."""
+    # Cursors are local time in the same format as the completed_at range
+    started = format_hcp_date(datetime.now() - REFRESH_OVERLAP)
+    start = datetime.combine(min(weeks), datetime.min.time())
+    end = datetime.combine(max(weeks) + timedelta(days=7), datetime.min.time())
+    # A day's margin either side: jobs are bucketed by their own completed_at,
+    # and the API may compare the range in a different time zone
+    jobs = await _fetch_jobs(headers, {
+        "work_status": "complete",
+        "completed_at_min": format_hcp_date(start - timedelta(days=1)),
+        "completed_at_max": format_hcp_date(end + timedelta(days=1)),
+    })
+    return await asyncio.to_thread(
+        _save_weeks, jobs, weeks, True, started, path
+    )
+
+
+async def _refresh(headers: Dict[str, str], weeks: List[date], since: str, path: Optional[str]) -> int:
+    """Bring open weeks up to date with the jobs updated since `since`."""
+    started = format_hcp_date(datetime.now() - REFRESH_OVERLAP)
+    jobs = await _fetch_jobs(headers, {"updated_after": since})
+    return await asyncio.to_thread(_save_weeks, jobs, weeks, False, started, path)
+
+
+async def ensure_weeks(
+    weeks: List[date],
+    headers: Dict[str, str],
+    path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Make sure the given weeks are stored and current.
+
+    Missing weeks are swept once. If any requested open week was last
+    refreshed more than ROLLUP_MAX_AGE ago, or has just closed, every open
+    week is refreshed incrementally. Closed weeks are left as they are.
+
+    Returns:
+        The weeks swept and the weeks refreshed
+    """
+    global _refresh_lock
+    if _refresh_lock is None:
+        _refresh_lock = asyncio.Lock()
+
+    async with _refresh_lock:
+        stored = await asyncio.to_thread(get_weeks, path)
+        now = datetime.now(timezone.utc)
+        today = week_start_of(date.today())
+        missing = sorted(week for week in weeks if week.isoformat() not in stored and week <= today)
+
+        # Open weeks are refreshed together, so a job whose completion moves
+        # from one open week to another is never counted twice
+        open_weeks = {
+            date.fromisoformat(label): state for label, state in stored.items() if not state["closed"]
+        }
+        stale = any(
+            is_closed(week)
+            or (now - datetime.fromisoformat(state["refreshed_at"])).total_seconds() > ROLLUP_MAX_AGE
+            for week, state in open_weeks.items()
+            if week in weeks
+        )
+
+        if stale:
+            since = min(_refresh_cursor(state["updated_after"]) for state in open_weeks.values())
+            await _refresh(headers, sorted(open_weeks), since, path)
+        if missing:
+            await _sweep(headers, missing, path)
+        return {
+            "swept": [iso_week(week) for week in missing],
+            "refreshed": [iso_week(week) for week in sorted(open_weeks)] if stale else [],
+        }
+
+
+def read_weeks(
+    weeks: List[date],
+    breakdown: Optional[str] = None,
+    path: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Read stored totals for the given weeks, oldest first.
+
+    Args:
+        weeks: Week starts (Mondays) to read
+        breakdown: Optional dimension to include, one of BREAKDOWNS
+        path: Rollup database file (default ROLLUP_PATH)
+
+    Returns:
+        One entry per week with its revenue, job count and closed flag, plus
+        the breakdown rows when requested; weeks not yet stored are omitted
+    """
+    labels = sorted(week.isoformat() for week in weeks)
+    if not labels:
+        return []
+    placeholders = ",".join("?" * len(labels))
+    dimensions = [TOTAL] + ([breakdown] if breakdown else [])
+    with closing(connect(path)) as conn:
+        states = {
+            row["week_start"]: row
+            for row in conn.execute(f"SELECT * FROM weeks WHERE week_start IN ({placeholders})", labels)
+        }
+        rows = conn.execute(
+            f"SELECT * FROM week_totals WHERE week_start IN ({placeholders}) "
+            f"AND dimension IN ({','.join('?' * len(dimensions))}) ORDER BY revenue DESC",
+            [*labels, *dimensions],
+        ).fetchall()
+
+    result: Dict[str, Dict[str, Any]] = {}
+    for label in labels:
+        state = states.get(label)
+        if state is None:
+            continue
+        start = date.fromisoformat(label)
+        result[label] = {
+            "week": state["iso_week"],
+            "week_start": label,
+            "week_end": (start + timedelta(days=6)).isoformat(),
+            "total_revenue": 0.0,
+            "job_count": 0,
+            "closed": bool(state["closed"]),
+        }
+        if breakdown:
+            result[label][f"by_{breakdown}"] = []
+    for row in rows:
+        entry = result.get(row["week_start"])
+        if entry is None:
+            continue
+        if row["dimension"] == TOTAL:
+            entry["total_revenue"] = row["revenue"]
+            entry["job_count"] = row["job_count"]
+        else:
+            entry[f"by_{breakdown}"].append({
+                "id": row["key"] or None,
+                "name": row["label"],
+                "revenue": row["revenue"],
+                "job_count": row["job_count"],
+            })
+    return list(result.values())
@@ -10,19 +10,21 @@ import os
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Schedule")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -51,14 +53,8 @@ async def get_schedule_windows(start_date: str, end_date: str) -> Dict[str, Any]
     Returns:
         A dictionary containing the schedule windows.
     """
-    headers = get_headers()
     params = {"start_date": start_date, "end_date": end_date}
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{API_BASE_URL}/schedules/windows", headers=headers, params=params
-        )
-        response.raise_for_status()
-        return response.json()
+    return await api_request("GET", "/schedules/windows", get_headers(), params=params)
 
 
 @mcp.tool()
@@ -73,14 +69,10 @@ async def update_schedule_windows(windows: List[Dict[str, str]]) -> Dict[str, An
     Returns:
         A dictionary containing the updated schedule windows.
     """
-    headers = get_headers()
     json_payload = {"windows": windows}
-    async with httpx.AsyncClient() as client:
-        response = await client.put(
-            f"{API_BASE_URL}/schedules/windows", headers=headers, json=json_payload
-        )
-        response.raise_for_status()
-        return response.json()
+    return await api_request(
+        "PUT", "/schedules/windows", get_headers(), json_data=json_payload
+    )
 
 
 @mcp.tool()
@@ -99,19 +91,15 @@ async def get_booking_windows(
     Returns:
         A dictionary containing available booking windows.
     """
-    headers = get_headers()
     params = {
         "start_date": start_date,
         "end_date": end_date,
         "address": address,
         "service_ids": ",".join(service_ids),
     }
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{API_BASE_URL}/schedules/booking-windows", headers=headers, params=params
-        )
-        response.raise_for_status()
-        return response.json()
+    return await api_request(
+        "GET", "/schedules/booking-windows", get_headers(), params=params
+    )
 
 
 if __name__ == "__main__":
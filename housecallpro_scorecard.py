@@ -6,27 +6,38 @@ This server provides EOS L10 meeting scorecard metrics for Housecall Pro,
 including weekly revenue, pipeline value, close rate, and scheduled jobs.
 """
 
+import asyncio
 import os
-from datetime import datetime, timedelta, timezone
-from typing import Dict, Any, List
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Callable, Awaitable
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_output import select_fields
+from housecallpro_pagination import fetch_all_pages_parallel
+from housecallpro_rollup import BREAKDOWNS, delete_weeks, ensure_weeks, format_hcp_date, read_weeks, week_start_of
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Scorecard")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
 
+# Composite scorecard fan-out: how many sub-metrics run at once, and how long
+# each one may take before it is reported as failed
+SCORECARD_CONCURRENCY = int(os.getenv("HOUSECALL_PRO_SCORECARD_CONCURRENCY", "5"))
+SCORECARD_METRIC_TIMEOUT = float(os.getenv("HOUSECALL_PRO_SCORECARD_METRIC_TIMEOUT", "20"))
+
 
 def get_headers() -> Dict[str, str]:
     """Get headers for API requests."""
@@ -37,63 +48,120 @@ def get_headers() -> Dict[str, str]:
     }
 
 
-def format_hcp_date(dt: datetime) -> str:
-    """
-    Format datetime for HouseCall Pro API.
-    HCP expects: YYYY-MM-DDTHH:MM:SS (no microseconds, no timezone suffix)
-    """
-    return dt.replace(microsecond=0).strftime('%Y-%m-%dT%H:%M:%S')
-
-
 async def make_api_request(endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
     """Make a GET request to Housecall Pro API."""
-    url = f"{API_BASE_URL}{endpoint}"
-    headers = get_headers()
+    return await api_request("GET", endpoint, get_headers(), params=params or {})
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, params=params or {}, timeout=30.0)
-        response.raise_for_status()
-        return response.json()
+
+async def fetch_all_items(endpoint: str, items_key: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Fetch every page of a list endpoint concurrently and return the combined items."""
+    data = await fetch_all_pages_parallel(
+        lambda page: make_api_request(endpoint, {**params, "page": page}),
+        items_key
+    )
+    return data[items_key]
 
 
 # ============== REPORTING TOOLS ==============
 
 @mcp.tool()
-async def get_weekly_revenue(weeks_back: int = 1) -> Dict[str, Any]:
+async def get_weekly_revenue(weeks_back: int = 1, fields: Optional[str] = None) -> Dict[str, Any]:
     """
     Get revenue from completed jobs for the specified week.
 
     Args:
         weeks_back: Number of weeks back (0 = current week, 1 = last week, etc.)
+        fields: Comma-separated fields to return for each job, with dotted paths for
+                nested fields (e.g. "id,total_amount,customer.last_name,schedule.scheduled_start");
+                default all. Totals are always computed from the full records.
 
     Returns:
         Total revenue, job count, and job details for the week
     """
-    today = datetime.now()
-    # Calculate week boundaries (Monday to Sunday)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    # Calculate week boundaries (Monday 00:00:00 to Sunday 23:59:59)
     start_of_this_week = today - timedelta(days=today.weekday())
     start_of_target_week = start_of_this_week - timedelta(weeks=weeks_back)
     end_of_target_week = start_of_target_week + timedelta(days=6, hours=23, minutes=59, seconds=59)
 
-    jobs_data = await make_api_request("/jobs", {
+    jobs = await fetch_all_items("/jobs", "jobs", {
         "page_size": 200,
         "work_status": "complete",
         "completed_at_min": format_hcp_date(start_of_target_week),
         "completed_at_max": format_hcp_date(end_of_target_week)
     })
 
-    jobs = jobs_data.get("jobs", [])
     total_revenue = sum(float(job.get("total_amount", 0) or 0) for job in jobs)
 
-    return {
+    return select_fields({
         "week_start": start_of_target_week.strftime("%Y-%m-%d"),
         "week_end": end_of_target_week.strftime("%Y-%m-%d"),
         "total_revenue": total_revenue,
         "job_count": len(jobs),
         "jobs": jobs
+    }, fields, "jobs")
+
+
+def _trend_weeks(weeks: int) -> List[date]:
+    """Return the week starts of the last `weeks` weeks, this week included, oldest first."""
+    this_week = week_start_of(date.today())
+    return [this_week - timedelta(weeks=n) for n in range(max(1, weeks) - 1, -1, -1)]
+
+
+@mcp.tool()
+async def get_revenue_trend(weeks: int = 12, breakdown: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get completed revenue and job count per week for the last few weeks.
+
+    Answers from a local store of weekly totals (see housecallpro_rollup):
+    finished weeks are computed once and frozen, and only the open week is
+    refreshed from jobs updated since the last read.
+
+    Args:
+        weeks: Number of weeks, this week included (default 12)
+        breakdown: Also break each week down by "job_type" or "employee"
+
+    Returns:
+        One entry per week, oldest first, with revenue, job count, whether the
+        week is closed, and the breakdown if requested; plus the trend total
+        and weekly average
+    """
+    if breakdown and breakdown not in BREAKDOWNS:
+        raise ValueError(f"Unknown breakdown '{breakdown}'. Choose from: {', '.join(BREAKDOWNS)}")
+
+    week_starts = _trend_weeks(weeks)
+    updated = await ensure_weeks(week_starts, get_headers())
+    rows = await asyncio.to_thread(read_weeks, week_starts, breakdown)
+
+    total_revenue = sum(row["total_revenue"] for row in rows)
+    return {
+        "weeks": rows,
+        "total_revenue": total_revenue,
+        "job_count": sum(row["job_count"] for row in rows),
+        "average_weekly_revenue": total_revenue / len(rows) if rows else 0,
+        **updated,
     }
 
 
+@mcp.tool()
+async def rebuild_revenue_rollups(weeks: int = 12) -> Dict[str, Any]:
+    """
+    Recompute the stored weekly revenue totals for the last few weeks.
+
+    Closed weeks are normally frozen; use this after correcting jobs in a
+    past week so get_revenue_trend picks up the change.
+
+    Args:
+        weeks: Number of weeks to recompute, this week included (default 12)
+
+    Returns:
+        The weeks recomputed
+    """
+    week_starts = _trend_weeks(weeks)
+    await asyncio.to_thread(delete_weeks, week_starts)
+    return await ensure_weeks(week_starts, get_headers())
+
+
 @mcp.tool()
 async def get_pipeline_value() -> Dict[str, Any]:
     """
@@ -102,12 +170,11 @@ async def get_pipeline_value() -> Dict[str, Any]:
     Returns:
         Total pipeline value, estimate count, and estimate details
     """
-    estimates_data = await make_api_request("/estimates", {
+    estimates = await fetch_all_items("/estimates", "estimates", {
         "page_size": 200,
         "status": "pending"
     })
 
-    estimates = estimates_data.get("estimates", [])
     total_value = sum(float(est.get("total_amount", 0) or 0) for est in estimates)
 
     return {
@@ -130,22 +197,19 @@ async def get_close_rate(days_back: int = 30) -> Dict[str, Any]:
     """
     start_date = format_hcp_date(datetime.now() - timedelta(days=days_back))
 
-    # Get won estimates
-    won_data = await make_api_request("/estimates", {
-        "page_size": 200,
-        "status": "won",
-        "created_at_min": start_date
-    })
-
-    # Get lost estimates
-    lost_data = await make_api_request("/estimates", {
-        "page_size": 200,
-        "status": "lost",
-        "created_at_min": start_date
-    })
-
-    won = won_data.get("estimates", [])
-    lost = lost_data.get("estimates", [])
+    # Get won and lost estimates concurrently
+    won, lost = await asyncio.gather(
+        fetch_all_items("/estimates", "estimates", {
+            "page_size": 200,
+            "status": "won",
+            "created_at_min": start_date
+        }),
+        fetch_all_items("/estimates", "estimates", {
+            "page_size": 200,
+            "status": "lost",
+            "created_at_min": start_date
+        }),
+    )
 
     total_decided = len(won) + len(lost)
     close_rate = (len(won) / total_decided * 100) if total_decided > 0 else 0
@@ -165,12 +229,15 @@ async def get_close_rate(days_back: int = 30) -> Dict[str, Any]:
 
 
 @mcp.tool()
-async def get_scheduled_jobs(days_forward: int = 14) -> Dict[str, Any]:
+async def get_scheduled_jobs(days_forward: int = 14, fields: Optional[str] = None) -> Dict[str, Any]:
     """
     Get jobs scheduled for the upcoming period.
 
     Args:
         days_forward: Number of days to look ahead (default 14)
+        fields: Comma-separated fields to return for each job, with dotted paths for
+                nested fields (e.g. "id,total_amount,customer.last_name,schedule.scheduled_start");
+                default all. Totals are always computed from the full records.
 
     Returns:
         Scheduled jobs with total value and details
@@ -178,22 +245,41 @@ async def get_scheduled_jobs(days_forward: int = 14) -> Dict[str, Any]:
     start_date = format_hcp_date(datetime.now())
     end_date = format_hcp_date(datetime.now() + timedelta(days=days_forward))
 
-    jobs_data = await make_api_request("/jobs", {
+    jobs = await fetch_all_items("/jobs", "jobs", {
         "page_size": 200,
         "work_status": "scheduled",
         "scheduled_start_min": start_date,
         "scheduled_start_max": end_date
     })
 
-    jobs = jobs_data.get("jobs", [])
     total_value = sum(float(job.get("total_amount", 0) or 0) for job in jobs)
 
-    return {
+    return select_fields({
         "period_days": days_forward,
         "total_scheduled_value": total_value,
         "job_count": len(jobs),
         "jobs": jobs
-    }
+    }, fields, "jobs")
+
+
+async def _run_metric(
+    semaphore: asyncio.Semaphore,
+    metric: Callable[[], Awaitable[Dict[str, Any]]],
+    timeout: float,
+) -> Dict[str, Any]:
+    """
+    Run one scorecard sub-metric under the fan-out semaphore and a timeout.
+
+    Returns:
+        The metric result, or {"error": ...} if it failed or timed out
+    """
+    async with semaphore:
+        try:
+            return await asyncio.wait_for(metric(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return {"error": f"timed out after {timeout:g}s"}
+        except Exception as e:
+            return {"error": str(e)}
 
 
 @mcp.tool()
@@ -209,37 +295,50 @@ async def get_scorecard_metrics() -> Dict[str, Any]:
         - Pipeline value (pending estimates)
         - 30-day close rate
         - Scheduled jobs (next 14 days)
-    """
-    # Get this week's revenue
-    this_week = await get_weekly_revenue(weeks_back=0)
-
-    # Get last week's revenue
-    last_week = await get_weekly_revenue(weeks_back=1)
 
-    # Get pipeline
-    pipeline = await get_pipeline_value()
-
-    # Get close rate
-    close_rate = await get_close_rate(days_back=30)
+        Sub-metrics are fetched concurrently. If one fails or times out, its
+        fields are None and the reason is listed under "errors".
+    """
+    semaphore = asyncio.Semaphore(max(1, SCORECARD_CONCURRENCY))
+    metrics = {
+        "this_week": lambda: get_weekly_revenue(weeks_back=0),
+        "last_week": lambda: get_weekly_revenue(weeks_back=1),
+        "pipeline": get_pipeline_value,
+        "close_rate": lambda: get_close_rate(days_back=30),
+        "scheduled": lambda: get_scheduled_jobs(days_forward=14),
+    }
 
-    # Get scheduled jobs
-    scheduled = await get_scheduled_jobs(days_forward=14)
+    results = await asyncio.gather(*(
+        _run_metric(semaphore, metric, SCORECARD_METRIC_TIMEOUT)
+        for metric in metrics.values()
+    ))
+    this_week, last_week, pipeline, close_rate, scheduled = results
 
-    return {
+    scorecard = {
         "generated_at": datetime.now().isoformat(),
-        "this_week_revenue": this_week["total_revenue"],
-        "this_week_jobs": this_week["job_count"],
-        "last_week_revenue": last_week["total_revenue"],
-        "last_week_jobs": last_week["job_count"],
-        "pipeline_value": pipeline["total_pipeline_value"],
-        "pipeline_count": pipeline["estimate_count"],
-        "close_rate_30d": close_rate["close_rate_percent"],
-        "won_30d": close_rate["won_count"],
-        "lost_30d": close_rate["lost_count"],
-        "scheduled_value_14d": scheduled["total_scheduled_value"],
-        "scheduled_jobs_14d": scheduled["job_count"]
+        "this_week_revenue": this_week.get("total_revenue"),
+        "this_week_jobs": this_week.get("job_count"),
+        "last_week_revenue": last_week.get("total_revenue"),
+        "last_week_jobs": last_week.get("job_count"),
+        "pipeline_value": pipeline.get("total_pipeline_value"),
+        "pipeline_count": pipeline.get("estimate_count"),
+        "close_rate_30d": close_rate.get("close_rate_percent"),
+        "won_30d": close_rate.get("won_count"),
+        "lost_30d": close_rate.get("lost_count"),
+        "scheduled_value_14d": scheduled.get("total_scheduled_value"),
+        "scheduled_jobs_14d": scheduled.get("job_count")
     }
 
+    errors = {
+        name: result["error"]
+        for name, result in zip(metrics, results)
+        if "error" in result
+    }
+    if errors:
+        scorecard["errors"] = errors
+
+    return scorecard
+
 
 if __name__ == "__main__":
     mcp.run()
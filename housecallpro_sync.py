@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Replica Sync MCP Server
+
+This server keeps the local SQLite replica of Housecall Pro data in sync,
+including the initial backfill, incremental syncs and replica status.
+Read tools in the other servers answer from the replica when called with
+use_replica=true.
+"""
+
+import os
+from typing import Optional, Dict
+
+from dotenv import load_dotenv
+from mcp.server.fastmcp import FastMCP
+
+import housecallpro_replica
+from housecallpro_diagnostics import register_diagnostics_tools
+from housecallpro_output import to_json
+
+# Load environment variables
+load_dotenv()
+
+# FastMCP server
+mcp = FastMCP("Housecall Pro Sync")
+register_diagnostics_tools(mcp)
+
+# Configuration
+API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
+
+if not API_KEY:
+    raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
+
+
+def get_headers() -> Dict[str, str]:
+    """Get headers for API requests."""
+    return {
+        "Authorization": f"Token {API_KEY}",
+        "Content-Type": "application/json",
+        "Accept": "application/json"
+    }
+
+
+@mcp.tool()
+async def sync_replica(resources: Optional[str] = None, full: Optional[bool] = None) -> str:
+    """
+    Sync Housecall Pro records into the local replica.
+
+    The first sync of a resource backfills every record. Later syncs of jobs,
+    invoices and leads only fetch records updated since the previous sync;
+    customers, estimates and employees are re-read in full.
+
+    Args:
+        resources: Comma-separated resources to sync (jobs, invoices, leads,
+                   customers, estimates, employees); default all
+        full: Re-read every record instead of syncing incrementally
+
+    Returns:
+        JSON string with a summary per resource
+    """
+    names = [r.strip() for r in resources.split(",")] if resources else list(housecallpro_replica.RESOURCES)
+    results = []
+    for name in names:
+        try:
+            results.append(await housecallpro_replica.sync_resource(name, get_headers(), full=bool(full)))
+        except Exception as e:
+            results.append({"resource": name, "error": str(e)})
+    return to_json({"replica": housecallpro_replica.REPLICA_PATH, "results": results})
+
+
+@mcp.tool()
+async def get_replica_status() -> str:
+    """
+    Show what the local replica holds and when each resource was last synced.
+
+    Returns:
+        JSON string with the record count, last sync, last full sync and
+        updated_after high-water mark per resource
+    """
+    state = housecallpro_replica.get_sync_state()
+    return to_json({
+        "replica": housecallpro_replica.REPLICA_PATH,
+        "max_age_seconds": housecallpro_replica.REPLICA_MAX_AGE,
+        "resources": {
+            name: state.get(name, {"record_count": 0, "last_synced_at": None})
+            for name in housecallpro_replica.RESOURCES
+        },
+    })
+
+
+if __name__ == "__main__":
+    mcp.run()
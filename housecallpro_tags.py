@@ -9,19 +9,21 @@ including retrieving, creating, and updating tags.
 import os
 from typing import Optional, Dict, Any, List
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+from housecallpro_client import api_request
+from housecallpro_diagnostics import register_diagnostics_tools
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Tags")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
@@ -59,7 +61,6 @@ async def get_tags(
     Returns:
         A dictionary containing a list of tags and pagination info.
     """
-    headers = get_headers()
     params = {}
     if page is not None:
         params["page"] = page
@@ -72,12 +73,7 @@ async def get_tags(
     if is_active is not None:
         params["is_active"] = is_active
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{API_BASE_URL}/tags", headers=headers, params=params
-        )
-        response.raise_for_status()
-        return response.json()
+    return await api_request("GET", "/tags", get_headers(), params=params)
 
 
 @mcp.tool()
@@ -95,17 +91,11 @@ async def create_tag(
     Returns:
         A dictionary containing the created tag.
     """
-    headers = get_headers()
     json_payload = {"name": name, "tag_type": tag_type}
     if is_active is not None:
         json_payload["is_active"] = is_active
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{API_BASE_URL}/tags", headers=headers, json=json_payload
-        )
-        response.raise_for_status()
-        return response.json()
+    return await api_request("POST", "/tags", get_headers(), json_data=json_payload)
 
 
 @mcp.tool()
@@ -123,19 +113,15 @@ async def update_tag(
     Returns:
         A dictionary containing the updated tag.
     """
-    headers = get_headers()
     json_payload = {}
     if name:
         json_payload["name"] = name
     if is_active is not None:
         json_payload["is_active"] = is_active
 
-    async with httpx.AsyncClient() as client:
-        response = await client.put(
-            f"{API_BASE_URL}/tags/{tag_id}", headers=headers, json=json_payload
-        )
-        response.raise_for_status()
-        return response.json()
+    return await api_request(
+        "PUT", f"/tags/{tag_id}", get_headers(), json_data=json_payload
+    )
 
 
 if __name__ == "__main__":
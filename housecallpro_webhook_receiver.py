@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Housecall Pro Webhook Receiver
+
+This module provides a small asyncio HTTP endpoint that consumes the
+events Housecall Pro sends to webhook subscriptions (job.updated,
+invoice.updated, customer.updated, ...). Each request's HMAC signature is
+verified, and the event is applied as an upsert, or a delete, to the local
+replica and to the response cache of the process hosting the receiver.
+Reads then stay fresh without polling the API.
+
+Verified events can be recorded to an NDJSON file and replayed later,
+either applied directly or re-signed and posted to a running receiver, to
+test the pipeline without Housecall Pro.
+
+Usage:
+    python housecallpro_webhook_receiver.py serve
+    python housecallpro_webhook_receiver.py replay events.ndjson [--url http://127.0.0.1:8787/webhooks/housecallpro]
+
+The receiver is configured through environment variables:
+    HOUSECALL_PRO_WEBHOOK_SECRET: Signing secret used to verify payloads (required)
+    HOUSECALL_PRO_WEBHOOK_HOST: Interface to listen on (default 127.0.0.1)
+    HOUSECALL_PRO_WEBHOOK_PORT: Port to listen on (default 8787)
+    HOUSECALL_PRO_WEBHOOK_PATH: Request path events are posted to (default /webhooks/housecallpro)
+    HOUSECALL_PRO_WEBHOOK_RECORD: NDJSON file to record verified events to (default off)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+import housecallpro_cache
+import housecallpro_replica
+
+# Load environment variables
+load_dotenv()
+
+# Configuration
+API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
+WEBHOOK_SECRET = os.getenv("HOUSECALL_PRO_WEBHOOK_SECRET")
+WEBHOOK_HOST = os.getenv("HOUSECALL_PRO_WEBHOOK_HOST", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("HOUSECALL_PRO_WEBHOOK_PORT", "8787"))
+WEBHOOK_PATH = os.getenv("HOUSECALL_PRO_WEBHOOK_PATH", "/webhooks/housecallpro")
+WEBHOOK_RECORD = os.getenv("HOUSECALL_PRO_WEBHOOK_RECORD")
+
+SIGNATURE_HEADER = "api-signature"
+TIMESTAMP_HEADER = "api-timestamp"
+
+# Reject signed requests whose timestamp is further than this from now
+SIGNATURE_TOLERANCE = 300
+MAX_BODY_BYTES = 1024 * 1024
+READ_TIMEOUT = 10
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+# Event entity (the part before the first dot) -> replica resource
+EVENT_RESOURCES = {
+    "job": "jobs",
+    "invoice": "invoices",
+    "lead": "leads",
+    "customer": "customers",
+    "estimate": "estimates",
+    "employee": "employees",
+}
+
+
+class WebhookVerificationError(ValueError):
+    """Raised when a webhook request's signature cannot be verified."""
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    """Return the hex HMAC-SHA256 signature of "<timestamp>.<body>"."""
+    message = timestamp.encode() + b"." + body
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def verify(secret: str, headers: Dict[str, str], body: bytes, now: Optional[float] = None) -> None:
+    """
+    Verify a webhook request's signature and timestamp.
+
+    Args:
+        secret: Webhook signing secret
+        headers: Request headers with lower-case names
+        body: Raw request body
+
+    Raises:
+        WebhookVerificationError: If the signature is missing, stale or wrong
+    """
+    signature = headers.get(SIGNATURE_HEADER)
+    timestamp = headers.get(TIMESTAMP_HEADER)
+    if not signature or not timestamp:
+        raise WebhookVerificationError("Missing signature headers")
+
+    try:
+        age = abs((now or time.time()) - float(timestamp))
+    except ValueError:
+        raise WebhookVerificationError("Invalid timestamp") from None
+    if age > SIGNATURE_TOLERANCE:
+        raise WebhookVerificationError("Timestamp outside the allowed window")
+
+    if not hmac.compare_digest(sign(secret, timestamp, body), signature):
+        raise WebhookVerificationError("Signature mismatch")
+
+
+def _cache_headers() -> Dict[str, str]:
+    """Headers identifying the API key whose cache entries events update."""
+    return {"Authorization": f"Token {API_KEY}"}
+
+
+async def apply_event(payload: Dict[str, Any], replica_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Apply a webhook event to the replica and the response cache.
+
+    The record is taken from the payload key named after the event entity
+    (e.g. payload["job"] for job.updated). Events whose action contains
+    "deleted" remove the record; every other event upserts it, unless the
+    replica already holds a newer version (a later updated_at), as happens
+    when events are delivered out of order.
+
+    Returns:
+        Summary with the event, resource, record id and action taken
+    """
+    event = str(payload.get("event") or "")
+    entity, _, action = event.partition(".")
+    resource = EVENT_RESOURCES.get(entity)
+    record = payload.get(entity)
+
+    if not resource or not isinstance(record, dict) or record.get("id") is None:
+        return {"event": event or None, "action": "ignored"}
+
+    record_id = str(record["id"])
+    endpoint = f"/{resource}/{record_id}"
+    housecallpro_cache.invalidate(endpoint)
+
+    if "deleted" in action:
+        await asyncio.to_thread(housecallpro_replica.delete_record, resource, record_id, replica_path)
+        applied = "deleted"
+    else:
+        written = await asyncio.to_thread(
+            housecallpro_replica.upsert_records, resource, [record], replica_path, True
+        )
+        if written:
+            housecallpro_cache.store(endpoint, _cache_headers(), record)
+            applied = "upserted"
+        else:
+            applied = "stale"
+
+    return {"event": event, "resource": resource, "id": record_id, "action": applied}
+
+
+class WebhookReceiver:
+    """asyncio HTTP server that verifies and applies Housecall Pro webhook events."""
+
+    def __init__(
+        self,
+        secret: Optional[str] = WEBHOOK_SECRET,
+        host: str = WEBHOOK_HOST,
+        port: int = WEBHOOK_PORT,
+        path: str = WEBHOOK_PATH,
+        record_path: Optional[str] = WEBHOOK_RECORD,
+        replica_path: Optional[str] = None,
+    ):
+        if not secret:
+            raise ValueError("HOUSECALL_PRO_WEBHOOK_SECRET environment variable is required")
+        self.secret = secret
+        self.host = host
+        self.port = port
+        self.path = path
+        self.record_path = record_path
+        self.replica_path = replica_path
+        self.stats = {"received": 0, "applied": 0, "ignored": 0, "rejected": 0, "failed": 0}
+        self.last_event: Optional[Dict[str, Any]] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}{self.path}"
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None and self._server.is_serving()
+
+    async def start(self) -> None:
+        """Start listening; port 0 picks a free port."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop listening and wait for the server to close."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def handle_request(
+        self, method: str, target: str, headers: Dict[str, str], body: bytes
+    ) -> Tuple[int, Dict[str, Any]]:
+        """
+        Verify and apply one webhook request.
+
+        Returns:
+            HTTP status code and JSON response body
+        """
+        if target.split("?")[0] != self.path:
+            return 404, {"error": "Not found"}
+        if method != "POST":
+            return 405, {"error": "Method not allowed"}
+
+        self.stats["received"] += 1
+        try:
+            verify(self.secret, headers, body)
+        except WebhookVerificationError as e:
+            self.stats["rejected"] += 1
+            return 401, {"error": str(e)}
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self.stats["rejected"] += 1
+            return 400, {"error": "Body is not valid JSON"}
+        if not isinstance(payload, dict):
+            self.stats["rejected"] += 1
+            return 400, {"error": "Body must be a JSON object"}
+
+        try:
+            if self.record_path:
+                await asyncio.to_thread(_record_event, self.record_path, payload)
+            result = await apply_event(payload, self.replica_path)
+        except Exception as e:
+            # A 5xx makes Housecall Pro redeliver the event later
+            self.stats["failed"] += 1
+            return 500, {"error": f"Could not apply event: {e}"}
+        self.stats["ignored" if result["action"] in ("ignored", "stale") else "applied"] += 1
+        self.last_event = {**result, "received_at": datetime.now(timezone.utc).isoformat()}
+        return 200, result
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Parse one HTTP/1.1 request from a connection and write the response."""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+            headers: Dict[str, str] = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length") or 0)
+            if length > MAX_BODY_BYTES:
+                status, result = 413, {"error": "Payload too large"}
+            else:
+                body = await asyncio.wait_for(reader.readexactly(length), READ_TIMEOUT)
+                status, result = await self.handle_request(method, target, headers, body)
+        except ConnectionError:
+            # The sender went away mid-request; there is no one to answer
+            _close_quietly(writer)
+            return
+        except (ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            status, result = 400, {"error": "Malformed request"}
+
+        body = json.dumps(result).encode()
+        try:
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            _close_quietly(writer)
+
+    def status(self) -> Dict[str, Any]:
+        """Return the receiver's address, counters and last applied event."""
+        return {
+            "running": self.running,
+            "url": self.url,
+            "recording_to": self.record_path,
+            **self.stats,
+            "last_event": self.last_event,
+        }
+
+
+def _close_quietly(writer: asyncio.StreamWriter) -> None:
+    """Close a connection, ignoring errors from a peer that already hung up."""
+    try:
+        writer.close()
+    except ConnectionError:
+        pass
+
+
+def _record_event(path: str, payload: Dict[str, Any]) -> None:
+    """Append a verified event to an NDJSON recording."""
+    line = json.dumps({"received_at": datetime.now(timezone.utc).isoformat(), "payload": payload})
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(line + "\n")
+
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    """
+    Read recorded webhook payloads.
+
+    Accepts an NDJSON recording written by the receiver (one envelope with
+    a "payload" key per line), NDJSON of bare payloads, or a JSON array.
+    """
+    with open(path, encoding="utf-8") as fh:
+        text = fh.read().strip()
+    if text.startswith("["):
+        entries = json.loads(text)
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [entry.get("payload", entry) if isinstance(entry, dict) else entry for entry in entries]
+
+
+async def replay(
+    path: str,
+    url: Optional[str] = None,
+    secret: Optional[str] = WEBHOOK_SECRET,
+    replica_path: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Replay recorded webhook payloads.
+
+    Args:
+        path: Recording to replay (see load_recording)
+        url: Receiver URL to post each payload to, signed with `secret`;
+             if omitted, payloads are applied directly in this process
+        secret: Signing secret for posted payloads
+        replica_path: Replica database file for direct replay (default REPLICA_PATH)
+
+    Returns:
+        The result of each replayed event
+    """
+    payloads = load_recording(path)
+    if url is None:
+        return [await apply_event(payload, replica_path) for payload in payloads]
+
+    if not secret:
+        raise ValueError("A signing secret is required to post replayed events")
+
+    results = []
+    async with httpx.AsyncClient() as client:
+        for payload in payloads:
+            body = json.dumps(payload).encode()
+            timestamp = str(int(time.time()))
+            response = await client.post(url, content=body, headers={
+                "Content-Type": "application/json",
+                "Api-Timestamp": timestamp,
+                "Api-Signature": sign(secret, timestamp, body),
+            })
+            results.append({"status_code": response.status_code, **response.json()})
+    return results
+
+
+async def serve_forever(receiver: WebhookReceiver) -> None:
+    """Run a receiver until the process is stopped."""
+    await receiver.start()
+    print(f"Listening for Housecall Pro webhooks on {receiver.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await receiver.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Housecall Pro webhook receiver")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Listen for webhook events")
+    serve.add_argument("--host", default=WEBHOOK_HOST)
+    serve.add_argument("--port", type=int, default=WEBHOOK_PORT)
+    serve.add_argument("--record", default=WEBHOOK_RECORD, help="NDJSON file to record events to")
+    replayer = commands.add_parser("replay", help="Replay recorded webhook payloads")
+    replayer.add_argument("path", help="Recording (NDJSON or JSON array)")
+    replayer.add_argument("--url", help="Post to a running receiver instead of applying directly")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        receiver = WebhookReceiver(host=args.host, port=args.port, record_path=args.record)
+        try:
+            asyncio.run(serve_forever(receiver))
+        except KeyboardInterrupt:
+            pass
+    else:
+        for result in asyncio.run(replay(args.path, url=args.url)):
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,23 +10,29 @@ import os
 from typing import Optional, Dict, Any, List
 import re
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+import housecallpro_webhook_receiver
+from housecallpro_client import send_request
+from housecallpro_diagnostics import register_diagnostics_tools
+
 # Load environment variables
 load_dotenv()
 
 # FastMCP server
 mcp = FastMCP("Housecall Pro Webhooks")
+register_diagnostics_tools(mcp)
 
 # Configuration
 API_KEY = os.getenv("HOUSECALL_PRO_API_KEY")
-API_BASE_URL = "https://api.housecallpro.com"
 
 if not API_KEY:
     raise ValueError("HOUSECALL_PRO_API_KEY environment variable is required")
 
+# Local webhook receiver, started on demand by start_webhook_receiver
+_receiver: Optional[housecallpro_webhook_receiver.WebhookReceiver] = None
+
 
 def get_headers() -> Dict[str, str]:
     """
@@ -41,28 +47,18 @@ def get_headers() -> Dict[str, str]:
 
 async def make_api_request(method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict[str, Any]:
     """Make authenticated API request to Housecall Pro."""
-    async with httpx.AsyncClient() as client:
-        headers = get_headers()
-        url = f"{API_BASE_URL}{endpoint}"
-        
-        if method.upper() == "GET":
-            response = await client.get(url, headers=headers, params=params)
-        elif method.upper() == "POST":
-            response = await client.post(url, headers=headers, json=data)
-        elif method.upper() == "PUT":
-            response = await client.put(url, headers=headers, json=data)
-        elif method.upper() == "PATCH":
-            response = await client.patch(url, headers=headers, json=data)
-        elif method.upper() == "DELETE":
-            response = await client.delete(url, headers=headers)
-        else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
-        
-        if response.status_code >= 400:
-            error_msg = f"API request failed: {response.status_code} {response.text}"
-            return {"error": error_msg, "status_code": response.status_code}
-        
-        return response.json() if response.content else {}
+    if method.upper() not in ("GET", "POST", "PUT", "PATCH", "DELETE"):
+        raise ValueError(f"Unsupported HTTP method: {method}")
+    
+    response = await send_request(
+        method.upper(), endpoint, get_headers(), params=params, json_data=data
+    )
+    
+    if response.status_code >= 400:
+        error_msg = f"API request failed: {response.status_code} {response.text}"
+        return {"error": error_msg, "status_code": response.status_code}
+    
+    return response.json() if response.content else {}
 
 
 @mcp.tool()
@@ -153,5 +149,67 @@ async def delete_webhook_subscription(
         return {"error": str(e)}
 
 
+@mcp.tool()
+async def start_webhook_receiver(port: Optional[int] = None) -> dict:
+    """
+    Start the local webhook receiver inside this server.
+    
+    Verified events update the local replica and this server's response cache.
+    Point a webhook subscription at the returned URL (through a tunnel or
+    reverse proxy if Housecall Pro cannot reach this machine directly).
+    
+    Args:
+        port: Port to listen on (default HOUSECALL_PRO_WEBHOOK_PORT, 8787)
+    
+    Returns:
+        Dictionary containing the receiver status or error message
+    """
+    global _receiver
+    try:
+        if _receiver is None or not _receiver.running:
+            _receiver = housecallpro_webhook_receiver.WebhookReceiver(
+                port=port if port is not None else housecallpro_webhook_receiver.WEBHOOK_PORT
+            )
+            await _receiver.start()
+        return _receiver.status()
+        
+    except Exception as e:
+        return {"error": str(e)}
+
+
+@mcp.tool()
+async def get_webhook_receiver_status() -> dict:
+    """
+    Get the local webhook receiver's address, event counters and last event.
+    
+    Returns:
+        Dictionary containing the receiver status
+    """
+    if _receiver is None:
+        return {"running": False}
+    return _receiver.status()
+
+
+@mcp.tool()
+async def replay_webhook_events(path: str, url: Optional[str] = None) -> dict:
+    """
+    Replay recorded webhook payloads for testing.
+    
+    Args:
+        path: NDJSON recording written by the receiver, or a JSON array of payloads (required)
+        url: Post each payload, freshly signed, to a running receiver at this URL
+             instead of applying it directly
+    
+    Returns:
+        Dictionary containing the result of each replayed event or error message
+    """
+    try:
+        results = await housecallpro_webhook_receiver.replay(path, url=url)
+        return {"replayed": len(results), "results": results}
+        
+    except Exception as e:
+        return {"error": str(e)}
+
+
 if __name__ == "__main__":
     mcp.run() 
\ No newline at end of file